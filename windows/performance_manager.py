@@ -9,9 +9,23 @@ Part of Python Scripts Collection
 
 import os
 import sys
+import base64
+import queue
 import subprocess
+import threading
 import argparse
 import platform
+import time
+import io
+import heapq
+import math
+import re
+import socket
+import mmap
+import struct
+from array import array
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
 from datetime import datetime
 import json
@@ -47,7 +61,9 @@ def get_windows_info():
 
 
 def check_admin():
-    """Check if running with administrator privileges."""
+    """Check if running with administrator privileges (root on Linux)."""
+    if hasattr(os, 'geteuid'):
+        return os.geteuid() == 0
     try:
         import ctypes
         return ctypes.windll.shell32.IsUserAnAdmin() != 0
@@ -105,6 +121,1537 @@ def format_bar(value, max_value, width=30, warn_at=70, critical_at=90):
     return f"{emoji} [{bar}] {percent:.0f}%"
 
 
+# ─── PowerShell Worker Session ─────────────────────────────────────────────────
+
+# Protocol: Python writes one request per line, "<id> <base64 UTF-8 script>".
+# The worker runs the script and answers with one line,
+# "@@PSW@@ {"id": ..., "ok": true/false, "out": "...", "err": "..."}".
+# Any other line the script prints straight to the console is ignored.
+# Each script runs in its own child scope, so its variables neither clobber
+# the loop's nor leak into the next call. A call fails only on a terminating
+# error (throw, -ErrorAction Stop, a parse error) or when the last native
+# command it ran exited non-zero; errors a cmdlet merely reports, such as a
+# missing service under -ErrorAction SilentlyContinue, don't fail it.
+PS_RESPONSE_MARKER = "@@PSW@@ "
+
+PS_WORKER_LOOP = r"""
+$ErrorActionPreference = 'Continue'
+$ProgressPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    $parts = $line.Split(' ', 2)
+    $ok = $true
+    $out = ''
+    $err = ''
+    try {
+        $script = [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($parts[1]))
+        $global:LASTEXITCODE = 0
+        $out = (& ([scriptblock]::Create($script)) 2>$null | Out-String)
+        if ($global:LASTEXITCODE -ne 0) {
+            $ok = $false
+            $err = "exit code $global:LASTEXITCODE"
+        }
+    } catch {
+        $ok = $false
+        $err = $_.Exception.Message
+    }
+    $reply = @{ id = $parts[0]; ok = $ok; out = "$out"; err = "$err" } | ConvertTo-Json -Compress
+    [Console]::Out.WriteLine('@@PSW@@ ' + $reply)
+    [Console]::Out.Flush()
+}
+"""
+
+
+def powershell_worker_command():
+    """Command line that starts a PowerShell process running the worker loop."""
+    encoded = base64.b64encode(PS_WORKER_LOOP.encode('utf-16-le')).decode('ascii')
+    return ["powershell", "-NoLogo", "-NoProfile", "-NonInteractive",
+            "-ExecutionPolicy", "Bypass", "-EncodedCommand", encoded]
+
+
+# Stand-in worker for testing PowerShellSession without PowerShell: it
+# answers each request with the script itself as output, fails scripts that
+# start with "fail" and prints a stray line first, as real scripts may:
+#     PowerShellSession(echo_worker_command()).run("hello")  ->  (True, "hello")
+ECHO_WORKER = r"""
+import base64, json, sys
+for line in sys.stdin:
+    request_id, payload = line.rstrip('\n').split(' ', 1)
+    script = base64.b64decode(payload).decode('utf-8')
+    failed = script.startswith('fail')
+    print('stray console output')
+    print('@@PSW@@ ' + json.dumps({'id': request_id, 'ok': not failed,
+                                   'out': '' if failed else script,
+                                   'err': script if failed else ''}), flush=True)
+"""
+
+
+def echo_worker_command():
+    """Command line that starts the Python stand-in for the PowerShell worker."""
+    return [sys.executable, "-c", ECHO_WORKER]
+
+
+class PowerShellSession:
+    """One long-lived PowerShell process that runs scripts sent over stdin.
+
+    Starting PowerShell costs several hundred milliseconds, so the same
+    process is reused for every call. If the worker dies or a call runs
+    past its timeout, that call fails and a fresh worker is started on the
+    next one; calls are never retried, since a script may have changed
+    something before the worker died. Pass any command that
+    speaks the same line protocol, such as echo_worker_command(), to test
+    it without PowerShell.
+    """
+
+    def __init__(self, command=None, timeout=120):
+        self.command = command or powershell_worker_command()
+        self.timeout = timeout
+        self.proc = None
+        self.lines = None
+        self.restarts = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        flags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+        self.proc = subprocess.Popen(
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, creationflags=flags
+        )
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read_output, args=(self.proc, self.lines), daemon=True).start()
+
+    @staticmethod
+    def _read_output(proc, lines):
+        # Pipes can't be waited on with a timeout on Windows, so a thread reads them
+        for raw in proc.stdout:
+            lines.put(raw.decode('utf-8', 'replace').lstrip('\ufeff').rstrip('\r\n'))
+        lines.put(None)
+
+    def _stop(self):
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    def _call(self, script, timeout):
+        self._next_id += 1
+        request_id = str(self._next_id)
+        payload = base64.b64encode(script.encode('utf-8')).decode('ascii')
+        self.proc.stdin.write(f"{request_id} {payload}\n".encode('ascii'))
+        self.proc.stdin.flush()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.command[0], timeout)
+            try:
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise BrokenPipeError("PowerShell worker stopped unexpectedly")
+            if not line.startswith(PS_RESPONSE_MARKER):
+                continue
+            try:
+                reply = json.loads(line[len(PS_RESPONSE_MARKER):])
+            except ValueError:
+                continue
+            if str(reply.get('id')) == request_id:
+                return reply
+
+    def run(self, script, timeout=None):
+        """Run a script and return (success, output), like run_ps_command."""
+        timeout = timeout or self.timeout
+        with self._lock:
+            if self.proc is None or self.proc.poll() is not None:
+                if self.proc is not None:
+                    self.restarts += 1
+                self._stop()
+                self._start()  # OSError here means PowerShell can't be started at all
+            try:
+                reply = self._call(script, timeout)
+            except subprocess.TimeoutExpired:
+                self._stop()
+                return False, "Operation timed out"
+            except (OSError, ValueError):
+                # The worker died mid-call; the next call starts a fresh one
+                self._stop()
+                self.restarts += 1
+                return False, "PowerShell worker stopped unexpectedly"
+        if reply.get('ok'):
+            return True, (reply.get('out') or '').strip()
+        return False, (reply.get('err') or 'PowerShell command failed').strip()
+
+    def close(self):
+        with self._lock:
+            if self.proc is not None:
+                try:
+                    self.proc.stdin.close()
+                    self.proc.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._stop()
+
+
+class PowerShellPool:
+    """A few PowerShellSessions so independent probes can run at the same time.
+
+    Sessions are created on demand up to size and reused most-recently-used
+    first, so sequential callers keep hitting one warm process.
+    """
+
+    def __init__(self, size=4, command=None, timeout=120):
+        self.size = size
+        self.command = command
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._sessions) < self.size:
+                session = PowerShellSession(self.command, self.timeout)
+                self._sessions.append(session)
+                return session
+        return self._idle.get()
+
+    def run(self, script, timeout=None):
+        """Run a script on a free session and return (success, output)."""
+        session = self._acquire()
+        try:
+            return session.run(script, timeout)
+        finally:
+            self._idle.put(session)
+
+    def close(self):
+        for session in self._sessions:
+            session.close()
+
+
+# ─── Probe Scheduler ───────────────────────────────────────────────────────────
+
+PROBE_WORKERS = 6
+PROBE_TIMED_OUT = object()  # Result of a probe that ran past its timeout
+PROBE_FAILED = object()     # Result of a probe that raised an exception
+
+
+class ProbeScheduler:
+    """Run independent probes at the same time, respecting their dependencies.
+
+    Each probe is func(results) where results holds the values of the probes
+    it depends on. A probe starts as soon as its dependencies finish; one
+    that runs past its timeout is reported as PROBE_TIMED_OUT and its
+    dependents still run (they see the marker instead of a value).
+    """
+
+    def __init__(self, max_workers=PROBE_WORKERS):
+        self.max_workers = max_workers
+        self.probes = {}
+
+    def add(self, name, func, deps=(), timeout=60):
+        self.probes[name] = (func, tuple(deps), timeout)
+        return self
+
+    def run(self, on_done=None):
+        """Run every probe; on_done(name, result) is called as each finishes."""
+        results = {}
+        pending = dict(self.probes)
+        running = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="probe")
+
+        def finish(name, result):
+            results[name] = result
+            if on_done is not None:
+                on_done(name, result)
+
+        try:
+            while pending or running:
+                for name, (func, deps, timeout) in list(pending.items()):
+                    if all(dep in results for dep in deps):
+                        del pending[name]
+                        dep_results = {dep: results[dep] for dep in deps}
+                        future = executor.submit(func, dep_results)
+                        running[future] = (name, time.monotonic() + timeout)
+
+                if not running:
+                    # Unknown or circular dependencies: nothing can start
+                    for name in list(pending):
+                        del pending[name]
+                        finish(name, PROBE_FAILED)
+                    break
+
+                next_deadline = min(deadline for _, deadline in running.values())
+                done, _ = wait(list(running), timeout=max(0, next_deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, _ = running.pop(future)
+                    try:
+                        finish(name, future.result())
+                    except Exception:
+                        finish(name, PROBE_FAILED)
+
+                now = time.monotonic()
+                for future, (name, deadline) in list(running.items()):
+                    if deadline <= now:
+                        # The thread can't be stopped, but nobody waits for it any more
+                        del running[future]
+                        finish(name, PROBE_TIMED_OUT)
+        finally:
+            executor.shutdown(wait=False)
+        return results
+
+
+def probe_value(result):
+    """A probe's value, or None if it timed out or failed."""
+    return None if result is PROBE_TIMED_OUT or result is PROBE_FAILED else result
+
+
+# ─── Background Stages ─────────────────────────────────────────────────────────
+
+class ThreadOutput(io.TextIOBase):
+    """Stand-in for sys.stdout that can send each thread's prints elsewhere.
+
+    Threads that call capture() have their output collected in a buffer;
+    every other thread writes straight through to the real stream. This lets
+    report stages run in the background without mixing into the screen.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def release(self):
+        self._local.buffer = None
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        if getattr(self._local, 'buffer', None) is None:
+            self.stream.flush()
+
+
+def run_captured(output, func):
+    """Run func with this thread's prints captured; return everything it printed."""
+    buffer = output.capture()
+    try:
+        func()
+    except Exception as e:
+        print(f"\n  ❌ Something went wrong: {e}")
+    finally:
+        output.release()
+    return buffer.getvalue()
+
+
+# ─── Dashboard Data ────────────────────────────────────────────────────────────
+
+# Facts that rarely change (cached, see PROBE_CACHE_TTL)
+HARDWARE_SCRIPT = """
+$cpu = @(Get-CimInstance Win32_Processor |
+    Select-Object Name, NumberOfCores, NumberOfLogicalProcessors, MaxClockSpeed)
+$os = Get-CimInstance Win32_OperatingSystem
+$disks = @(Get-CimInstance Win32_DiskDrive | Select-Object Model, Size, MediaType)
+[pscustomobject]@{
+    cpu = $cpu
+    memory = [pscustomobject]@{ total_kb = $os.TotalVisibleMemorySize }
+    disks = $disks
+} | ConvertTo-Json -Depth 4 -Compress
+"""
+
+# Current load, free memory and uptime (used when ctypes can't read them)
+LIVE_SCRIPT = """
+$os = Get-CimInstance Win32_OperatingSystem
+[pscustomobject]@{
+    cpu_load = (Get-CimInstance Win32_Processor | Measure-Object -Property LoadPercentage -Average).Average
+    free_kb = $os.FreePhysicalMemory
+    uptime_seconds = [long]((Get-Date) - $os.LastBootUpTime).TotalSeconds
+} | ConvertTo-Json -Compress
+"""
+
+# Lost pings are ignored rather than reported as errors, so the probe
+# succeeds and "connected" comes from how many replies came back.
+NETWORK_SCRIPT = """
+$pings = @(Test-Connection -ComputerName 8.8.8.8 -Count 3 -ErrorAction Ignore |
+    Where-Object { -not $_.PSObject.Properties['Status'] -or "$($_.Status)" -eq 'Success' })
+$latency = @($pings | ForEach-Object { if ($_.PSObject.Properties['Latency']) { $_.Latency } else { $_.ResponseTime } })
+[pscustomobject]@{
+    replies = $pings.Count
+    latency_ms = $(if ($latency.Count) { ($latency | Measure-Object -Average).Average } else { $null })
+} | ConvertTo-Json -Compress
+"""
+
+DashboardData = namedtuple('DashboardData', [
+    'cpu_name', 'cpu_cores', 'cpu_threads', 'cpu_speed_mhz', 'cpu_load',
+    'ram_total_gb', 'ram_used_gb', 'ram_free_gb', 'ram_percent',
+    'disks', 'uptime_seconds', 'load_average',
+], defaults=(None,))  # load_average: (1, 5, 15 minute) on Linux, None on Windows
+DiskInfo = namedtuple('DiskInfo', ['model', 'size_bytes', 'media_type'])
+NetworkStatus = namedtuple('NetworkStatus', ['connected', 'latency_ms'])
+
+
+def _as_list(value):
+    """ConvertTo-Json turns one-item arrays into plain objects; undo that."""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _as_number(value, default=0):
+    try:
+        return type(default)(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_dashboard_json(text, live=None):
+    """Turn the output of HARDWARE_SCRIPT plus live stats into DashboardData.
+
+    live is a dict with cpu_load, free_kb and uptime_seconds (the shape of
+    LIVE_SCRIPT's output). Missing or malformed fields fall back to
+    0 / "Unknown"; text that isn't JSON at all raises ValueError.
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("dashboard data is not a JSON object")
+    live = live or {}
+
+    cpus = [c for c in _as_list(data.get('cpu')) if isinstance(c, dict)]
+    loads = [_as_number(c.get('LoadPercentage')) for c in cpus if c.get('LoadPercentage') is not None]
+    if live.get('cpu_load') is not None:
+        loads = [_as_number(live['cpu_load'], 0.0)]
+
+    memory = data.get('memory') if isinstance(data.get('memory'), dict) else {}
+    total_gb = _as_number(memory.get('total_kb'), 0.0) / 1024 / 1024
+    free_gb = _as_number(live.get('free_kb', memory.get('free_kb')), 0.0) / 1024 / 1024
+    used_gb = max(total_gb - free_gb, 0.0)
+    uptime = live.get('uptime_seconds', data.get('uptime_seconds'))
+
+    disks = [
+        DiskInfo(d.get('Model') or "Unknown", _as_number(d.get('Size')), d.get('MediaType') or "")
+        for d in _as_list(data.get('disks')) if isinstance(d, dict)
+    ]
+
+    return DashboardData(
+        cpu_name=(cpus[0].get('Name') or "Unknown").strip() if cpus else "Unknown",
+        cpu_cores=sum(_as_number(c.get('NumberOfCores')) for c in cpus),
+        cpu_threads=sum(_as_number(c.get('NumberOfLogicalProcessors')) for c in cpus),
+        cpu_speed_mhz=max([_as_number(c.get('MaxClockSpeed')) for c in cpus] or [0]),
+        cpu_load=round(sum(loads) / len(loads)) if loads else 0,
+        ram_total_gb=total_gb,
+        ram_used_gb=used_gb,
+        ram_free_gb=free_gb,
+        ram_percent=round(used_gb / total_gb * 100) if total_gb else 0,
+        disks=disks,
+        uptime_seconds=_as_number(uptime) if uptime is not None else None,
+    )
+
+
+def parse_network_json(text):
+    """Turn the output of NETWORK_SCRIPT into NetworkStatus."""
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("network data is not a JSON object")
+    latency = data.get('latency_ms')
+    return NetworkStatus(
+        connected=_as_number(data.get('replies')) > 0,
+        latency_ms=_as_number(latency, 0.0) if latency is not None else None,
+    )
+
+
+def read_windows_live_stats(sample_seconds=0.25):
+    """Read CPU load, free memory and uptime straight from the Windows API.
+
+    Returns a dict shaped like LIVE_SCRIPT's output, or None when not on
+    Windows. CPU load is measured over sample_seconds with GetSystemTimes.
+    """
+    try:
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.windll.kernel32
+    except (ImportError, AttributeError, OSError):
+        return None
+
+    class MEMORYSTATUSEX(ctypes.Structure):
+        _fields_ = [
+            ("dwLength", wintypes.DWORD),
+            ("dwMemoryLoad", wintypes.DWORD),
+            ("ullTotalPhys", ctypes.c_ulonglong),
+            ("ullAvailPhys", ctypes.c_ulonglong),
+            ("ullTotalPageFile", ctypes.c_ulonglong),
+            ("ullAvailPageFile", ctypes.c_ulonglong),
+            ("ullTotalVirtual", ctypes.c_ulonglong),
+            ("ullAvailVirtual", ctypes.c_ulonglong),
+            ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+        ]
+
+    def system_times():
+        idle, kernel, user = (wintypes.FILETIME() for _ in range(3))
+        if not kernel32.GetSystemTimes(ctypes.byref(idle), ctypes.byref(kernel), ctypes.byref(user)):
+            raise OSError("GetSystemTimes failed")
+        as_int = lambda ft: (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+        return as_int(idle), as_int(kernel) + as_int(user)  # kernel time includes idle
+
+    try:
+        memory = MEMORYSTATUSEX()
+        memory.dwLength = ctypes.sizeof(memory)
+        if not kernel32.GlobalMemoryStatusEx(ctypes.byref(memory)):
+            return None
+        kernel32.GetTickCount64.restype = ctypes.c_ulonglong
+
+        idle1, total1 = system_times()
+        time.sleep(sample_seconds)
+        idle2, total2 = system_times()
+        busy = 1 - (idle2 - idle1) / (total2 - total1) if total2 > total1 else 0
+
+        return {
+            "cpu_load": round(max(0.0, min(busy, 1.0)) * 100),
+            "free_kb": memory.ullAvailPhys // 1024,
+            "uptime_seconds": kernel32.GetTickCount64() // 1000,
+        }
+    except OSError:
+        return None
+
+
+HOTFIX_SCRIPT = """
+@(Get-HotFix | Select-Object HotFixID, Description,
+    @{Name='InstalledOn';Expression={ if ($_.InstalledOn) { $_.InstalledOn.ToString('yyyy-MM-dd') } else { '' } }}) |
+    ConvertTo-Json -Compress
+"""
+
+
+def parse_hotfixes(text):
+    """Turn HOTFIX_SCRIPT output into [{HotFixID, Description, InstalledOn}], newest first."""
+    hotfixes = [h for h in _as_list(json.loads(text)) if isinstance(h, dict)]
+    hotfixes.sort(key=lambda h: h.get('InstalledOn') or '', reverse=True)
+    return hotfixes
+
+
+# ─── Probe Cache ───────────────────────────────────────────────────────────────
+
+# How long each cached probe stays valid, in seconds
+PROBE_CACHE_TTL = {
+    "hardware": 24 * 3600,  # CPU model, cores, RAM size, disk models
+    "hotfixes": 6 * 3600,   # Installed Windows updates
+    "network": 60,          # Internet reachability and latency
+}
+
+
+class ProbeCache:
+    """Small JSON file of probe results, each with the time it was fetched."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+                self._entries = entries if isinstance(entries, dict) else {}
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        tmp = self.path.with_suffix('.tmp')
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def get(self, name, ttl):
+        """Return the cached value if it is younger than ttl seconds, else None."""
+        with self._lock:
+            entry = self._load().get(name)
+            if isinstance(entry, dict) and 0 <= time.time() - entry.get('time', 0) < ttl:
+                return entry.get('value')
+            return None
+
+    def put(self, name, value):
+        with self._lock:
+            self._load()[name] = {"time": time.time(), "value": value}
+            self._save()
+
+    def invalidate(self, names=None):
+        """Forget the given probes, or everything when names is None."""
+        with self._lock:
+            entries = self._load()
+            for name in list(entries) if names is None else names:
+                entries.pop(name, None)
+            self._save()
+
+
+# ─── Service Status ────────────────────────────────────────────────────────────
+
+SERVICE_QUERY_CHUNK = 200  # Names per Get-Service call, keeps each script small
+
+
+def service_status_script(names):
+    """PowerShell that returns [{Name, Status}] for the given services as JSON.
+
+    Missing names are ignored rather than reported as errors, and the JSON
+    is the last statement, so one unknown service can't fail the batch.
+    """
+    quoted = ",".join("'" + name.replace("'", "''") + "'" for name in names)
+    return (
+        f"$services = @(Get-Service -Name {quoted} -ErrorAction Ignore | "
+        "Select-Object Name, @{Name='Status';Expression={\"$($_.Status)\"}}); "
+        "ConvertTo-Json -InputObject $services -Compress"
+    )
+
+
+def parse_service_statuses(text, names):
+    """Map each requested name to its status, or None if the service wasn't found."""
+    statuses = {name: None for name in names}
+    if not text.strip():
+        return statuses
+    by_lower = {name.lower(): name for name in names}
+    for entry in _as_list(json.loads(text)):
+        if isinstance(entry, dict) and entry.get('Name'):
+            requested = by_lower.get(str(entry['Name']).lower())
+            if requested is not None:
+                statuses[requested] = str(entry.get('Status') or "Unknown")
+    return statuses
+
+
+def load_service_list(path):
+    """Read service names from a text file: one per line, # starts a comment."""
+    names = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            name = line.split('#', 1)[0].strip()
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+# ─── Continuous Monitoring ─────────────────────────────────────────────────────
+
+MONITOR_WINDOWS = (60, 300, 900)  # Sliding windows shown by --monitor, in seconds
+
+
+class RingBuffer:
+    """Fixed-size series of floats backed by an array, so memory never grows."""
+
+    def __init__(self, capacity):
+        self.capacity = max(1, int(capacity))
+        self.data = array('d', bytes(8 * self.capacity))
+        self.count = 0
+        self.next = 0
+
+    def append(self, value):
+        self.data[self.next] = value
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def last(self, n=None):
+        """The most recent n values (all of them by default), oldest first."""
+        n = self.count if n is None else min(max(n, 0), self.count)
+        start = (self.next - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.data[start:start + n].tolist()
+        return self.data[start:].tolist() + self.data[:self.next].tolist()
+
+    def stats(self, n=None):
+        """(min, avg, p95, max) over the last n values, or None if empty."""
+        values = sorted(self.last(n))
+        if not values:
+            return None
+        p95 = values[max(0, math.ceil(0.95 * len(values)) - 1)]  # nearest rank
+        return values[0], sum(values) / len(values), p95, values[-1]
+
+
+class WindowsSampler:
+    """Cheap system-wide samples through the Windows API (no PowerShell).
+
+    sample() returns {cpu, memory, disk, network}: CPU and memory use in
+    percent, disk and network throughput in bytes per second since the
+    previous call. Everything is set up once so each sample costs only a
+    few API calls.
+    """
+
+    PDH_FMT_DOUBLE = 0x00000200
+    IF_TYPE_LOOPBACK = 24
+    MIB_IFROW_SIZE = 860
+    IN_OCTETS_OFFSET = 552
+    OUT_OCTETS_OFFSET = 576
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        self.ctypes = ctypes
+        self.kernel32 = ctypes.windll.kernel32
+        self.iphlpapi = ctypes.windll.iphlpapi
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", wintypes.DWORD), ("dwMemoryLoad", wintypes.DWORD)] + \
+                [(name, ctypes.c_ulonglong) for name in (
+                    "ullTotalPhys", "ullAvailPhys", "ullTotalPageFile", "ullAvailPageFile",
+                    "ullTotalVirtual", "ullAvailVirtual", "ullAvailExtendedVirtual")]
+
+        class PDH_FMT_COUNTERVALUE(ctypes.Structure):
+            _fields_ = [("CStatus", wintypes.DWORD), ("doubleValue", ctypes.c_double)]
+
+        self.memory = MEMORYSTATUSEX()
+        self.memory.dwLength = ctypes.sizeof(self.memory)
+        self.times = [wintypes.FILETIME() for _ in range(3)]
+        self.counter_value = PDH_FMT_COUNTERVALUE()
+        self.if_table = ctypes.create_string_buffer(64 * 1024)
+        self.if_size = wintypes.ULONG()
+
+        # Disk throughput comes from a performance counter query
+        self.pdh = None
+        try:
+            pdh = ctypes.windll.pdh
+            self.query = ctypes.c_void_p()
+            self.disk_counter = ctypes.c_void_p()
+            if pdh.PdhOpenQueryW(None, None, ctypes.byref(self.query)) == 0 and \
+                    pdh.PdhAddEnglishCounterW(self.query, "\\PhysicalDisk(_Total)\\Disk Bytes/sec",
+                                              None, ctypes.byref(self.disk_counter)) == 0:
+                pdh.PdhCollectQueryData(self.query)
+                self.pdh = pdh
+        except (AttributeError, OSError):
+            self.pdh = None
+
+        self.prev_cpu = self._cpu_times()
+        self.prev_net = self._net_octets()
+        self.prev_time = time.monotonic()
+
+    def _cpu_times(self):
+        idle, kernel, user = self.times
+        byref = self.ctypes.byref
+        self.kernel32.GetSystemTimes(byref(idle), byref(kernel), byref(user))
+        as_int = lambda ft: (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+        return as_int(idle), as_int(kernel) + as_int(user)
+
+    def _net_octets(self):
+        """Total (in, out) bytes over all non-loopback interfaces."""
+        self.if_size.value = len(self.if_table)
+        result = self.iphlpapi.GetIfTable(self.if_table, self.ctypes.byref(self.if_size), False)
+        if result == 122:  # ERROR_INSUFFICIENT_BUFFER: grow once and retry
+            self.if_table = self.ctypes.create_string_buffer(self.if_size.value)
+            result = self.iphlpapi.GetIfTable(self.if_table, self.ctypes.byref(self.if_size), False)
+        if result != 0:
+            return None
+        raw = self.if_table.raw
+        rows = struct.unpack_from('<I', raw, 0)[0]
+        received = sent = 0
+        for i in range(rows):
+            base = 4 + i * self.MIB_IFROW_SIZE
+            if struct.unpack_from('<I', raw, base + 516)[0] == self.IF_TYPE_LOOPBACK:
+                continue
+            received += struct.unpack_from('<I', raw, base + self.IN_OCTETS_OFFSET)[0]
+            sent += struct.unpack_from('<I', raw, base + self.OUT_OCTETS_OFFSET)[0]
+        return received, sent
+
+    def sample(self):
+        now = time.monotonic()
+        elapsed = max(now - self.prev_time, 1e-6)
+        self.prev_time = now
+
+        idle, total = self._cpu_times()
+        d_idle, d_total = idle - self.prev_cpu[0], total - self.prev_cpu[1]
+        self.prev_cpu = (idle, total)
+        cpu = 100.0 * (1 - d_idle / d_total) if d_total > 0 else 0.0
+
+        self.kernel32.GlobalMemoryStatusEx(self.ctypes.byref(self.memory))
+
+        disk = 0.0
+        if self.pdh is not None and self.pdh.PdhCollectQueryData(self.query) == 0:
+            if self.pdh.PdhGetFormattedCounterValue(self.disk_counter, self.PDH_FMT_DOUBLE, None,
+                                                    self.ctypes.byref(self.counter_value)) == 0:
+                disk = self.counter_value.doubleValue
+
+        network = 0.0
+        octets = self._net_octets()
+        if octets is not None and self.prev_net is not None:
+            # The counters are 32-bit and wrap around, so compare modulo 2^32
+            delta = sum((new - old) % (1 << 32) for new, old in zip(octets, self.prev_net))
+            network = delta / elapsed
+        self.prev_net = octets
+
+        return {
+            "cpu": max(0.0, min(cpu, 100.0)),
+            "memory": float(self.memory.dwMemoryLoad),
+            "disk": disk,
+            "network": network,
+        }
+
+
+# ─── Process Sampling ──────────────────────────────────────────────────────────
+
+# Times are FILETIME ticks (100 ns); creation time tells apart a reused PID
+PROCESS_SNAPSHOT_SCRIPT = """
+$procs = @(Get-CimInstance Win32_Process | Select-Object ProcessId, ParentProcessId, Name,
+    @{Name='Created';Expression={ if ($_.CreationDate) { $_.CreationDate.ToFileTimeUtc() } else { 0 } }},
+    KernelModeTime, UserModeTime, WorkingSetSize, ReadTransferCount, WriteTransferCount,
+    ReadOperationCount, WriteOperationCount)
+[pscustomobject]@{
+    time = [DateTime]::UtcNow.ToFileTimeUtc()
+    cpus = [Environment]::ProcessorCount
+    processes = $procs
+} | ConvertTo-Json -Depth 3 -Compress
+"""
+
+ProcessSample = namedtuple('ProcessSample', [
+    'pid', 'ppid', 'name', 'created', 'cpu_seconds', 'memory',
+    'read_bytes', 'write_bytes', 'read_ops', 'write_ops',
+])
+ProcessSnapshot = namedtuple('ProcessSnapshot', ['time', 'cpus', 'processes'])
+ProcessDelta = namedtuple('ProcessDelta', [
+    'pid', 'ppid', 'name', 'cpu_percent', 'memory', 'memory_delta',
+    'read_rate', 'write_rate', 'read_ops_rate', 'write_ops_rate', 'processes',
+], defaults=(1,))  # processes: how many were folded into this entry
+
+# Make names user-friendly
+FRIENDLY_PROCESS_NAMES = {
+    'chrome': '🌐 Google Chrome',
+    'firefox': '🌐 Firefox',
+    'msedge': '🌐 Microsoft Edge',
+    'explorer': '📁 Windows Explorer',
+    'svchost': '⚙️ Windows Service',
+    'Code': '💻 Visual Studio Code',
+    'Teams': '💬 Microsoft Teams',
+    'Spotify': '🎵 Spotify',
+    'Discord': '💬 Discord',
+    'steam': '🎮 Steam',
+    'SearchHost': '🔍 Windows Search',
+    'RuntimeBroker': '⚙️ Windows Runtime',
+    'dwm': '🖥️ Desktop Window Manager',
+    'csrss': '⚙️ Windows System',
+    'lsass': '🔐 Windows Security',
+    'winlogon': '🔐 Windows Login',
+}
+
+
+def friendly_process_name(name):
+    name = name[:-4] if name.lower().endswith('.exe') else name
+    return FRIENDLY_PROCESS_NAMES.get(name, f"📦 {name}")
+
+
+def parse_process_snapshot(text):
+    """Turn PROCESS_SNAPSHOT_SCRIPT output into a ProcessSnapshot.
+
+    Times are converted to seconds; processes are keyed by (pid, created).
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("process data is not a JSON object")
+    processes = {}
+    for p in _as_list(data.get('processes')):
+        if not isinstance(p, dict) or p.get('ProcessId') is None:
+            continue
+        sample = ProcessSample(
+            pid=_as_number(p.get('ProcessId')),
+            ppid=_as_number(p.get('ParentProcessId')),
+            name=str(p.get('Name') or "Unknown"),
+            created=_as_number(p.get('Created')) / 1e7,
+            cpu_seconds=(_as_number(p.get('KernelModeTime')) + _as_number(p.get('UserModeTime'))) / 1e7,
+            memory=_as_number(p.get('WorkingSetSize')),
+            read_bytes=_as_number(p.get('ReadTransferCount')),
+            write_bytes=_as_number(p.get('WriteTransferCount')),
+            read_ops=_as_number(p.get('ReadOperationCount')),
+            write_ops=_as_number(p.get('WriteOperationCount')),
+        )
+        processes[(sample.pid, sample.created)] = sample
+    return ProcessSnapshot(_as_number(data.get('time')) / 1e7, max(1, _as_number(data.get('cpus'), 1)), processes)
+
+
+def process_deltas(before, after):
+    """Per-process activity between two snapshots.
+
+    CPU is a share of the whole machine (100% = every core busy), like Task
+    Manager. Processes that started in between are measured from their
+    start; a PID reused by a new process is a new key, so it never inherits
+    the old process's counters. PID 0, the System Idle Process, only counts
+    idle time, so it is left out as Task Manager does.
+    """
+    deltas = []
+    for key, new in after.processes.items():
+        if new.pid == 0:
+            continue
+        old = before.processes.get(key)
+        if old is None:
+            if new.created and new.created < before.time:
+                continue  # Existed before but missed by the first snapshot
+            old = new._replace(cpu_seconds=0, memory=new.memory, read_bytes=0, write_bytes=0,
+                               read_ops=0, write_ops=0)
+            elapsed = after.time - max(new.created, before.time)
+        else:
+            elapsed = after.time - before.time
+        if elapsed <= 0:
+            continue
+        deltas.append(ProcessDelta(
+            pid=new.pid,
+            ppid=new.ppid,
+            name=new.name,
+            cpu_percent=max(0.0, new.cpu_seconds - old.cpu_seconds) / elapsed / after.cpus * 100,
+            memory=new.memory,
+            memory_delta=new.memory - old.memory,
+            read_rate=max(0, new.read_bytes - old.read_bytes) / elapsed,
+            write_rate=max(0, new.write_bytes - old.write_bytes) / elapsed,
+            read_ops_rate=max(0, new.read_ops - old.read_ops) / elapsed,
+            write_ops_rate=max(0, new.write_ops - old.write_ops) / elapsed,
+        ))
+    return deltas
+
+
+def top_processes(deltas, n, key=lambda d: d.cpu_percent):
+    """The n busiest processes by key, without sorting the whole list."""
+    return heapq.nlargest(n, deltas, key=key)
+
+
+def io_throughput(delta):
+    return delta.read_rate + delta.write_rate
+
+
+def fold_child_processes(deltas):
+    """Merge each process into its topmost ancestor with the same name.
+
+    Browsers, editors and build tools run as a parent plus many children of
+    the same name; folding them shows one entry per program with the rates
+    added up and processes counting the members. Children with a different
+    name (a shell started from an editor, say) stay separate.
+    """
+    by_pid = {d.pid: d for d in deltas}
+
+    def top(d):
+        seen = {d.pid}
+        parent = by_pid.get(d.ppid)
+        while parent is not None and parent.name == d.name and parent.pid not in seen:
+            d = parent
+            seen.add(d.pid)
+            parent = by_pid.get(d.ppid)
+        return d
+
+    folded = {}
+    for d in deltas:
+        root = top(d)
+        total = folded.get(root.pid)
+        if total is None:
+            folded[root.pid] = d._replace(pid=root.pid, ppid=root.ppid)
+            continue
+        folded[root.pid] = total._replace(
+            cpu_percent=total.cpu_percent + d.cpu_percent,
+            memory=total.memory + d.memory,
+            memory_delta=total.memory_delta + d.memory_delta,
+            read_rate=total.read_rate + d.read_rate,
+            write_rate=total.write_rate + d.write_rate,
+            read_ops_rate=total.read_ops_rate + d.read_ops_rate,
+            write_ops_rate=total.write_ops_rate + d.write_ops_rate,
+            processes=total.processes + d.processes,
+        )
+    return list(folded.values())
+
+
+# ─── Platform Backends ─────────────────────────────────────────────────────────
+#
+# A backend answers the questions the dashboard, the process list and the
+# monitor ask: dashboard_data(), network_status(), process_snapshot() and
+# sampler(). Windows goes through PowerShell and the Windows API; Linux reads
+# /proc directly.
+
+class WindowsBackend:
+    """System facts through the PowerShell worker pool and the Windows API."""
+
+    name = "Windows"
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def dashboard_data(self):
+        """Hardware facts from the probe cache when fresh, load read live."""
+        hardware = self.manager.cached_ps_json("hardware", HARDWARE_SCRIPT, "Getting hardware info")
+        if hardware is None:
+            return None
+
+        live = read_windows_live_stats()
+        if live is None:
+            success, output = self.manager.run_ps_command(LIVE_SCRIPT, "Getting current load")
+            try:
+                live = json.loads(output) if success and output.strip() else None
+            except ValueError:
+                live = None
+        try:
+            return parse_dashboard_json(hardware, live if isinstance(live, dict) else None)
+        except ValueError:
+            return None
+
+    def network_status(self):
+        output = self.manager.cached_ps_json("network", NETWORK_SCRIPT, "Testing network")
+        if output is None:
+            return None
+        try:
+            return parse_network_json(output)
+        except ValueError:
+            return None
+
+    def process_snapshot(self, io=False):
+        """Win32_Process always carries the I/O counters, so io changes nothing here."""
+        success, output = self.manager.run_ps_command(PROCESS_SNAPSHOT_SCRIPT, None)
+        if not success or not output.strip():
+            return None
+        try:
+            return parse_process_snapshot(output)
+        except ValueError:
+            return None
+
+    def sampler(self):
+        try:
+            return WindowsSampler()
+        except (ImportError, AttributeError, OSError):
+            return None
+
+
+PROC_HANDLE_LIMIT = 512  # Per-process stat files kept open between snapshots
+
+# Devices that aren't physical disks, or would count the same I/O twice
+_VIRTUAL_DISK_PREFIXES = ('loop', 'ram', 'zram', 'dm-', 'md', 'sr', 'fd', 'nbd')
+_PARTITION_NAME = re.compile(r'^(?:(?:sd|hd|vd|xvd)[a-z]+\d+|(?:nvme\d+n\d+|mmcblk\d+)p\d+)$')
+
+
+def _sysconf(name, default):
+    try:
+        return os.sysconf(name)
+    except (AttributeError, ValueError, OSError):
+        return default
+
+
+def parse_proc_pid_stat(text, boot_time, clock_ticks, page_size):
+    """Turn one /proc/[pid]/stat line into a ProcessSample.
+
+    The name sits in parentheses and may itself contain spaces or ')', so
+    the fields are split after the last ')'. CPU and start times are in
+    clock ticks; I/O counters aren't in this file and are left at 0.
+    """
+    pid, _, rest = text.partition(' (')
+    name, _, rest = rest.rpartition(') ')
+    fields = rest.split()  # fields[0] is field 3 (state) in proc(5) numbering
+    if len(fields) < 22:
+        raise ValueError("truncated /proc/[pid]/stat line")
+    return ProcessSample(
+        pid=int(pid),
+        ppid=int(fields[1]),
+        name=name,
+        created=boot_time + int(fields[19]) / clock_ticks,
+        cpu_seconds=(int(fields[11]) + int(fields[12])) / clock_ticks,
+        memory=int(fields[21]) * page_size,
+        read_bytes=0, write_bytes=0, read_ops=0, write_ops=0,
+    )
+
+
+def parse_proc_pid_io(text):
+    """{field: count} from /proc/[pid]/io."""
+    counters = {}
+    for line in text.splitlines():
+        name, _, value = line.partition(':')
+        value = value.strip()
+        if value.isdigit():
+            counters[name.strip()] = int(value)
+    return counters
+
+
+class LinuxProcBackend:
+    """System facts read straight from /proc, without starting any program.
+
+    Files read over and over (/proc/stat, /proc/meminfo, /proc/diskstats,
+    each process's stat) stay open and are re-read from offset 0, which
+    makes the kernel regenerate them. proc_root and sys_root can point at a
+    fake tree for testing.
+    """
+
+    name = "Linux"
+
+    def __init__(self, proc_root='/proc', sys_root='/sys', clock_ticks=None, page_size=None):
+        self.proc_root = Path(proc_root)
+        self.sys_root = Path(sys_root)
+        self.clock_ticks = clock_ticks or _sysconf('SC_CLK_TCK', 100)
+        self.page_size = page_size or _sysconf('SC_PAGE_SIZE', 4096)
+        self._files = {}
+        self._boot_time = None
+        self.io_denied = 0  # Processes whose I/O counters the last snapshot couldn't read
+
+    def _read(self, *parts, keep=True):
+        """Text of a file under proc_root, keeping the handle open when keep is set."""
+        f = self._files.pop(parts, None)
+        if f is not None:
+            try:
+                f.seek(0)
+                text = f.read()
+                self._files[parts] = f
+                return text.decode('utf-8', 'replace')
+            except OSError:
+                f.close()  # The process behind it exited; try a fresh open below
+        f = open(self.proc_root.joinpath(*parts), 'rb', buffering=0)
+        try:
+            text = f.read()
+        except OSError:
+            f.close()
+            raise
+        if keep:
+            self._files[parts] = f
+        else:
+            f.close()
+        return text.decode('utf-8', 'replace')
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    # ── Raw readers ──
+
+    def cpu_times(self):
+        """(idle, total) jiffies over all CPUs from /proc/stat."""
+        fields = [int(v) for v in self._read('stat').split('\n', 1)[0].split()[1:9]]
+        return fields[3] + (fields[4] if len(fields) > 4 else 0), sum(fields)
+
+    def cpu_count(self):
+        count = sum(1 for line in self._read('stat').splitlines()
+                    if line.startswith('cpu') and line[3:4].isdigit())
+        return max(1, count)
+
+    def boot_time(self):
+        if self._boot_time is None:
+            for line in self._read('stat', keep=False).splitlines():
+                if line.startswith('btime '):
+                    self._boot_time = int(line.split()[1])
+                    break
+            else:
+                self._boot_time = int(time.time() - self.uptime())
+        return self._boot_time
+
+    def meminfo(self):
+        """{field: kB} from /proc/meminfo."""
+        info = {}
+        for line in self._read('meminfo').splitlines():
+            name, _, rest = line.partition(':')
+            value = rest.split()
+            if value and value[0].isdigit():
+                info[name] = int(value[0])
+        return info
+
+    def memory_kb(self):
+        """(total, available) in kB; older kernels lack MemAvailable, so estimate it."""
+        info = self.meminfo()
+        available = info.get('MemAvailable')
+        if available is None:
+            available = info.get('MemFree', 0) + info.get('Buffers', 0) + info.get('Cached', 0)
+        return info.get('MemTotal', 0), available
+
+    def load_average(self):
+        return tuple(float(v) for v in self._read('loadavg').split()[:3])
+
+    def uptime(self):
+        return float(self._read('uptime').split()[0])
+
+    def is_whole_disk(self, name):
+        if name.startswith(_VIRTUAL_DISK_PREFIXES):
+            return False
+        block = self.sys_root / 'block'
+        if block.is_dir():
+            return (block / name).exists()
+        return not _PARTITION_NAME.match(name)
+
+    def disk_bytes(self):
+        """Total bytes read plus written by whole disks, from /proc/diskstats."""
+        total = 0
+        for line in self._read('diskstats').splitlines():
+            fields = line.split()
+            if len(fields) >= 10 and self.is_whole_disk(fields[2]):
+                total += (int(fields[5]) + int(fields[9])) * 512  # sectors are always 512 bytes here
+        return total
+
+    def network_bytes(self):
+        """Total bytes received plus sent by every interface except loopback."""
+        total = 0
+        for line in self._read('net', 'dev').splitlines()[2:]:
+            name, _, rest = line.partition(':')
+            fields = rest.split()
+            if name.strip() != 'lo' and len(fields) >= 9:
+                total += int(fields[0]) + int(fields[8])
+        return total
+
+    def _cpu_info(self):
+        processors, model, speeds, cores = 0, None, [], set()
+        physical = None
+        try:
+            with open(self.proc_root / 'cpuinfo', 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    key, value = key.strip(), value.strip()
+                    if key == 'processor':
+                        processors += 1
+                    elif key in ('model name', 'Hardware', 'Model') and model is None:
+                        model = value
+                    elif key == 'cpu MHz':
+                        speeds.append(float(value))
+                    elif key == 'physical id':
+                        physical = value
+                    elif key == 'core id':
+                        cores.add((physical, value))
+        except (OSError, ValueError):
+            pass
+        try:
+            max_khz = (self.sys_root / 'devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq').read_text()
+            speeds.append(int(max_khz) / 1000)
+        except (OSError, ValueError):
+            pass
+        return model or platform.processor() or "Unknown", len(cores) or processors, processors, \
+            int(max(speeds or [0]))
+
+    def _disks(self):
+        disks = []
+        try:
+            lines = self._read('partitions', keep=False).splitlines()[2:]
+        except OSError:
+            return disks
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 4 or not self.is_whole_disk(fields[3]):
+                continue
+            name = fields[3]
+            device = self.sys_root / 'block' / name
+            try:
+                model = (device / 'device' / 'model').read_text().strip() or name
+            except OSError:
+                model = name
+            try:
+                rotational = (device / 'queue' / 'rotational').read_text().strip()
+                media = "HDD" if rotational == '1' else "SSD"
+            except OSError:
+                media = ""
+            disks.append(DiskInfo(model, int(fields[2]) * 1024, media))
+        return disks
+
+    # ── Backend interface ──
+
+    def dashboard_data(self, sample_seconds=0.25):
+        try:
+            name, cores, threads, speed = self._cpu_info()
+            idle1, total1 = self.cpu_times()
+            time.sleep(sample_seconds)
+            idle2, total2 = self.cpu_times()
+            busy = 1 - (idle2 - idle1) / (total2 - total1) if total2 > total1 else 0
+            total_kb, available_kb = self.memory_kb()
+            load = self.load_average()
+            uptime = self.uptime()
+        except (OSError, ValueError, IndexError):
+            return None
+
+        total_gb = total_kb / 1024 / 1024
+        free_gb = available_kb / 1024 / 1024
+        used_gb = max(total_gb - free_gb, 0.0)
+        return DashboardData(
+            cpu_name=name,
+            cpu_cores=cores,
+            cpu_threads=threads,
+            cpu_speed_mhz=speed,
+            cpu_load=round(max(0.0, min(busy, 1.0)) * 100),
+            ram_total_gb=total_gb,
+            ram_used_gb=used_gb,
+            ram_free_gb=free_gb,
+            ram_percent=round(used_gb / total_gb * 100) if total_gb else 0,
+            disks=self._disks(),
+            uptime_seconds=int(uptime),
+            load_average=load,
+        )
+
+    def network_status(self, host='8.8.8.8', port=53, attempts=3, timeout=2.0):
+        """Reachability and latency measured as TCP connect time to a DNS server."""
+        latencies = []
+        for _ in range(attempts):
+            started = time.perf_counter()
+            try:
+                with socket.create_connection((host, port), timeout=timeout):
+                    latencies.append((time.perf_counter() - started) * 1000)
+            except OSError:
+                pass
+        return NetworkStatus(bool(latencies), sum(latencies) / len(latencies) if latencies else None)
+
+    def process_snapshot(self, io=False):
+        """Every process's counters; with io, also bytes and calls from /proc/[pid]/io.
+
+        read_bytes/write_bytes count what actually reached the storage
+        device (page cache hits don't), which is what shows a process
+        thrashing the disk. Other users' io files need root, so those
+        processes keep zeros and are counted in io_denied.
+        """
+        try:
+            boot = self.boot_time()
+            cpus = self.cpu_count()
+            pids = [entry for entry in os.listdir(self.proc_root) if entry.isdigit()]
+        except (OSError, ValueError):
+            return None
+
+        # Drop handles of processes that are gone
+        live = set(pids)
+        for key in [k for k in self._files if k[0].isdigit() and k[0] not in live]:
+            self._files.pop(key).close()
+
+        now = time.time()
+        processes = {}
+        self.io_denied = 0
+        for pid in pids:
+            try:
+                text = self._read(pid, 'stat', keep=len(self._files) < PROC_HANDLE_LIMIT)
+                sample = parse_proc_pid_stat(text, boot, self.clock_ticks, self.page_size)
+            except (OSError, ValueError):
+                continue  # Exited while we were looking, or unreadable
+            if io:
+                try:
+                    counters = parse_proc_pid_io(self._read(pid, 'io', keep=len(self._files) < PROC_HANDLE_LIMIT))
+                    sample = sample._replace(
+                        read_bytes=counters.get('read_bytes', 0),
+                        write_bytes=counters.get('write_bytes', 0),
+                        read_ops=counters.get('syscr', 0),
+                        write_ops=counters.get('syscw', 0),
+                    )
+                except PermissionError:
+                    self.io_denied += 1
+                except OSError:
+                    pass
+            processes[(sample.pid, sample.created)] = sample
+        return ProcessSnapshot(now, cpus, processes)
+
+    def sampler(self):
+        try:
+            return LinuxSampler(self)
+        except (OSError, ValueError, IndexError):
+            return None
+
+
+class LinuxSampler:
+    """Same samples as WindowsSampler, computed from /proc counters."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.prev_cpu = backend.cpu_times()
+        self.prev_disk = self._optional(backend.disk_bytes)
+        self.prev_net = self._optional(backend.network_bytes)
+        self.prev_time = time.monotonic()
+
+    @staticmethod
+    def _optional(read):
+        try:
+            return read()
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _rate(new, old, elapsed):
+        if new is None or old is None:
+            return 0.0
+        return max(0, new - old) / elapsed  # Negative when an interface or disk went away
+
+    def sample(self):
+        now = time.monotonic()
+        elapsed = max(now - self.prev_time, 1e-6)
+        self.prev_time = now
+
+        idle, total = self.backend.cpu_times()
+        d_idle, d_total = idle - self.prev_cpu[0], total - self.prev_cpu[1]
+        self.prev_cpu = (idle, total)
+        cpu = 100.0 * (1 - d_idle / d_total) if d_total > 0 else 0.0
+
+        total_kb, available_kb = self.backend.memory_kb()
+        memory = 100.0 * (total_kb - available_kb) / total_kb if total_kb else 0.0
+
+        disk = self._optional(self.backend.disk_bytes)
+        network = self._optional(self.backend.network_bytes)
+        disk_rate = self._rate(disk, self.prev_disk, elapsed)
+        network_rate = self._rate(network, self.prev_net, elapsed)
+        self.prev_disk, self.prev_net = disk, network
+
+        return {
+            "cpu": max(0.0, min(cpu, 100.0)),
+            "memory": memory,
+            "disk": disk_rate,
+            "network": network_rate,
+        }
+
+
+def create_backend(manager):
+    """The backend for this platform: /proc on Linux, PowerShell everywhere else."""
+    if sys.platform.startswith('linux') and os.path.isdir('/proc/self'):
+        return LinuxProcBackend()
+    return WindowsBackend(manager)
+
+
+# ─── Metric History Store ──────────────────────────────────────────────────────
+
+METRIC_NAMES = ("cpu", "memory", "disk", "network")
+
+# (name, seconds per slot, slots kept): raw seconds for an hour, minutes for a
+# week, hours for a year. Each file is a fixed-size ring, so disk use is bounded.
+STORE_LEVELS = (
+    ("raw", 1, 3600),
+    ("1m", 60, 7 * 24 * 60),
+    ("1h", 3600, 366 * 24),
+)
+
+_STORE_MAGIC = b"PMTS"
+_STORE_HEADER = struct.Struct("<4sHIIH")  # magic, version, step, slots, metric count
+_STORE_HEADER_SIZE = 64
+
+
+class MetricRing:
+    """One resolution of the metric store: a memory-mapped ring of fixed slots.
+
+    A slot holds the bucket start time and (min, max, sum, count) for every
+    metric; the slot for time ts is (ts // step) % slots. Old buckets are
+    simply overwritten, so the file never grows.
+    """
+
+    def __init__(self, path, step, slots, metrics=METRIC_NAMES, readonly=False):
+        self.path = Path(path)
+        self.step = step
+        self.slots = slots
+        self.metrics = metrics
+        self.record = struct.Struct("<q" + "dddI" * len(metrics))
+        size = _STORE_HEADER_SIZE + slots * self.record.size
+        header = _STORE_HEADER.pack(_STORE_MAGIC, 1, step, slots, len(metrics))
+
+        if not readonly:
+            existing = b""
+            if self.path.exists():
+                with open(self.path, "rb") as f:
+                    existing = f.read(_STORE_HEADER.size)
+            if existing != header or self.path.stat().st_size != size:
+                # New file, or one written with a different layout: start over
+                with open(self.path, "wb") as f:
+                    f.write(header.ljust(_STORE_HEADER_SIZE, b"\0"))
+                    f.truncate(size)
+
+        self.file = open(self.path, "rb" if readonly else "r+b")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE)
+        if self.map[:_STORE_HEADER.size] != header:
+            self.close()
+            raise ValueError(f"{self.path} is not a metric store with the expected layout")
+
+    def _offset(self, bucket):
+        return _STORE_HEADER_SIZE + ((bucket // self.step) % self.slots) * self.record.size
+
+    def add(self, ts, values):
+        """Fold one sample ({metric: value}) into the bucket containing ts."""
+        bucket = int(ts) // self.step * self.step
+        offset = self._offset(bucket)
+        fields = list(self.record.unpack_from(self.map, offset))
+        if fields[0] != bucket:
+            fields = [bucket] + [0.0, 0.0, 0.0, 0] * len(self.metrics)
+        for i, name in enumerate(self.metrics):
+            value = values.get(name)
+            if value is None:
+                continue
+            base = 1 + i * 4
+            count = fields[base + 3]
+            fields[base] = value if count == 0 else min(fields[base], value)
+            fields[base + 1] = value if count == 0 else max(fields[base + 1], value)
+            fields[base + 2] += value
+            fields[base + 3] = count + 1
+        self.record.pack_into(self.map, offset, *fields)
+
+    def query(self, metric, start, end):
+        """[(bucket start, min, max, avg, count)] for buckets between start and end."""
+        i = self.metrics.index(metric)
+        base = 1 + i * 4
+        rows = []
+        first = int(start) // self.step * self.step
+        last = int(end) // self.step * self.step
+        for bucket in range(max(first, last - (self.slots - 1) * self.step), last + 1, self.step):
+            fields = self.record.unpack_from(self.map, self._offset(bucket))
+            count = fields[base + 3]
+            if fields[0] == bucket and count:
+                rows.append((bucket, fields[base], fields[base + 1], fields[base + 2] / count, count))
+        return rows
+
+    def covers(self, start, now):
+        return now - start <= self.step * self.slots
+
+    def close(self):
+        if not self.map.closed:
+            self.map.close()
+        self.file.close()
+
+
+class MetricStore:
+    """Raw, per-minute and per-hour metric history in memory-mapped files.
+
+    Every sample updates all resolutions at once, so the rollups are always
+    current and no separate compaction pass is needed. Readers open the
+    files read-only and only touch the slots a query needs.
+    """
+
+    def __init__(self, directory, metrics=METRIC_NAMES, levels=STORE_LEVELS, readonly=False):
+        self.directory = Path(directory)
+        if not readonly:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.readonly = readonly
+        self.rings = []
+        try:
+            for name, step, slots in levels:
+                self.rings.append((name, MetricRing(self.directory / f"metrics_{name}.ring",
+                                                    step, slots, metrics, readonly)))
+        except Exception:
+            self.close()
+            raise
+
+    def add(self, values, ts=None):
+        ts = time.time() if ts is None else ts
+        for _, ring in self.rings:
+            ring.add(ts, values)
+
+    def query(self, metric, start, end=None, level=None):
+        """Rows for metric between start and end, from the finest level that still has them."""
+        end = time.time() if end is None else end
+        for name, ring in self.rings:
+            if (level is None and ring.covers(start, time.time())) or name == level:
+                return name, ring.query(metric, start, end)
+        name, ring = self.rings[-1]
+        return name, ring.query(metric, start, end)
+
+    def summary(self, metric, start, end=None):
+        """(min, avg, max, samples) over a time range, or None without data."""
+        _, rows = self.query(metric, start, end)
+        if not rows:
+            return None
+        count = sum(r[4] for r in rows)
+        return (min(r[1] for r in rows), sum(r[3] * r[4] for r in rows) / count,
+                max(r[2] for r in rows), count)
+
+    def flush(self):
+        if not self.readonly:
+            for _, ring in self.rings:
+                ring.map.flush()
+
+    def close(self):
+        for _, ring in self.rings:
+            ring.close()
+        self.rings = []
+
+
 # ─── Banner ────────────────────────────────────────────────────────────────────
 
 def show_startup_banner():
@@ -117,9 +1664,12 @@ def show_startup_banner():
     print("╚══════════════════════════════════════════════════════════════════════════════╝")
     print()
 
-    win_info = get_windows_info()
-    print(f"🪟  Running on: {win_info['name']} (Build {win_info['build']})")
-    print(f"👤  User: {os.getenv('USERNAME', 'Unknown')}")
+    if sys.platform.startswith('linux'):
+        print(f"🐧  Running on: Linux {platform.release()}")
+    else:
+        win_info = get_windows_info()
+        print(f"🪟  Running on: {win_info['name']} (Build {win_info['build']})")
+    print(f"👤  User: {os.getenv('USERNAME') or os.getenv('USER', 'Unknown')}")
     print(f"📅  Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     is_admin = check_admin()
     admin_status = "✅ Administrator" if is_admin else "⚠️  Standard User (some features need admin)"
@@ -137,6 +1687,10 @@ class WindowsPerformanceManager:
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.log_file = self.log_dir / "performance_manager.log"
         self.win_info = get_windows_info()
+        self.ps_pool = PowerShellPool()
+        self.cache = ProbeCache(self.log_dir / "probe_cache.json")
+        self._ps_worker_failed = False
+        self.backend = create_backend(self)
 
     def log_action(self, action, success=True, details=""):
         """Log the action to the log file with timestamp and success status."""
@@ -151,8 +1705,24 @@ class WindowsPerformanceManager:
         except Exception:
             pass
 
-    def run_ps_command(self, ps_script, description=None):
-        """Execute a PowerShell command and return (success, output)."""
+    def run_ps_command(self, ps_script, description=None, timeout=120):
+        """Execute a PowerShell command and return (success, output).
+
+        Commands go to the shared PowerShell worker session. If the worker
+        can't be started, each command gets its own PowerShell process.
+        """
+        if not self._ps_worker_failed:
+            try:
+                success, output = self.ps_pool.run(ps_script, timeout)
+            except OSError as e:
+                self._ps_worker_failed = True
+                self.log_action("Starting PowerShell worker", success=False, details=str(e))
+            else:
+                if description:
+                    self.log_action(description, success=success,
+                                    details="" if success else output[:200])
+                return success, output
+
         command = f'powershell -NoProfile -ExecutionPolicy Bypass -Command "{ps_script}"'
         return self._run(command, description)
 
@@ -184,6 +1754,30 @@ class WindowsPerformanceManager:
 
     # ─── 1. System Overview Dashboard ───────────────────────────────────────
 
+    def cached_ps_json(self, name, script, description=None):
+        """Run a JSON-producing script, reusing its output for PROBE_CACHE_TTL[name]."""
+        output = self.cache.get(name, PROBE_CACHE_TTL[name])
+        if output is not None:
+            return output
+        success, output = self.run_ps_command(script, description)
+        if not success or not output.strip():
+            return None
+        try:
+            json.loads(output)
+        except ValueError:
+            self.log_action(f"Parsing {name}", success=False, details=output[:200])
+            return None
+        self.cache.put(name, output)
+        return output
+
+    def get_dashboard_data(self):
+        """Collect CPU, memory, disk and uptime facts, or None if they can't be read."""
+        return self.backend.dashboard_data()
+
+    def get_network_status(self):
+        """Check the internet connection and latency."""
+        return self.backend.network_status()
+
     def show_system_dashboard(self):
         """Show a comprehensive system performance dashboard."""
         print()
@@ -194,56 +1788,52 @@ class WindowsPerformanceManager:
         print("=" * 65)
         print()
 
-        # CPU Information
-        print("  🖥️  PROCESSOR (CPU)")
-        print("  ─" * 25)
+        # The CIM query and the network test run at the same time; each
+        # section is printed as soon as it and the ones above it are ready
+        sections = [
+            ("dashboard", self._print_cpu_section),
+            ("dashboard", self._print_memory_section),
+            ("dashboard", self._print_storage_section),
+            ("network", self._print_network_section),
+            ("dashboard", self._print_uptime_section),
+        ]
+        results = {}
+        printed = [0]
+
+        def render(name, result):
+            results[name] = result
+            while printed[0] < len(sections):
+                probe, print_section = sections[printed[0]]
+                if probe not in results:
+                    return
+                print_section(probe_value(results[probe]))
+                printed[0] += 1
+
+        scheduler = ProbeScheduler()
+        scheduler.add("dashboard", lambda deps: self.get_dashboard_data(), timeout=60)
+        scheduler.add("network", lambda deps: self.get_network_status(), timeout=30)
+        scheduler.run(render)
 
-        success, output = self.run_ps_command(
-            "Get-CimInstance Win32_Processor | Select-Object -Property Name, NumberOfCores, "
-            "NumberOfLogicalProcessors, MaxClockSpeed, LoadPercentage | Format-List",
-            "Getting CPU info"
-        )
+        self.log_action("System dashboard displayed")
 
-        cpu_name = "Unknown"
-        cpu_cores = 0
-        cpu_threads = 0
-        cpu_speed = 0
-        cpu_load = 0
+    def _print_cpu_section(self, data):
+        print("  🖥️  PROCESSOR (CPU)")
+        print("  ─" * 25)
 
-        if success and output:
-            for line in output.split('\n'):
-                line = line.strip()
-                if line.startswith('Name'):
-                    cpu_name = line.split(':', 1)[1].strip() if ':' in line else "Unknown"
-                elif line.startswith('NumberOfCores'):
-                    try:
-                        cpu_cores = int(line.split(':')[1].strip())
-                    except (ValueError, IndexError):
-                        pass
-                elif line.startswith('NumberOfLogicalProcessors'):
-                    try:
-                        cpu_threads = int(line.split(':')[1].strip())
-                    except (ValueError, IndexError):
-                        pass
-                elif line.startswith('MaxClockSpeed'):
-                    try:
-                        cpu_speed = int(line.split(':')[1].strip())
-                    except (ValueError, IndexError):
-                        pass
-                elif line.startswith('LoadPercentage'):
-                    try:
-                        cpu_load = int(line.split(':')[1].strip())
-                    except (ValueError, IndexError):
-                        pass
+        cpu_name = data.cpu_name if data else "Unknown"
+        cpu_load = data.cpu_load if data else 0
 
         print(f"  💻 Processor: {cpu_name}")
-        if cpu_cores > 0:
-            print(f"  ⚙️  Cores: {cpu_cores} cores, {cpu_threads} threads")
-        if cpu_speed > 0:
-            print(f"  ⚡ Speed: {cpu_speed / 1000:.1f} GHz")
+        if data and data.cpu_cores > 0:
+            print(f"  ⚙️  Cores: {data.cpu_cores} cores, {data.cpu_threads} threads")
+        if data and data.cpu_speed_mhz > 0:
+            print(f"  ⚡ Speed: {data.cpu_speed_mhz / 1000:.1f} GHz")
 
         cpu_bar = format_bar(cpu_load, 100)
         print(f"  📊 Current usage: {cpu_bar}")
+        if data and data.load_average:
+            one, five, fifteen = data.load_average
+            print(f"  📈 Load average: {one:.2f}, {five:.2f}, {fifteen:.2f} (1, 5, 15 min)")
 
         if cpu_load >= 90:
             print("     🚨 Your processor is working very hard right now!")
@@ -255,166 +1845,106 @@ class WindowsPerformanceManager:
 
         print()
 
-        # Memory (RAM) Information
+    def _print_memory_section(self, data):
         print("  💾 MEMORY (RAM)")
         print("  ─" * 25)
 
-        success, output = self.run_ps_command(
-            "$os = Get-CimInstance Win32_OperatingSystem; "
-            "$total = [math]::Round($os.TotalVisibleMemorySize / 1MB, 1); "
-            "$free = [math]::Round($os.FreePhysicalMemory / 1MB, 1); "
-            "$used = [math]::Round($total - $free, 1); "
-            "$percent = [math]::Round(($used / $total) * 100, 0); "
-            "Write-Output \"$total|$used|$free|$percent\"",
-            "Getting RAM info"
-        )
-
-        if success and output and '|' in output:
-            parts = output.strip().split('|')
-            try:
-                total_ram = float(parts[0])
-                used_ram = float(parts[1])
-                free_ram = float(parts[2])
-                ram_percent = int(parts[3])
-
-                print(f"  📊 Total RAM: {total_ram:.1f} GB")
-                ram_bar = format_bar(ram_percent, 100)
-                print(f"  📊 Usage: {ram_bar}")
-                print(f"     Used: {used_ram:.1f} GB  |  Free: {free_ram:.1f} GB")
-
-                if ram_percent >= 90:
-                    print("     🚨 Your memory is almost full!")
-                    print("     💡 Close some programs or browser tabs to free up memory.")
-                    print("     💡 If this happens often, your computer might need more RAM.")
-                elif ram_percent >= 75:
-                    print("     ⚠️  Memory usage is getting high.")
-                    print("     💡 Consider closing programs you're not actively using.")
-                else:
-                    print("     ✅ Memory usage looks good.")
-            except (ValueError, IndexError):
-                print("  ⚠️  Could not read memory details.")
+        if data and data.ram_total_gb > 0:
+            ram_percent = data.ram_percent
+            print(f"  📊 Total RAM: {data.ram_total_gb:.1f} GB")
+            ram_bar = format_bar(ram_percent, 100)
+            print(f"  📊 Usage: {ram_bar}")
+            print(f"     Used: {data.ram_used_gb:.1f} GB  |  Free: {data.ram_free_gb:.1f} GB")
+
+            if ram_percent >= 90:
+                print("     🚨 Your memory is almost full!")
+                print("     💡 Close some programs or browser tabs to free up memory.")
+                print("     💡 If this happens often, your computer might need more RAM.")
+            elif ram_percent >= 75:
+                print("     ⚠️  Memory usage is getting high.")
+                print("     💡 Consider closing programs you're not actively using.")
+            else:
+                print("     ✅ Memory usage looks good.")
         else:
             print("  ⚠️  Could not read memory information.")
 
         print()
 
-        # Disk I/O
+    def _print_storage_section(self, data):
         print("  💿 STORAGE")
         print("  ─" * 25)
 
-        success, output = self.run_ps_command(
-            "Get-CimInstance Win32_DiskDrive | Select-Object -Property Model, Size, MediaType | "
-            "Format-List",
-            "Getting disk info"
-        )
-
-        if success and output:
-            for line in output.split('\n'):
-                line = line.strip()
-                if line.startswith('Model'):
-                    disk_name = line.split(':', 1)[1].strip() if ':' in line else "Unknown"
-                    print(f"  💿 Drive: {disk_name}")
-                elif line.startswith('Size'):
-                    try:
-                        size_bytes = int(line.split(':')[1].strip())
-                        print(f"     Capacity: {format_size(size_bytes)}")
-                    except (ValueError, IndexError):
-                        pass
-                elif line.startswith('MediaType'):
-                    media = line.split(':', 1)[1].strip() if ':' in line else ""
-                    if media:
-                        is_ssd = 'ssd' in media.lower() or 'solid' in media.lower()
-                        if is_ssd:
-                            print(f"     Type: ⚡ SSD (fast storage)")
-                        else:
-                            print(f"     Type: 💿 HDD (standard storage)")
-                            print(f"     💡 An SSD upgrade would make your computer much faster!")
-                    print()
+        if data and data.disks:
+            for disk in data.disks:
+                print(f"  💿 Drive: {disk.model}")
+                if disk.size_bytes:
+                    print(f"     Capacity: {format_size(disk.size_bytes)}")
+                media = disk.media_type.lower()
+                if media:
+                    if 'ssd' in media or 'solid' in media:
+                        print(f"     Type: ⚡ SSD (fast storage)")
+                    else:
+                        print(f"     Type: 💿 HDD (standard storage)")
+                        print(f"     💡 An SSD upgrade would make your computer much faster!")
+                print()
         else:
             print("  ⚠️  Could not read disk information.")
 
         print()
 
-        # Network
+    def _print_network_section(self, network):
         print("  🌐 NETWORK")
         print("  ─" * 25)
 
-        success, output = self.run_ps_command(
-            "Test-Connection -ComputerName 8.8.8.8 -Count 1 -Quiet",
-            "Testing network"
-        )
-
-        if success and 'true' in output.lower():
+        if network and network.connected:
             print("  ✅ Internet connection: Working")
 
-            # Check latency
-            success2, output2 = self.run_ps_command(
-                "(Test-Connection -ComputerName 8.8.8.8 -Count 3 | "
-                "Measure-Object -Property Latency -Average).Average",
-                "Measuring latency"
-            )
-
-            if success2 and output2.strip():
-                try:
-                    latency = float(output2.strip())
-                    print(f"  📡 Response time: {latency:.0f} ms")
-                    if latency < 50:
-                        print("     ✅ Very fast connection!")
-                    elif latency < 100:
-                        print("     ✅ Good connection speed.")
-                    elif latency < 200:
-                        print("     ⚠️  Connection is a bit slow.")
-                    else:
-                        print("     🚨 Connection is slow. Check your network.")
-                except (ValueError, TypeError):
-                    pass
+            if network.latency_ms is not None:
+                latency = network.latency_ms
+                print(f"  📡 Response time: {latency:.0f} ms")
+                if latency < 50:
+                    print("     ✅ Very fast connection!")
+                elif latency < 100:
+                    print("     ✅ Good connection speed.")
+                elif latency < 200:
+                    print("     ⚠️  Connection is a bit slow.")
+                else:
+                    print("     🚨 Connection is slow. Check your network.")
         else:
             print("  ❌ Internet connection: Not working")
             print("     💡 Check your Wi-Fi or network cable.")
 
         print()
 
-        # Uptime
+    def _print_uptime_section(self, data):
         print("  ⏱️  SYSTEM UPTIME")
         print("  ─" * 25)
 
-        success, output = self.run_ps_command(
-            "$uptime = (Get-Date) - (Get-CimInstance Win32_OperatingSystem).LastBootUpTime; "
-            "$days = $uptime.Days; $hours = $uptime.Hours; $mins = $uptime.Minutes; "
-            "Write-Output \"$days|$hours|$mins\"",
-            "Getting uptime"
-        )
+        if data and data.uptime_seconds is not None:
+            days, rest = divmod(int(data.uptime_seconds), 86400)
+            hours, rest = divmod(rest, 3600)
+            minutes = rest // 60
 
-        if success and output and '|' in output:
-            parts = output.strip().split('|')
-            try:
-                days = int(parts[0])
-                hours = int(parts[1])
-                minutes = int(parts[2])
-
-                if days > 0:
-                    uptime_str = f"{days} days, {hours} hours"
-                elif hours > 0:
-                    uptime_str = f"{hours} hours, {minutes} minutes"
-                else:
-                    uptime_str = f"{minutes} minutes"
+            if days > 0:
+                uptime_str = f"{days} days, {hours} hours"
+            elif hours > 0:
+                uptime_str = f"{hours} hours, {minutes} minutes"
+            else:
+                uptime_str = f"{minutes} minutes"
 
-                print(f"  ⏱️  Your computer has been on for: {uptime_str}")
+            print(f"  ⏱️  Your computer has been on for: {uptime_str}")
 
-                if days >= 7:
-                    print("     ⚠️  Your computer hasn't been restarted in over a week.")
-                    print("     💡 Restarting occasionally helps keep things running smoothly.")
-                elif days >= 3:
-                    print("     ℹ️  Consider restarting soon for best performance.")
-                else:
-                    print("     ✅ Recently restarted — that's good!")
-            except (ValueError, IndexError):
-                print("  ⚠️  Could not determine uptime.")
+            if days >= 7:
+                print("     ⚠️  Your computer hasn't been restarted in over a week.")
+                print("     💡 Restarting occasionally helps keep things running smoothly.")
+            elif days >= 3:
+                print("     ℹ️  Consider restarting soon for best performance.")
+            else:
+                print("     ✅ Recently restarted — that's good!")
         else:
             print("  ⚠️  Could not determine uptime.")
 
         print()
-        self.log_action("System dashboard displayed")
 
     # ─── 2. Startup Program Manager ─────────────────────────────────────────
 
@@ -516,91 +2046,141 @@ class WindowsPerformanceManager:
 
     # ─── 3. Running Processes ───────────────────────────────────────────────
 
-    def show_top_processes(self, top_n=15):
-        """Show the programs using the most resources."""
+    def take_process_snapshot(self, io=False):
+        """One snapshot of every process's counters, or None if it can't be read."""
+        return self.backend.process_snapshot(io=io)
+
+    def show_top_processes(self, top_n=15, interval=2.0):
+        """Show the programs using the most resources right now."""
         print()
         print("=" * 65)
         print(f"📊 PROGRAMS USING THE MOST RESOURCES  {RISK_SAFE}")
-        print("   See which programs are using the most CPU and memory.")
+        print("   See which programs are using the most CPU and memory right now.")
         print("=" * 65)
         print()
 
         # Top CPU consumers
         print("  🖥️  TOP PROGRAMS BY CPU USAGE")
         print("  ─" * 25)
+        print(f"  ⏳ Watching for {interval:g} seconds...", end="\r", flush=True)
 
-        success, output = self.run_ps_command(
-            f"Get-Process | Sort-Object CPU -Descending | Select-Object -First {top_n} "
-            "Name, @{{Name='CPU_Seconds';Expression={{[math]::Round($_.CPU, 1)}}}}, "
-            "@{{Name='Memory_MB';Expression={{[math]::Round($_.WorkingSet64 / 1MB, 0)}}}} | "
-            "ConvertTo-Json",
-            "Getting top processes"
-        )
+        before = self.take_process_snapshot()
+        time.sleep(interval)
+        after = self.take_process_snapshot() if before else None
+        print(" " * 40, end="\r")
 
-        if success and output.strip():
-            try:
-                processes = json.loads(output)
-                if isinstance(processes, dict):
-                    processes = [processes]
-
-                for i, proc in enumerate(processes, 1):
-                    name = proc.get('Name', 'Unknown')
-                    cpu = proc.get('CPU_Seconds', 0)
-                    mem = proc.get('Memory_MB', 0)
-
-                    # Make names user-friendly
-                    friendly_names = {
-                        'chrome': '🌐 Google Chrome',
-                        'firefox': '🌐 Firefox',
-                        'msedge': '🌐 Microsoft Edge',
-                        'explorer': '📁 Windows Explorer',
-                        'svchost': '⚙️ Windows Service',
-                        'Code': '💻 Visual Studio Code',
-                        'Teams': '💬 Microsoft Teams',
-                        'Spotify': '🎵 Spotify',
-                        'Discord': '💬 Discord',
-                        'steam': '🎮 Steam',
-                        'SearchHost': '🔍 Windows Search',
-                        'RuntimeBroker': '⚙️ Windows Runtime',
-                        'dwm': '🖥️ Desktop Window Manager',
-                        'csrss': '⚙️ Windows System',
-                        'lsass': '🔐 Windows Security',
-                        'winlogon': '🔐 Windows Login',
-                    }
-
-                    display_name = friendly_names.get(name, f"📦 {name}")
-
-                    # Memory bar
-                    mem_bar = ""
-                    if mem > 1000:
-                        mem_bar = " ⚠️ Using a lot of memory"
-                    elif mem > 500:
-                        mem_bar = ""
-
-                    print(f"  {i:2d}. {display_name:<35} CPU: {cpu:>8.1f}s  RAM: {mem:>5.0f} MB{mem_bar}")
+        if before and after:
+            deltas = process_deltas(before, after)
+            processes = top_processes(deltas, top_n)
 
-                print()
+            for i, proc in enumerate(processes, 1):
+                display_name = friendly_process_name(proc.name)
+                mem_mb = proc.memory / 1024 / 1024
 
-                # Helpful tips
-                total_mem = sum(p.get('Memory_MB', 0) for p in processes)
-                if total_mem > 4000:
-                    print("  💡 Your programs are using a lot of memory.")
-                    print("     Consider closing browser tabs and programs you're not using.")
-                else:
-                    print("  ✅ Memory usage by programs looks reasonable.")
+                # Memory notes
+                mem_note = ""
+                if mem_mb > 1000:
+                    mem_note = " ⚠️ Using a lot of memory"
+                elif proc.memory_delta > 50 * 1024 * 1024:
+                    mem_note = f" 📈 +{format_size(proc.memory_delta)}"
 
-            except json.JSONDecodeError:
-                print("  ⚠️  Could not read process information.")
+                print(f"  {i:2d}. {display_name:<35} CPU: {proc.cpu_percent:>5.1f}%  "
+                      f"RAM: {mem_mb:>5.0f} MB{mem_note}")
+
+            print()
+
+            # Helpful tips
+            busy = sum(d.cpu_percent for d in deltas)
+            total_mem = sum(d.memory for d in deltas) / 1024 / 1024
+            print(f"  📊 All programs together: {busy:.0f}% CPU over the last {interval:g} seconds")
+            if total_mem > 4000 and processes and processes[0].cpu_percent < 50:
+                print("  💡 Your programs are using a lot of memory.")
+                print("     Consider closing browser tabs and programs you're not using.")
+            elif processes and processes[0].cpu_percent >= 50:
+                print("  💡 One program is keeping your processor very busy.")
+                print("     If it isn't doing something you asked for, consider closing it.")
+            else:
+                print("  ✅ Memory usage by programs looks reasonable.")
         else:
             print("  ⚠️  Could not read process information.")
 
         print()
         self.log_action("Top processes displayed")
 
+    def show_io_processes(self, top_n=15, interval=2.0):
+        """Show the programs reading and writing the most data right now."""
+        print()
+        print("=" * 65)
+        print(f"💽 PROGRAMS USING THE DISK THE MOST    {RISK_SAFE}")
+        print("   See which programs are reading and writing the most data.")
+        print("=" * 65)
+        print()
+
+        print("  💽 TOP PROGRAMS BY DISK ACTIVITY")
+        print("  ─" * 25)
+        print(f"  ⏳ Watching for {interval:g} seconds...", end="\r", flush=True)
+
+        before = self.take_process_snapshot(io=True)
+        time.sleep(interval)
+        after = self.take_process_snapshot(io=True) if before else None
+        print(" " * 40, end="\r")
+
+        if not (before and after):
+            print("  ⚠️  Could not read process information.")
+            print()
+            return
+
+        # Helper processes are added to the program that started them
+        programs = fold_child_processes(process_deltas(before, after))
+        busiest = [p for p in top_processes(programs, top_n, key=io_throughput) if io_throughput(p) > 0]
+
+        for i, proc in enumerate(busiest, 1):
+            name = friendly_process_name(proc.name)
+            if proc.processes > 1:
+                name += f" ×{proc.processes}"
+            ops = proc.read_ops_rate + proc.write_ops_rate
+            print(f"  {i:2d}. {name:<35} Read: {format_size(proc.read_rate):>9}/s  "
+                  f"Write: {format_size(proc.write_rate):>9}/s  ({ops:.0f} ops/s)")
+
+        print()
+        total = sum(io_throughput(p) for p in programs)
+        if not busiest:
+            print("  ✅ No program is reading or writing much right now.")
+        else:
+            print(f"  📊 All programs together: {format_size(total)}/s over the last {interval:g} seconds")
+            if io_throughput(busiest[0]) >= 50 * 1024 * 1024:
+                print("  💡 One program is keeping your disk very busy.")
+                print("     Other programs may feel slow until it finishes.")
+
+        denied = getattr(self.backend, 'io_denied', 0)
+        if denied:
+            print(f"  💡 {denied} processes belong to other users; run as root to include them.")
+
+        print()
+        self.log_action(f"Top disk activity displayed: {format_size(total)}/s")
+
     # ─── 4. Service Manager ─────────────────────────────────────────────────
 
-    def show_services_status(self):
-        """Show important system services and their status."""
+    def get_service_statuses(self, names):
+        """Return {name: status or None} for any number of services.
+
+        Statuses come from one Get-Service call per SERVICE_QUERY_CHUNK names
+        instead of one PowerShell call per service. Whatever the call
+        printed is parsed even if it reported a failure; only a chunk whose
+        output isn't JSON comes back as all None.
+        """
+        statuses = {}
+        for i in range(0, len(names), SERVICE_QUERY_CHUNK):
+            chunk = names[i:i + SERVICE_QUERY_CHUNK]
+            _, output = self.run_ps_command(service_status_script(chunk), None)
+            try:
+                statuses.update(parse_service_statuses(output, chunk))
+            except ValueError:
+                statuses.update({name: None for name in chunk})
+        return statuses
+
+    def show_services_status(self, service_names=None):
+        """Show important system services (or a custom list) and their status."""
         print()
         print("=" * 65)
         print(f"⚙️  SYSTEM SERVICES STATUS             {RISK_SAFE}")
@@ -622,46 +2202,56 @@ class WindowsPerformanceManager:
             ("Audiosrv", "Audio Service", "Manages sound on your computer"),
         ]
 
-        print("  📋 Important Services:")
+        if service_names:
+            print(f"  📋 Your services ({len(service_names)}):")
+            services = [(name, name, None) for name in service_names]
+        else:
+            print("  📋 Important Services:")
+            services = important_services
         print()
 
+        statuses = self.get_service_statuses([svc_name for svc_name, _, _ in services])
+
         running = 0
         stopped = 0
+        missing = 0
 
-        for svc_name, friendly_name, description in important_services:
-            success, output = self.run_ps_command(
-                f"(Get-Service -Name '{svc_name}' -ErrorAction SilentlyContinue).Status",
-                None  # Silent
-            )
-
-            if success and output.strip():
-                status = output.strip()
-                if status.lower() == 'running':
-                    emoji = "✅"
-                    status_text = "Running"
-                    running += 1
-                elif status.lower() == 'stopped':
-                    emoji = "⏹️"
-                    status_text = "Stopped"
-                    stopped += 1
-                else:
-                    emoji = "⚠️"
-                    status_text = status
-            else:
+        for svc_name, friendly_name, description in services:
+            status = statuses.get(svc_name)
+            if status is None:
                 emoji = "❓"
                 status_text = "Not found"
+                missing += 1
+            elif status.lower() == 'running':
+                emoji = "✅"
+                status_text = "Running"
+                running += 1
+            elif status.lower() == 'stopped':
+                emoji = "⏹️"
+                status_text = "Stopped"
+                stopped += 1
+            else:
+                emoji = "⚠️"
+                status_text = status
 
             print(f"  {emoji} {friendly_name:<25} {status_text}")
-            print(f"     ℹ️  {description}")
-            print()
+            if description:
+                print(f"     ℹ️  {description}")
+                print()
 
+        if service_names:
+            print()
         print("  ─" * 25)
-        print(f"  📊 Summary: {running} running, {stopped} stopped")
+        summary = f"  📊 Summary: {running} running, {stopped} stopped"
+        if missing and service_names:
+            summary += f", {missing} not found"
+        print(summary)
         print()
 
         if stopped > 0:
             print("  ℹ️  Some stopped services are normal if you don't use those features.")
-            print("     For example, Print Spooler can be off if you don't have a printer.")
+            if not service_names:
+                print("     For example, Print Spooler can be off if you don't have a printer.")
         else:
             print("  ✅ All important services are running properly!")
 
@@ -909,18 +2499,21 @@ class WindowsPerformanceManager:
         print("=" * 65)
         print()
 
-        # Check last update time
-        success, output = self.run_ps_command(
-            "(Get-HotFix | Sort-Object InstalledOn -Descending | Select-Object -First 1).InstalledOn.ToString('yyyy-MM-dd')",
-            "Checking last update"
-        )
+        # One Get-HotFix call (cached) answers both questions below
+        output = self.cached_ps_json("hotfixes", HOTFIX_SCRIPT, "Listing installed updates")
+        try:
+            hotfixes = parse_hotfixes(output) if output else []
+        except ValueError:
+            hotfixes = []
 
-        if success and output.strip():
+        # Check last update time
+        last_installed = next((h['InstalledOn'] for h in hotfixes if h.get('InstalledOn')), None)
+        if last_installed:
             try:
-                last_update = datetime.strptime(output.strip(), '%Y-%m-%d')
+                last_update = datetime.strptime(last_installed, '%Y-%m-%d')
                 days_since = (datetime.now() - last_update).days
 
-                print(f"  📅 Last update installed: {output.strip()}")
+                print(f"  📅 Last update installed: {last_installed}")
 
                 if days_since > 30:
                     print(f"     🚨 That was {days_since} days ago — your computer might be missing important security updates!")
@@ -931,23 +2524,20 @@ class WindowsPerformanceManager:
                 else:
                     print(f"     ✅ Updated {days_since} days ago — that's recent!")
             except ValueError:
-                print(f"  📅 Last update: {output.strip()}")
+                print(f"  📅 Last update: {last_installed}")
         else:
             print("  ⚠️  Could not determine last update date.")
 
         print()
 
         # List recent updates
-        success2, output2 = self.run_ps_command(
-            "Get-HotFix | Sort-Object InstalledOn -Descending | Select-Object -First 5 "
-            "HotFixID, Description, InstalledOn | Format-Table -AutoSize",
-            "Listing recent updates"
-        )
-
-        if success2 and output2.strip():
+        if hotfixes:
             print("  📋 Recent updates:")
-            for line in output2.strip().split('\n'):
-                print(f"     {line}")
+            print(f"     {'HotFixID':<12} {'Description':<20} InstalledOn")
+            print(f"     {'--------':<12} {'-----------':<20} -----------")
+            for hotfix in hotfixes[:5]:
+                print(f"     {hotfix.get('HotFixID') or '':<12} {hotfix.get('Description') or '':<20} "
+                      f"{hotfix.get('InstalledOn') or ''}")
         else:
             print("  ℹ️  Could not list recent updates.")
 
@@ -960,6 +2550,169 @@ class WindowsPerformanceManager:
 
         self.log_action("Windows Update status checked")
 
+    # ─── 9. Continuous Monitoring ───────────────────────────────────────────
+
+    def monitor(self, interval=1.0, duration=None, refresh=2.0, sampler=None, record=True):
+        """Sample CPU, memory, disk and network until Ctrl+C (or duration seconds).
+
+        Samples go into fixed-size ring buffers covering the longest window
+        in MONITOR_WINDOWS, so memory use stays constant however long it
+        runs. The screen shows min/avg/p95/max per window and what the
+        sampling itself costs in CPU time. With record=True every sample is
+        also kept in the metric history store (see --history).
+        """
+        sampler = sampler or self.backend.sampler()
+        if sampler is None:
+            print("  ❌ Live monitoring isn't available on this system.")
+            return False
+
+        store = None
+        if record:
+            try:
+                store = MetricStore(self.log_dir / "metrics")
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  History won't be saved: {e}")
+
+        interval = max(0.1, float(interval))
+        capacity = math.ceil(max(MONITOR_WINDOWS) / interval)
+        metrics = [
+            ("cpu", "🖥️  CPU", lambda v: f"{v:5.1f}%"),
+            ("memory", "💾 Memory", lambda v: f"{v:5.1f}%"),
+            ("disk", "💿 Disk", lambda v: f"{format_size(v)}/s"),
+            ("network", "🌐 Network", lambda v: f"{format_size(v)}/s"),
+        ]
+        series = {key: RingBuffer(capacity) for key, _, _ in metrics}
+
+        if os.name == 'nt':
+            os.system('')  # Turns on ANSI escape codes in the Windows console
+
+        started = time.monotonic()
+        sample_cpu = 0.0
+        process_cpu_start = time.process_time()
+        samples = 0
+        next_sample = started
+        next_draw = started
+
+        try:
+            while duration is None or time.monotonic() - started < duration:
+                next_sample += interval
+                time.sleep(max(0.0, next_sample - time.monotonic()))
+
+                before = time.process_time()
+                values = sampler.sample()
+                for key, value in values.items():
+                    if key in series:
+                        series[key].append(value)
+                if store is not None:
+                    store.add(values)
+                sample_cpu += time.process_time() - before
+                samples += 1
+
+                now = time.monotonic()
+                if now >= next_draw:
+                    next_draw = now + refresh
+                    if store is not None:
+                        store.flush()
+                    elapsed = now - started
+                    self._draw_monitor(metrics, series, values, interval, samples, elapsed,
+                                       sample_cpu, time.process_time() - process_cpu_start)
+        except KeyboardInterrupt:
+            print()
+        finally:
+            if store is not None:
+                store.flush()
+                store.close()
+
+        elapsed = time.monotonic() - started
+        overhead = 100 * sample_cpu / elapsed if elapsed else 0
+        print(f"  ✅ Monitoring stopped after {samples} samples "
+              f"(sampling used {overhead:.2f}% of one CPU).")
+        self.log_action("Performance monitor", details=f"{samples} samples, {overhead:.2f}% overhead")
+        return True
+
+    def _draw_monitor(self, metrics, series, current, interval, samples, elapsed, sample_cpu, total_cpu):
+        """Redraw the monitor screen."""
+        lines = [
+            "=" * 72,
+            f"📈 LIVE PERFORMANCE MONITOR             {RISK_SAFE}",
+            f"   Sampling every {interval:g}s  —  {datetime.now().strftime('%H:%M:%S')}  —  Press Ctrl+C to stop.",
+            "=" * 72,
+            "",
+            f"  {'':<13}{'Now':>12}   {'Window':<8}{'Min':>11}{'Avg':>11}{'P95':>11}{'Max':>11}",
+        ]
+        for key, label, fmt in metrics:
+            first = True
+            for window in MONITOR_WINDOWS:
+                stats = series[key].stats(int(window / interval))
+                if stats is None:
+                    continue
+                span = min(window, samples * interval)
+                name = f"{window // 60} min" + ("*" if span < window else "")
+                now = fmt(current.get(key, 0.0)) if first else ""
+                lines.append(f"  {label if first else '':<13}{now:>12}   {name:<8}"
+                             + "".join(f"{fmt(v):>11}" for v in stats))
+                first = False
+            lines.append("")
+        sampling = 100 * sample_cpu / elapsed if elapsed else 0
+        total = 100 * total_cpu / elapsed if elapsed else 0
+        flag = "✅" if sampling < 1 else "⚠️ "
+        lines.append(f"  {flag} Monitor cost: sampling {sampling:.2f}%, total {total:.2f}% of one CPU"
+                     f"  ({samples} samples)")
+        lines.append("  * window not full yet")
+        sys.stdout.write("\033[H\033[J" + "\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+    def show_metric_history(self, minutes=60, rows=24):
+        """Show recorded monitor history for the last N minutes."""
+        print()
+        print("=" * 65)
+        print(f"📜 PERFORMANCE HISTORY                {RISK_SAFE}")
+        print(f"   What --monitor recorded over the last {minutes:g} minutes.")
+        print("=" * 65)
+        print()
+
+        try:
+            store = MetricStore(self.log_dir / "metrics", readonly=True)
+        except (OSError, ValueError):
+            print("  ℹ️  No history yet. Run with --monitor to start recording.")
+            print()
+            return
+
+        end = time.time()
+        start = end - minutes * 60
+        labels = {"cpu": "🖥️  CPU", "memory": "💾 Memory", "disk": "💿 Disk", "network": "🌐 Network"}
+        try:
+            level, _ = store.query("cpu", start, end)
+            print(f"  📏 Resolution: {level}")
+            print()
+            for metric in METRIC_NAMES:
+                fmt = (lambda v: f"{v:.1f}%") if metric in ("cpu", "memory") else (lambda v: f"{format_size(v)}/s")
+                summary = store.summary(metric, start, end)
+                if summary is None:
+                    print(f"  {labels[metric]:<12} no data")
+                    continue
+                low, avg, high, count = summary
+                print(f"  {labels[metric]:<12} min {fmt(low):>11}   avg {fmt(avg):>11}   "
+                      f"max {fmt(high):>11}   ({count:,} samples)")
+
+            # CPU over time, grouped into at most `rows` lines
+            _, data = store.query("cpu", start, end)
+            if data:
+                print()
+                print("  🖥️  CPU over time (average):")
+                per_row = max(1, math.ceil(len(data) / rows))
+                for i in range(0, len(data), per_row):
+                    chunk = data[i:i + per_row]
+                    count = sum(r[4] for r in chunk)
+                    avg = sum(r[3] * r[4] for r in chunk) / count
+                    stamp = datetime.fromtimestamp(chunk[0][0]).strftime('%m-%d %H:%M:%S')
+                    print(f"     {stamp}  {format_bar(avg, 100, width=25)}")
+        finally:
+            store.close()
+
+        print()
+        self.log_action(f"Performance history shown ({minutes:g} minutes)")
+
     # ─── Full Performance Check ─────────────────────────────────────────────
 
     def full_performance_check(self):
@@ -971,19 +2724,49 @@ class WindowsPerformanceManager:
         print("╚══════════════════════════════════════════════════════════════╝")
         print()
 
-        self.show_system_dashboard()
-        input("  ⏸️  Press Enter to continue...")
+        # Every check starts right away in the background; the pages are
+        # still shown one at a time, in the usual order
+        stages = [
+            ("dashboard", self.show_system_dashboard),
+            ("processes", self.show_top_processes),
+            ("startup", self.manage_startup_programs),
+            ("disk_health", self.check_disk_health),
+            ("updates", self.check_windows_update),
+        ]
 
-        self.show_top_processes()
-        input("  ⏸️  Press Enter to continue...")
+        real_stdout = sys.stdout
+        output = ThreadOutput(real_stdout)
+        sys.stdout = output
+        pages = {}
+        ready = threading.Condition()
 
-        self.manage_startup_programs()
-        input("  ⏸️  Press Enter to continue...")
+        def page_done(name, result):
+            with ready:
+                pages[name] = result
+                ready.notify_all()
 
-        self.check_disk_health()
-        input("  ⏸️  Press Enter to continue...")
+        scheduler = ProbeScheduler(max_workers=len(stages))
+        for name, stage in stages:
+            scheduler.add(name, lambda deps, stage=stage: run_captured(output, stage), timeout=600)
+        runner = threading.Thread(target=scheduler.run, args=(page_done,), daemon=True)
+        runner.start()
 
-        self.check_windows_update()
+        try:
+            for i, (name, _) in enumerate(stages):
+                with ready:
+                    if name not in pages:
+                        print("  ⏳ Still working on this step...", end="\r", flush=True)
+                    while name not in pages:
+                        ready.wait()
+                page = probe_value(pages[name])
+                if page is None:
+                    print("\n  ⚠️  This check took too long and was skipped.\n")
+                else:
+                    print(page, end="")
+                if i < len(stages) - 1:
+                    input("  ⏸️  Press Enter to continue...")
+        finally:
+            sys.stdout = real_stdout
 
         print()
         print("═" * 65)
@@ -1002,9 +2785,11 @@ class WindowsPerformanceManager:
 
 # ─── Interactive Menu ──────────────────────────────────────────────────────────
 
-def show_interactive_menu():
+def show_interactive_menu(refresh=False):
     """Display the interactive menu for non-technical users."""
     manager = WindowsPerformanceManager()
+    if refresh:
+        manager.cache.invalidate()
 
     while True:
         try:
@@ -1098,8 +2883,14 @@ def main():
     check_group = parser.add_argument_group("📊 Check Performance")
     check_group.add_argument("--dashboard", action="store_true", help="⚡ Show system performance dashboard")
     check_group.add_argument("--processes", action="store_true", help="📊 Show top resource-consuming programs")
+    check_group.add_argument("--io", action="store_true", help="💽 Show programs reading and writing the most data")
     check_group.add_argument("--startup", action="store_true", help="🚀 List startup programs")
     check_group.add_argument("--services", action="store_true", help="⚙️ Check system services status")
+    check_group.add_argument("--monitor", action="store_true", help="📈 Watch CPU, memory, disk and network live (Ctrl+C to stop)")
+    check_group.add_argument("--interval", type=float, default=1.0, metavar="SECONDS", help="📈 Seconds between samples for --monitor, --processes and --io (default: 1)")
+    check_group.add_argument("--duration", type=float, metavar="SECONDS", help="📈 Stop --monitor after this many seconds")
+    check_group.add_argument("--history", type=float, nargs='?', const=60, metavar="MINUTES", help="📜 Show what --monitor recorded over the last N minutes (default: 60)")
+    check_group.add_argument("--services-file", type=str, metavar="FILE", help="📄 With --services: check the services listed in FILE (one name per line)")
 
     hw_group = parser.add_argument_group("💿 Hardware & Health")
     hw_group.add_argument("--disk-health", action="store_true", help="💿 Check storage drive health")
@@ -1109,24 +2900,28 @@ def main():
     fix_group = parser.add_argument_group("🛠️ Fix & Optimize")
     fix_group.add_argument("--sfc", action="store_true", help="🛡️ Run system file checker (admin)")
     fix_group.add_argument("--full", action="store_true", help="⚡ Run full performance check")
+    parser.add_argument("--refresh", action="store_true", help="🔄 Ignore cached hardware and update info and query it again")
 
     parser.add_argument("--version", action="version", version="Windows Performance Manager v1.0")
 
     args = parser.parse_args()
 
     has_args = any([
-        args.dashboard, args.processes, args.startup, args.services,
+        args.dashboard, args.processes, args.io, args.startup, args.services, args.monitor,
+        args.history is not None,
         args.disk_health, args.power, args.updates,
         args.sfc, args.full
     ])
 
     if not has_args:
-        show_interactive_menu()
+        show_interactive_menu(refresh=args.refresh)
         return
 
     # CLI mode
     show_startup_banner()
     manager = WindowsPerformanceManager()
+    if args.refresh:
+        manager.cache.invalidate()
 
     if args.full:
         manager.full_performance_check()
@@ -1136,13 +2931,29 @@ def main():
         manager.show_system_dashboard()
 
     if args.processes:
-        manager.show_top_processes()
+        manager.show_top_processes(interval=args.interval)
+
+    if args.io:
+        manager.show_io_processes(interval=args.interval)
 
     if args.startup:
         manager.manage_startup_programs()
 
     if args.services:
-        manager.show_services_status()
+        service_names = None
+        if args.services_file:
+            try:
+                service_names = load_service_list(args.services_file)
+            except OSError as e:
+                print(f"  ❌ Could not read {args.services_file}: {e}")
+                return
+        manager.show_services_status(service_names)
+
+    if args.monitor:
+        manager.monitor(interval=args.interval, duration=args.duration)
+
+    if args.history is not None:
+        manager.show_metric_history(args.history)
 
     if args.disk_health:
         manager.check_disk_health()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+📏 Windows Scripts - Space Manager Benchmarks
+=============================================
+Builds reproducible synthetic folder trees and times the Space Manager
+scanners against them, so scanner changes can be compared run to run.
+
+Tree shapes:
+    deep      long chains of nested folders with a few files each
+    wide      many folders side by side, each with many files
+    tiny      lots of very small files
+    sparse    a few huge sparse files (almost no real disk use)
+    dupes     many groups of identical files
+
+Each scanner runs in a fresh process, so the peak memory reported belongs to
+that run alone. The "os.* calls" column counts calls to the wrapped os/open
+functions only. Methods of the DirEntry objects that os.scandir returns
+(stat(), is_dir(), is_file()) and reads on open files can't be wrapped, so
+scanners built on scandir look cheaper there than they are: compare them by
+time, not by that column. The sparse shape is skipped where a file can't be
+made sparse (for example FAT drives).
+
+Usage:
+    python space_benchmark.py                          # All shapes, all scanners
+    python space_benchmark.py --shapes tiny dupes      # Only some shapes
+    python space_benchmark.py --scale 0.1 --repeat 1   # Quick smoke run
+    python space_benchmark.py --output results.json    # Save results as JSON
+    python space_benchmark.py --compare old.json       # Show change vs a previous run
+"""
+
+import argparse
+import builtins
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from queue import Empty
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+
+SHAPES = ("deep", "wide", "tiny", "sparse", "dupes")
+BENCHMARKS = ("scan_folder_sizes", "find_large_files", "find_duplicates", "_get_dir_size")
+
+# Functions wrapped to count filesystem calls: (module, attribute)
+COUNTED_CALLS = (
+    (os, "stat"),
+    (os, "lstat"),
+    (os, "scandir"),
+    (os, "listdir"),
+    (os, "open"),
+    (builtins, "open"),
+    (io, "open"),
+)
+
+SEED = 1234
+RUN_TIMEOUT = 3600  # Seconds one scanner run may take before it is abandoned
+FSCTL_SET_SPARSE = 0x000900C4
+
+
+class ShapeUnavailable(Exception):
+    """A tree shape that can't be built on this system."""
+
+
+# ─── Tree Generation ─────────────────────────────────────────────────────────
+
+def _write(path, size, rng):
+    with open(path, "wb") as f:
+        f.write(rng.getrandbits(8 * size).to_bytes(size, "little") if size else b"")
+
+
+def build_deep(root, scale, rng):
+    for chain in range(max(1, int(20 * scale))):
+        current = root / f"chain{chain:03d}"
+        for depth in range(100):
+            current = current / f"d{depth:03d}"
+            current.mkdir(parents=True, exist_ok=True)
+            for n in range(3):
+                _write(current / f"f{n}.dat", rng.randint(512, 8192), rng)
+
+
+def build_wide(root, scale, rng):
+    for folder in range(max(1, int(500 * scale))):
+        current = root / f"dir{folder:04d}"
+        current.mkdir(parents=True, exist_ok=True)
+        for n in range(40):
+            _write(current / f"f{n:02d}.dat", rng.randint(1024, 65536), rng)
+
+
+def build_tiny(root, scale, rng):
+    for folder in range(max(1, int(50 * scale))):
+        current = root / f"bucket{folder:03d}"
+        current.mkdir(parents=True, exist_ok=True)
+        for n in range(1000):
+            _write(current / f"t{n:04d}.txt", rng.randint(0, 64), rng)
+
+
+def _mark_sparse(f):
+    """Mark an open file as sparse. NTFS allocates the full size on truncate otherwise."""
+    if os.name != "nt":
+        return True  # Unix filesystems leave holes on their own when they can
+    try:
+        import ctypes
+        import msvcrt
+        from ctypes import wintypes
+        returned = wintypes.DWORD()
+        return bool(ctypes.windll.kernel32.DeviceIoControl(
+            wintypes.HANDLE(msvcrt.get_osfhandle(f.fileno())), FSCTL_SET_SPARSE,
+            None, 0, None, 0, ctypes.byref(returned), None))
+    except (ImportError, AttributeError, OSError):
+        return False
+
+
+def _sparse_file(path, size):
+    """Create a file of size bytes that takes (almost) no disk space, or raise ShapeUnavailable."""
+    with open(path, "wb") as f:
+        sparse = _mark_sparse(f)
+        if sparse:
+            f.truncate(size)
+            f.flush()
+            blocks = getattr(os.fstat(f.fileno()), "st_blocks", None)
+            sparse = blocks is None or blocks * 512 < 1024 * 1024
+    if not sparse:
+        os.unlink(path)
+        raise ShapeUnavailable("this filesystem can't create sparse files")
+
+
+def build_sparse(root, scale, rng):
+    folder = root / "images"
+    folder.mkdir(parents=True, exist_ok=True)
+    for n in range(max(1, int(8 * scale))):
+        _sparse_file(folder / f"disk{n}.img", rng.randint(2, 8) * 1024 ** 3)
+    _write(folder / "readme.txt", 200, rng)
+
+
+def build_dupes(root, scale, rng):
+    for group in range(max(1, int(200 * scale))):
+        size = rng.randint(64 * 1024, 2 * 1024 * 1024)
+        data = rng.getrandbits(8 * size).to_bytes(size, "little")
+        for copy in range(rng.randint(2, 5)):
+            folder = root / f"copy{copy}" / f"set{group % 20:02d}"
+            folder.mkdir(parents=True, exist_ok=True)
+            (folder / f"file{group:04d}.bin").write_bytes(data)
+        # Same size, different content: must not be reported as a duplicate
+        decoy = root / "decoys"
+        decoy.mkdir(exist_ok=True)
+        _write(decoy / f"file{group:04d}.bin", size, rng)
+
+
+BUILDERS = {
+    "deep": build_deep,
+    "wide": build_wide,
+    "tiny": build_tiny,
+    "sparse": build_sparse,
+    "dupes": build_dupes,
+}
+
+
+def build_tree(root, shape, scale):
+    """Create the tree for one shape and return its file count and apparent size."""
+    root.mkdir(parents=True, exist_ok=True)
+    BUILDERS[shape](root, scale, random.Random(SEED))
+    files = 0
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            files += 1
+            total += os.lstat(os.path.join(dirpath, name)).st_size
+    return files, total
+
+
+# ─── Measurement ─────────────────────────────────────────────────────────────
+
+class CallCounter:
+    """Count calls to the os functions the scanners use, while active.
+
+    Only the module-level functions in COUNTED_CALLS are seen: DirEntry
+    methods and file object reads are C methods that can't be wrapped, so
+    this is not a system call count.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self._saved = []
+
+    def __enter__(self):
+        for module, name in COUNTED_CALLS:
+            original = getattr(module, name)
+            self._saved.append((module, name, original))
+            setattr(module, name, self._wrap(f"{module.__name__}.{name}", original))
+        return self
+
+    def __exit__(self, *exc):
+        for module, name, original in reversed(self._saved):
+            setattr(module, name, original)
+        self._saved = []
+
+    def _wrap(self, label, original):
+        counts = self.counts
+
+        def counted(*args, **kwargs):
+            counts[label] = counts.get(label, 0) + 1
+            return original(*args, **kwargs)
+        return counted
+
+    def total(self):
+        # builtins.open and io.open are the same function, so only count one of them
+        return sum(v for k, v in self.counts.items() if k != "io.open")
+
+
+def peak_rss_bytes():
+    """Peak resident memory of this process, or None if it can't be read."""
+    if os.name == "nt":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            psapi = ctypes.WinDLL("psapi")
+            psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD]
+            if psapi.GetProcessMemoryInfo(ctypes.c_void_p(-1), ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize
+        except (OSError, AttributeError):
+            pass
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_one(benchmark, root, log_dir, queue):
+    """Child process: run one scanner once and report its numbers."""
+    os.environ["LOCALAPPDATA"] = log_dir
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import space_manager
+
+    with redirect_stdout(io.StringIO()):
+        manager = space_manager.WindowsSpaceManager()
+        calls = {
+            "scan_folder_sizes": lambda: manager.scan_folder_sizes(root),
+            "find_large_files": lambda: manager.find_large_files(root, min_size_mb=1),
+            "find_duplicates": lambda: manager.find_duplicates(root, min_size_mb=0),
+            "_get_dir_size": lambda: manager._get_dir_size(root),
+        }
+        with CallCounter() as counter:
+            start = time.perf_counter()
+            calls[benchmark]()
+            elapsed = time.perf_counter() - start
+
+    queue.put({
+        "seconds": elapsed,
+        "os_calls": counter.total(),
+        "os_calls_by_type": dict(sorted(counter.counts.items())),
+        "peak_rss_bytes": peak_rss_bytes(),
+    })
+
+
+def _wait_for_result(proc, queue, timeout=RUN_TIMEOUT):
+    """The child's result, or RuntimeError as soon as it dies without one."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return queue.get(timeout=1)
+        except Empty:
+            pass
+        if not proc.is_alive():
+            try:
+                return queue.get(timeout=1)  # It may have exited right after sending
+            except Empty:
+                raise RuntimeError(f"benchmark process exited with code {proc.exitcode}")
+    raise RuntimeError(f"benchmark run took longer than {timeout} seconds")
+
+
+def run_benchmark(benchmark, root, log_dir, repeat):
+    """Run a scanner `repeat` times in fresh processes; keep the median run."""
+    ctx = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_one, args=(benchmark, str(root), log_dir, queue))
+        proc.start()
+        try:
+            runs.append(_wait_for_result(proc, queue))
+        finally:
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+    runs.sort(key=lambda r: r["seconds"])
+    result = dict(runs[len(runs) // 2])
+    result["best_seconds"] = runs[0]["seconds"]
+    result["all_seconds"] = [r["seconds"] for r in runs]
+    result["peak_rss_bytes"] = max((r["peak_rss_bytes"] or 0) for r in runs) or None
+    return result
+
+
+# ─── Reporting ───────────────────────────────────────────────────────────────
+
+def format_size(size_bytes):
+    if size_bytes is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(size_bytes) < 1024:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.1f} PB"
+
+
+def print_table(results, previous=None):
+    baseline = {}
+    for row in (previous or {}).get("results", []):
+        baseline[(row["shape"], row["benchmark"])] = row
+
+    print()
+    print(f"  {'Shape':<8} {'Scanner':<18} {'Time':>9} {'Files/s':>11} {'os.* calls':>10} {'Peak RSS':>10}"
+          + ("   vs. previous" if previous else ""))
+    print("  " + "─" * (70 + (15 if previous else 0)))
+    for row in results:
+        line = (f"  {row['shape']:<8} {row['benchmark']:<18} {row['seconds']:>8.3f}s "
+                f"{row['files_per_sec']:>11,.0f} {row['os_calls']:>10,} {format_size(row['peak_rss_bytes']):>10}")
+        old = baseline.get((row["shape"], row["benchmark"]))
+        if old and old["seconds"] > 0:
+            change = (row["seconds"] - old["seconds"]) / old["seconds"] * 100
+            flag = "🔺" if change > 10 else ("🔻" if change < -10 else "  ")
+            line += f"   {flag} {change:+.0f}%"
+        print(line)
+    print()
+
+
+# ─── Main ────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="📏 Benchmark the Space Manager scanners on synthetic folder trees",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES), help="Tree shapes to test")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS), help="Scanners to time")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every tree size by this (default: 1.0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scanner; the median is reported (default: 3)")
+    parser.add_argument("--workdir", type=str, help="Folder to build the trees in, inside a new subfolder (default: the system temp folder)")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated trees afterwards")
+    parser.add_argument("--output", type=str, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=str, metavar="JSON", help="Show the change against a previous results file")
+    args = parser.parse_args()
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+
+    # Always a fresh folder of our own, so cleaning up never touches the user's files
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+    workdir = Path(tempfile.mkdtemp(prefix="space_bench_", dir=args.workdir))
+    log_dir = str(workdir / "logs")
+    print(f"📏 Space Manager benchmarks — trees in {workdir}")
+
+    results = []
+    try:
+        for shape in args.shapes:
+            root = workdir / shape
+            if root.exists():
+                shutil.rmtree(root)
+            print(f"   🏗️  Building '{shape}' tree...", end=" ", flush=True)
+            try:
+                files, total = build_tree(root, shape, args.scale)
+            except ShapeUnavailable as e:
+                print(f"⏭️  skipped: {e}")
+                shutil.rmtree(root, ignore_errors=True)
+                continue
+            print(f"{files:,} files, {format_size(total)}")
+
+            for benchmark in args.benchmarks:
+                print(f"   ⏱️  {shape} / {benchmark}...", end="\r", flush=True)
+                try:
+                    result = run_benchmark(benchmark, root, log_dir, max(1, args.repeat))
+                except RuntimeError as e:
+                    print(f"   ❌ {shape} / {benchmark}: {e}")
+                    continue
+                result.update({
+                    "shape": shape,
+                    "benchmark": benchmark,
+                    "files": files,
+                    "apparent_bytes": total,
+                    "files_per_sec": files / result["seconds"] if result["seconds"] > 0 else 0.0,
+                })
+                results.append(result)
+            print(" " * 60, end="\r")
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_table(results, previous)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scale": args.scale,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
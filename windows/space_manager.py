@@ -8,15 +8,42 @@ Part of Python Scripts Collection
 """
 
 import os
+import re
 import sys
+import errno
+import heapq
+import select
+import struct
+import threading
+import time
 import subprocess
 import argparse
+import asyncio
+import io
 import platform
 import hashlib
+import math
+import multiprocessing
+import zlib
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
+from stat import S_ISREG
 from datetime import datetime, timedelta
 import shutil
 import json
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import lzma
+except ImportError:  # Some minimal Python builds ship without lzma
+    lzma = None
 
 
 # ─── Risk Level Constants ──────────────────────────────────────────────────────
@@ -110,6 +137,1738 @@ def get_usage_emoji(percent):
         return "🔴"
 
 
+# ─── Drive Enumeration ─────────────────────────────────────────────────────────
+
+DRIVE_PROBE_TIMEOUT = 5.0
+
+# Linux filesystems that don't hold user data
+PSEUDO_FILESYSTEMS = {
+    'proc', 'sysfs', 'devtmpfs', 'devpts', 'tmpfs', 'cgroup', 'cgroup2', 'securityfs',
+    'pstore', 'debugfs', 'tracefs', 'configfs', 'fusectl', 'mqueue', 'hugetlbfs', 'bpf',
+    'autofs', 'binfmt_misc', 'nsfs', 'rpc_pipefs', 'efivarfs', 'ramfs', 'selinuxfs',
+    'squashfs', 'fuse.gvfsd-fuse', 'fuse.portal',
+}
+
+
+def _unescape_mount_path(path):
+    """Decode the octal escapes (\\040 for space) used in /proc mount tables."""
+    return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), path)
+
+
+def list_mount_points(mountinfo='/proc/self/mountinfo'):
+    """Return [(mount point, filesystem type, source)] for real filesystems on Linux.
+
+    Each filesystem is listed once, even when it is mounted several times or
+    bind-mounted elsewhere (common on container hosts): mounts are grouped
+    by device (major:minor, field 3), and of each group the first mount of
+    the filesystem's own root (field 4 is "/") is kept, or else the first
+    bind mount. When something is mounted over an existing mount point,
+    only the later mount, the one actually visible there, counts.
+    """
+    visible = {}  # mount point -> (device, root, fstype, source) of its last mount
+    try:
+        with open(mountinfo, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                left, sep, right = line.partition(' - ')
+                fields = left.split()
+                if not sep or len(fields) < 5:
+                    continue
+                fstype, _, rest = right.partition(' ')
+                source = rest.split(' ', 1)[0]
+                mount_point = _unescape_mount_path(fields[4])
+                visible.pop(mount_point, None)
+                visible[mount_point] = (fields[2], _unescape_mount_path(fields[3]), fstype, source)
+    except OSError:
+        pass
+
+    by_device = {}
+    order = []
+    for mount_point, (device, root, fstype, source) in visible.items():
+        if fstype in PSEUDO_FILESYSTEMS:
+            continue
+        current = by_device.get(device)
+        if current is None:
+            order.append(device)
+        elif current[0] == '/' or root != '/':
+            continue
+        by_device[device] = (root, (mount_point, fstype, source))
+    return [by_device[device][1] for device in order]
+
+
+def _drive_roots():
+    """(name, root) for every drive letter Windows knows about, or every Linux mount."""
+    if os.name != 'nt':
+        return [(mount_point, mount_point) for mount_point, _, _ in list_mount_points()]
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    try:
+        import ctypes
+        mask = ctypes.windll.kernel32.GetLogicalDrives()
+        letters = [letter for i, letter in enumerate(letters) if mask & (1 << i)]
+    except Exception:
+        pass
+    return [(letter, f"{letter}:\\") for letter in letters]
+
+
+def _probe_drive(name, root):
+    """Read one drive's usage. Returns a drive dict, or None if there's no disk."""
+    try:
+        usage = shutil.disk_usage(root)
+    except PermissionError:
+        return {"letter": name, "root": root, "status": "denied"}
+    except OSError:
+        return None
+    return {
+        "letter": name,
+        "root": root,
+        "status": "ok",
+        "total": usage.total,
+        "used": usage.used,
+        "free": usage.free,
+        "percent": (usage.used / usage.total * 100) if usage.total > 0 else 0,
+    }
+
+
+def enumerate_drives(timeout=DRIVE_PROBE_TIMEOUT):
+    """Probe all drives at once, giving each one at most timeout seconds.
+
+    A disconnected network drive can block for half a minute, so each probe
+    runs in its own daemon thread; drives that don't answer in time are
+    returned with status "stale" and their thread is simply abandoned.
+    Status is "ok", "denied" or "stale"; only "ok" entries have sizes.
+    """
+    roots = _drive_roots()
+    results = [None] * len(roots)
+    done = [threading.Event() for _ in roots]
+
+    def probe(i, name, root):
+        try:
+            results[i] = _probe_drive(name, root)
+        finally:
+            done[i].set()
+
+    for i, (name, root) in enumerate(roots):
+        threading.Thread(target=probe, args=(i, name, root), daemon=True).start()
+
+    deadline = time.monotonic() + timeout
+    drives = []
+    for i, (name, root) in enumerate(roots):
+        if done[i].wait(max(0.0, deadline - time.monotonic())):
+            if results[i] is not None:
+                drives.append(results[i])
+        else:
+            drives.append({"letter": name, "root": root, "status": "stale"})
+    return drives
+
+
+# ─── Recycle Bin ───────────────────────────────────────────────────────────────
+
+_DRIVE_REMOVABLE = 2
+_DRIVE_FIXED = 3
+_TOKEN_QUERY = 0x0008
+_TOKEN_USER = 1
+_FILETIME_UNIX_EPOCH = 11644473600  # Seconds from 1601-01-01 to 1970-01-01
+
+
+def local_drive_roots():
+    """Roots of local fixed and removable drives, without touching network drives."""
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        mask = kernel32.GetLogicalDrives()
+        roots = []
+        for i, letter in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZ"):
+            if mask & (1 << i):
+                root = f"{letter}:\\"
+                if kernel32.GetDriveTypeW(root) in (_DRIVE_FIXED, _DRIVE_REMOVABLE):
+                    roots.append(root)
+        return roots
+    except Exception:
+        return ["C:\\"]
+
+
+def current_user_sid():
+    """String SID of the current Windows user (S-1-5-21-...), or None."""
+    try:
+        import ctypes
+        from ctypes import wintypes
+        advapi32 = ctypes.windll.advapi32
+        kernel32 = ctypes.windll.kernel32
+        advapi32.OpenProcessToken.argtypes = [wintypes.HANDLE, wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE)]
+        advapi32.ConvertSidToStringSidW.argtypes = [ctypes.c_void_p, ctypes.POINTER(wintypes.LPWSTR)]
+        kernel32.LocalFree.argtypes = [ctypes.c_void_p]
+
+        token = wintypes.HANDLE()
+        if not advapi32.OpenProcessToken(ctypes.c_void_p(-1), _TOKEN_QUERY, ctypes.byref(token)):
+            return None
+        try:
+            size = wintypes.DWORD()
+            advapi32.GetTokenInformation(token, _TOKEN_USER, None, 0, ctypes.byref(size))
+            buf = ctypes.create_string_buffer(size.value)
+            if not advapi32.GetTokenInformation(token, _TOKEN_USER, buf, size, ctypes.byref(size)):
+                return None
+            # TOKEN_USER starts with a pointer to the user's SID
+            sid = ctypes.cast(buf, ctypes.POINTER(ctypes.c_void_p))[0]
+            string_sid = wintypes.LPWSTR()
+            if not advapi32.ConvertSidToStringSidW(sid, ctypes.byref(string_sid)):
+                return None
+            try:
+                return string_sid.value
+            finally:
+                kernel32.LocalFree(string_sid)
+        finally:
+            kernel32.CloseHandle(token)
+    except Exception:
+        return None
+
+
+def measure_recycle_bin(drive_roots, sid=None):
+    """Add up deleted items by reading $Recycle.Bin folders directly.
+
+    Each drive keeps <drive>\\$Recycle.Bin\\<SID>\\ per user, holding a $R...
+    entry with the deleted data and a small $I... record describing it.
+    Only $R entries are counted; deleted folders are walked. If sid is given
+    only that user's folder is read. Returns (bytes, items), or None when no
+    recycle bin folder could be read at all.
+    """
+    total = 0
+    items = 0
+    readable = False
+    for user_dir in _recycle_bin_user_dirs(drive_roots, sid):
+        try:
+            with os.scandir(user_dir) as entries:
+                readable = True
+                for entry in entries:
+                    if not entry.name.startswith('$R'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            total += sum(st.st_size for _, st in iter_files(entry.path, skip_dirs=()))
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                        items += 1
+                    except OSError:
+                        pass
+        except OSError:
+            continue
+    return (total, items) if readable else None
+
+
+def _recycle_bin_user_dirs(drive_roots, sid=None):
+    """The $Recycle.Bin\\<SID> folders on the given drives (only sid's if given)."""
+    user_dirs = []
+    for root in drive_roots:
+        try:
+            with os.scandir(os.path.join(root, '$Recycle.Bin')) as entries:
+                user_dirs.extend(e.path for e in entries
+                                 if e.is_dir(follow_symlinks=False) and (sid is None or e.name == sid))
+        except OSError:
+            continue
+    return user_dirs
+
+
+def recycle_bin_deleted_time(info_path):
+    """When an item was deleted, as a Unix time, from its $I record; None if unreadable.
+
+    Both $I layouts (version 1 before Windows 10, version 2 since) start
+    with the version, the original size and the deletion FILETIME.
+    """
+    try:
+        with open(info_path, 'rb') as f:
+            version, _, filetime = struct.unpack('<qqq', f.read(24))
+    except (OSError, struct.error):
+        return None
+    if version not in (1, 2) or filetime <= 0:
+        return None
+    return filetime / 1e7 - _FILETIME_UNIX_EPOCH
+
+
+# ─── Background Mode (Priority & I/O Throttling) ───────────────────────────────
+
+# Linux ioprio_set syscall numbers by architecture
+_IOPRIO_SET_SYSCALL = {
+    'x86_64': 251, 'amd64': 251, 'i386': 289, 'i686': 289,
+    'aarch64': 30, 'arm64': 30, 'armv7l': 314, 'ppc64le': 273,
+}
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_WHO_PROCESS = 1
+_PROCESS_MODE_BACKGROUND_BEGIN = 0x00100000
+_BELOW_NORMAL_PRIORITY_CLASS = 0x00004000
+
+
+def lower_process_priority():
+    """Lower this process's CPU and disk priority. Returns what was applied."""
+    applied = []
+    if os.name == 'nt':
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            process = ctypes.c_void_p(-1)  # GetCurrentProcess() pseudo-handle
+            # Background mode lowers CPU, disk and memory priority together
+            if kernel32.SetPriorityClass(process, _PROCESS_MODE_BACKGROUND_BEGIN):
+                applied.append("background processing mode (CPU + disk)")
+            elif kernel32.SetPriorityClass(process, _BELOW_NORMAL_PRIORITY_CLASS):
+                applied.append("below-normal CPU priority")
+        except Exception:
+            pass
+        return applied
+
+    try:
+        os.setpriority(os.PRIO_PROCESS, 0, 19)
+        applied.append("lowest CPU priority (nice 19)")
+    except (AttributeError, OSError):
+        pass
+
+    syscall_nr = _IOPRIO_SET_SYSCALL.get(platform.machine().lower())
+    if sys.platform.startswith('linux') and syscall_nr:
+        try:
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.syscall(syscall_nr, _IOPRIO_WHO_PROCESS, 0, _IOPRIO_CLASS_IDLE << 13) == 0:
+                applied.append("idle disk priority (ioprio)")
+        except Exception:
+            pass
+    return applied
+
+
+class IoThrottle:
+    """Token bucket that limits file operations and bytes read per second.
+
+    consume() sleeps whenever a budget is used up, so scans slow down instead
+    of competing with the real workload. Up to one second of budget can be
+    saved up for bursts.
+    """
+
+    def __init__(self, max_iops=None, max_bytes_per_sec=None):
+        self.max_iops = max_iops
+        self.max_bytes_per_sec = max_bytes_per_sec
+        self.op_tokens = float(max_iops or 0)
+        self.byte_tokens = float(max_bytes_per_sec or 0)
+        self.last_refill = time.monotonic()
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def consume(self, ops=1, nbytes=0):
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.last_refill
+            self.last_refill = now
+            wait_for = 0.0
+            if self.max_iops:
+                self.op_tokens = min(self.max_iops, self.op_tokens + elapsed * self.max_iops) - ops
+                if self.op_tokens < 0:
+                    wait_for = -self.op_tokens / self.max_iops
+            if self.max_bytes_per_sec and nbytes:
+                self.byte_tokens = min(self.max_bytes_per_sec,
+                                       self.byte_tokens + elapsed * self.max_bytes_per_sec) - nbytes
+                if self.byte_tokens < 0:
+                    wait_for = max(wait_for, -self.byte_tokens / self.max_bytes_per_sec)
+            if wait_for > 0:
+                self.throttled_seconds += wait_for
+                # Sleeping while holding the lock makes other threads queue behind us
+                time.sleep(wait_for)
+
+    def status(self):
+        """Short description for progress output."""
+        limits = []
+        if self.max_iops:
+            limits.append(f"{self.max_iops:,} ops/s")
+        if self.max_bytes_per_sec:
+            limits.append(f"{format_size(self.max_bytes_per_sec)}/s")
+        return f"🐢 throttled {self.throttled_seconds:.1f}s ({', '.join(limits) or 'no limit'})"
+
+
+# ─── Scanning Core ─────────────────────────────────────────────────────────────
+
+SKIP_DIRS = ('$Recycle.Bin', 'System Volume Information')
+USER_DATA_SKIP_DIRS = SKIP_DIRS + ('Windows', 'ProgramData')  # Not walked for large or cold files
+
+
+def iter_files(root, skip_dirs=SKIP_DIRS):
+    """Yield (path, stat) for every regular file under root.
+
+    Uses os.scandir so the size and timestamps usually come straight from the
+    directory listing. Symlinks are not followed and unreadable folders are
+    skipped silently.
+    """
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in skip_dirs:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path, entry.stat(follow_symlinks=False)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+
+
+def _list_dir(path, skip_dirs, with_ids=False, skip_hidden=False):
+    """Read one folder: returns (subfolders, [(path, stat), ...]) for its files.
+
+    On Windows the stat from a directory listing has no file id or link
+    count; with_ids=True asks for a full stat so hard links can be told apart.
+    skip_hidden leaves out subfolders whose name starts with a dot.
+    """
+    full_stat = with_ids and os.name == 'nt'
+    subdirs = []
+    files = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip_dirs and not (skip_hidden and entry.name.startswith('.')):
+                            subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        if full_stat:
+                            st = os.stat(entry.path, follow_symlinks=False)
+                        else:
+                            st = entry.stat(follow_symlinks=False)
+                        files.append((entry.path, st))
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return subdirs, files
+
+
+def parallel_iter_files(root, skip_dirs=SKIP_DIRS, workers=8, with_ids=False):
+    """Like iter_files, but folders are listed concurrently on a thread pool.
+
+    Listing and stat calls release the GIL, so this helps most on network
+    shares, SSDs and folders with huge numbers of entries.
+    """
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan") as executor:
+        pending = {executor.submit(_list_dir, str(root), skip_dirs, with_ids)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                subdirs, files = future.result()
+                for folder in subdirs:
+                    pending.add(executor.submit(_list_dir, folder, skip_dirs, with_ids))
+                for record in files:
+                    yield record
+
+
+def measure_tree(root, skip_dirs=(), workers=8):
+    """Measure a folder, counting hard-linked files only once.
+
+    Returns a dict with the file count, apparent bytes (every path counted,
+    what Explorer and Measure-Object show), unique bytes (each file on disk
+    counted once) and how many distinct hard-linked files were found.
+    shared_bytes is the part of unique_bytes in files that also have links
+    outside root (fewer of their links were found than st_nlink says), like
+    the WinSxS files linked into System32 that DISM reports as "shared with
+    Windows".
+    """
+    seen = {}  # (dev, inode) of hard-linked files -> [size, links, links found]
+    files = 0
+    apparent = 0
+    unique = 0
+    for _, st in parallel_iter_files(root, skip_dirs, workers, with_ids=True):
+        files += 1
+        apparent += st.st_size
+        if st.st_nlink > 1:
+            key = (st.st_dev, st.st_ino)
+            entry = seen.get(key)
+            if entry is not None:
+                entry[2] += 1
+                continue
+            seen[key] = [st.st_size, st.st_nlink, 1]
+        unique += st.st_size
+    shared = sum(size for size, links, found in seen.values() if found < links)
+    return {
+        "files": files,
+        "apparent_bytes": apparent,
+        "unique_bytes": unique,
+        "shared_bytes": shared,
+        "hardlinked_files": len(seen),
+    }
+
+
+class ScanIndex:
+    """Compact index of every file under a root, built with a single walk.
+
+    Columns live in parallel arrays and folder paths are stored once, so the
+    index stays small for millions of files. Analyses that need sizes and
+    timestamps share one index instead of walking the tree again.
+    """
+
+    def __init__(self, root, skip_dirs=SKIP_DIRS):
+        self.root = str(root)
+        self.built_at = time.time()
+        self.dirs = []
+        self.names = []
+        self.dir_ids = array('L')
+        self.sizes = array('Q')
+        self.mtimes = array('d')
+        self.atimes = array('d')
+
+        dir_lookup = {}
+        for path, st in iter_files(root, skip_dirs):
+            folder, name = os.path.split(path)
+            dir_id = dir_lookup.get(folder)
+            if dir_id is None:
+                dir_id = dir_lookup[folder] = len(self.dirs)
+                self.dirs.append(folder)
+            self.names.append(name)
+            self.dir_ids.append(dir_id)
+            self.sizes.append(st.st_size)
+            self.mtimes.append(st.st_mtime)
+            self.atimes.append(st.st_atime)
+
+    def __len__(self):
+        return len(self.names)
+
+    def path(self, i):
+        """Full path of the i-th file."""
+        return os.path.join(self.dirs[self.dir_ids[i]], self.names[i])
+
+    def total_size(self):
+        return sum(self.sizes)
+
+
+def bounded_map(executor, func, items, max_pending=None):
+    """Run func over items on an executor, yielding results as they finish.
+
+    Unlike executor.map this never queues more than max_pending tasks, so a
+    walk over millions of files doesn't have to be materialized up front.
+    """
+    if max_pending is None:
+        max_pending = (os.cpu_count() or 1) * 4
+    pending = set()
+    for item in items:
+        pending.add(executor.submit(func, item))
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    for future in pending:
+        yield future.result()
+
+
+# ─── Async Scanning API ────────────────────────────────────────────────────────
+
+async def ascan(root, skip_dirs=SKIP_DIRS, max_workers=8, executor=None, skip_hidden=False):
+    """Async version of iter_files: ``async for path, st in ascan(root)``.
+
+    Folder listings run on a thread pool with at most max_workers in flight,
+    and the event loop gets a turn after every folder, so other coroutines
+    keep running during long scans. Cancelling the consuming task or closing
+    the generator stops queuing new folders. skip_hidden leaves out folders
+    whose name starts with a dot at every level.
+    """
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ascan")
+
+    queue = [str(root)]
+    pending = set()
+    try:
+        while queue or pending:
+            while queue and len(pending) < max_workers:
+                pending.add(loop.run_in_executor(executor, _list_dir, queue.pop(), skip_dirs, False, skip_hidden))
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                subdirs, files = future.result()
+                queue.extend(subdirs)
+                for record in files:
+                    yield record
+            await asyncio.sleep(0)
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+async def afolder_sizes(root, skip_dirs=SKIP_DIRS, max_workers=8):
+    """Async folder totals: returns {folder name: (bytes, file count)}.
+
+    Like scan_folder_sizes, every folder directly inside root is reported
+    (empty ones as (0, 0)) and hidden folders are skipped at every level.
+    Unlike it, skip_dirs also applies directly inside root, and a symlink
+    to a folder is neither reported nor followed.
+    """
+    root = os.path.abspath(str(root))
+    prefix_len = len(os.path.join(root, ''))
+    loop = asyncio.get_running_loop()
+    top_dirs, _ = await loop.run_in_executor(None, _list_dir, root, skip_dirs, False, True)
+    sizes = {os.path.basename(path): (0, 0) for path in top_dirs}
+    async for path, st in ascan(root, skip_dirs, max_workers, skip_hidden=True):
+        top, sep, _ = path[prefix_len:].partition(os.sep)
+        if not sep:
+            continue  # Files directly inside root belong to no folder
+        size, count = sizes.get(top, (0, 0))
+        sizes[top] = (size + st.st_size, count + 1)
+    return sizes
+
+
+# ─── Live Folder Sizes (inotify) ───────────────────────────────────────────────
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW)
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+
+class Inotify:
+    """Minimal ctypes binding for Linux inotify (no extra packages needed)."""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._ctypes = ctypes
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path, mask=WATCH_MASK):
+        """Watch a folder and return its watch id. Raises OSError (ENOSPC at the watch limit)."""
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def read_events(self, timeout):
+        """Wait up to timeout seconds and return a list of (wd, mask, name)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        pos = 0
+        while pos + _INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, pos)
+            pos += _INOTIFY_EVENT.size
+            name = os.fsdecode(data[pos:pos + length].rstrip(b'\0'))
+            pos += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LiveSizeTree:
+    """Folder size totals that can be updated one file at a time.
+
+    totals[folder] is the size of everything below folder, so answering
+    "how big is X" never needs a rescan.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(str(root))
+        self.files = {}       # folder -> {file name: size}
+        self.subdirs = {}     # folder -> set of child folder names
+        self.totals = {}      # folder -> bytes in the whole subtree
+        self.mtimes = {}      # folder -> st_mtime_ns when it was last listed
+
+    def _add_delta(self, folder, delta):
+        while folder in self.totals:
+            self.totals[folder] += delta
+            if folder == self.root:
+                break
+            folder = os.path.dirname(folder)
+
+    def scan(self, folder):
+        """Add folder and everything below it. Returns the folders found."""
+        found = []
+        stack = [folder]
+        while stack:
+            current = stack.pop()
+            files = {}
+            children = set()
+            self.files[current] = files
+            self.subdirs[current] = children
+            self.totals[current] = 0
+            parent = os.path.dirname(current)
+            if current != self.root and parent in self.subdirs:
+                self.subdirs[parent].add(os.path.basename(current))
+            found.append(current)
+            total = 0
+            try:
+                self.mtimes[current] = os.stat(current).st_mtime_ns
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in SKIP_DIRS:
+                                    stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                size = entry.stat(follow_symlinks=False).st_size
+                                files[entry.name] = size
+                                total += size
+                        except OSError:
+                            pass
+            except OSError:
+                pass
+            if total:
+                self._add_delta(current, total)
+        return found
+
+    def remove_tree(self, folder):
+        """Forget folder and everything below it."""
+        if folder not in self.totals:
+            return
+        removed = self.totals[folder]
+        if folder != self.root:
+            self._add_delta(os.path.dirname(folder), -removed)
+            parent = self.subdirs.get(os.path.dirname(folder))
+            if parent is not None:
+                parent.discard(os.path.basename(folder))
+
+        stack = [folder]
+        while stack:
+            current = stack.pop()
+            for name in self.subdirs.pop(current, ()):
+                stack.append(os.path.join(current, name))
+            self.files.pop(current, None)
+            self.totals.pop(current, None)
+            self.mtimes.pop(current, None)
+
+    def update_file(self, path):
+        """Re-read one file's size (or drop it if it's gone)."""
+        folder, name = os.path.split(path)
+        files = self.files.get(folder)
+        if files is None:
+            return
+        try:
+            st = os.lstat(path)
+            new_size = st.st_size if S_ISREG(st.st_mode) else None
+        except OSError:
+            new_size = None
+        old_size = files.pop(name, 0)
+        if new_size is not None:
+            files[name] = new_size
+        delta = (new_size or 0) - old_size
+        if delta:
+            self._add_delta(folder, delta)
+
+    def refresh_folder(self, folder):
+        """Re-list one folder if its mtime changed. Returns newly found folders."""
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            self.remove_tree(folder)
+            return []
+        if self.mtimes.get(folder) == mtime:
+            return []
+        self.mtimes[folder] = mtime
+
+        seen_files = set()
+        seen_dirs = set()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS:
+                                seen_dirs.add(entry.name)
+                        elif entry.is_file(follow_symlinks=False):
+                            seen_files.add(entry.name)
+                    except OSError:
+                        pass
+        except OSError:
+            return []
+
+        for name in set(self.files[folder]) | seen_files:
+            self.update_file(os.path.join(folder, name))
+        for name in self.subdirs[folder] - seen_dirs:
+            self.remove_tree(os.path.join(folder, name))
+        found = []
+        for name in seen_dirs - self.subdirs[folder]:
+            found.extend(self.scan(os.path.join(folder, name)))
+        return found
+
+    def top_folders(self, n=15):
+        """Largest direct subfolders of the root as (path, bytes)."""
+        children = [os.path.join(self.root, name) for name in self.subdirs.get(self.root, ())]
+        return heapq.nlargest(n, ((c, self.totals.get(c, 0)) for c in children), key=lambda x: x[1])
+
+
+class SpaceWatcher:
+    """Keeps a LiveSizeTree current using inotify events.
+
+    Folders that can't get a watch (for example past fs.inotify.max_user_watches)
+    are re-listed every poll_interval seconds instead, but only when their
+    mtime changed. Polling spots files being added, removed or renamed; a file
+    growing in place inside a polled folder is picked up once that folder
+    changes again.
+    """
+
+    def __init__(self, root, poll_interval=60):
+        self.tree = LiveSizeTree(root)
+        self.poll_interval = poll_interval
+        self.watches = {}     # watch id -> folder
+        self.polled = set()
+        self.watch_limit_hit = False
+        self.next_poll = time.time() + poll_interval
+        try:
+            self.inotify = Inotify()
+        except (OSError, AttributeError):
+            self.inotify = None
+        self._watch(self.tree.scan(self.tree.root))
+
+    def _watch(self, folders):
+        for folder in folders:
+            if self.inotify is not None and not self.watch_limit_hit:
+                try:
+                    self.watches[self.inotify.add_watch(folder)] = folder
+                    continue
+                except OSError as e:
+                    self.watch_limit_hit = e.errno == errno.ENOSPC
+            self.polled.add(folder)
+
+    def process(self, timeout):
+        """Apply pending changes, waiting at most timeout seconds for new ones."""
+        if self.inotify is None:
+            time.sleep(timeout)
+            events = []
+        else:
+            events = self.inotify.read_events(timeout)
+
+        changed_files = set()
+        for wd, mask, name in events:
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: rebuild from scratch
+                root = self.tree.root
+                self.tree.remove_tree(root)
+                self._watch(self.tree.scan(root))
+                return
+            folder = self.watches.get(wd)
+            if folder is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.watches[wd]
+                continue
+            if mask & IN_DELETE_SELF:
+                continue
+            path = os.path.join(folder, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    self.tree.remove_tree(path)
+                elif mask & (IN_CREATE | IN_MOVED_TO) and path not in self.tree.totals:
+                    if name not in SKIP_DIRS:
+                        self._watch(self.tree.scan(path))
+            else:
+                changed_files.add(path)
+
+        for path in changed_files:
+            self.tree.update_file(path)
+
+        if self.polled and time.time() >= self.next_poll:
+            self.next_poll = time.time() + self.poll_interval
+            for folder in list(self.polled):
+                if folder not in self.tree.totals:
+                    self.polled.discard(folder)
+                    continue
+                self.polled.update(self.tree.refresh_folder(folder))
+
+    def close(self):
+        if self.inotify is not None:
+            self.inotify.close()
+
+
+# ─── External Size Grouping ────────────────────────────────────────────────────
+
+SIZE_GROUP_MEMORY_MB = 256     # Default memory budget before spilling to disk
+SIZE_GROUP_ENTRY_OVERHEAD = 120  # Rough bytes of Python objects per buffered path
+_RUN_RECORD = struct.Struct('>QI')  # size, length of the encoded path
+
+
+class SizeGrouper:
+    """Group file paths by size without holding every path in memory.
+
+    Paths are buffered until the memory budget is reached, then sorted by
+    size and written to a run file in a temp folder. groups() merges the runs
+    with heapq.merge and yields (size, [paths]) for sizes seen more than once,
+    so peak memory is the budget plus the largest single size group.
+    """
+
+    def __init__(self, memory_mb=SIZE_GROUP_MEMORY_MB):
+        self.memory_limit = max(1, int(memory_mb * 1024 * 1024))
+        self.buffer = []
+        self.buffered_bytes = 0
+        self.runs = []
+        self.count = 0
+        self.spill_dir = None
+
+    def add(self, size, path):
+        self.buffer.append((size, path))
+        self.buffered_bytes += len(path) + SIZE_GROUP_ENTRY_OVERHEAD
+        self.count += 1
+        if self.buffered_bytes >= self.memory_limit:
+            self._spill()
+
+    def _spill(self):
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="space_manager_sizes_")
+        self.buffer.sort()
+        run_path = os.path.join(self.spill_dir, f"run_{len(self.runs):05d}.bin")
+        with open(run_path, 'wb', buffering=1024 * 1024) as f:
+            for size, path in self.buffer:
+                encoded = path.encode('utf-8', 'surrogateescape')
+                f.write(_RUN_RECORD.pack(size, len(encoded)))
+                f.write(encoded)
+        self.runs.append(run_path)
+        self.buffer = []
+        self.buffered_bytes = 0
+
+    @staticmethod
+    def _read_run(run_path):
+        with open(run_path, 'rb', buffering=1024 * 1024) as f:
+            while True:
+                header = f.read(_RUN_RECORD.size)
+                if len(header) < _RUN_RECORD.size:
+                    return
+                size, length = _RUN_RECORD.unpack(header)
+                yield size, f.read(length).decode('utf-8', 'surrogateescape')
+
+    def groups(self):
+        """Yield (size, [paths]) for every size shared by two or more files."""
+        self.buffer.sort()
+        streams = [self._read_run(p) for p in self.runs] + [iter(self.buffer)]
+        current_size = None
+        paths = []
+        for size, path in heapq.merge(*streams):
+            if size != current_size:
+                if len(paths) > 1:
+                    yield current_size, paths
+                current_size = size
+                paths = []
+            paths.append(path)
+        if len(paths) > 1:
+            yield current_size, paths
+
+    def close(self):
+        self.buffer = []
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+        self.runs = []
+
+
+# ─── Near-Duplicate Detection (MinHash) ────────────────────────────────────────
+
+MINHASH_BINS = 64                       # Signature length (one-permutation MinHash)
+MINHASH_BANDS = 16                      # LSH bands of MINHASH_BINS // MINHASH_BANDS rows
+MINHASH_CHUNK = 512                     # Long lines and binary data are cut to this size
+MINHASH_SAMPLE_BYTES = 4 * 1024 * 1024  # Only the first 4 MB of each file is read
+MINHASH_MAX_REPS = 32                   # Limits comparisons inside one LSH bucket
+_MINHASH_EMPTY = 1 << 64
+_MINHASH_MASK = (1 << 64) - 1
+
+
+def _content_chunks(data, chunk_size=MINHASH_CHUNK):
+    """Split file content into line-based chunks (the MinHash shingles)."""
+    for line in data.split(b'\n'):
+        if len(line) <= chunk_size:
+            yield line
+        else:
+            for start in range(0, len(line), chunk_size):
+                yield line[start:start + chunk_size]
+
+
+def minhash_signature(filepath, sample_bytes=MINHASH_SAMPLE_BYTES):
+    """Compute a MinHash signature for a file, or None if it can't be read.
+
+    Each distinct chunk is hashed once; the low bits pick a bin and the
+    remaining bits compete for that bin's minimum. This needs a single hash
+    per chunk instead of one per permutation, so large files stay cheap.
+    The signature is MINHASH_BINS 64-bit values packed into bytes (512
+    bytes), so hundreds of thousands of them fit comfortably in memory.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read(sample_bytes)
+    except OSError:
+        return None
+
+    signature = [_MINHASH_EMPTY] * MINHASH_BINS
+    seen = False
+    for chunk in set(_content_chunks(data)):
+        h = int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'little')
+        b = h % MINHASH_BINS
+        value = h // MINHASH_BINS
+        if value < signature[b]:
+            signature[b] = value
+        seen = True
+
+    if not seen:
+        return None
+
+    # Fill empty bins from the next non-empty one so small files still compare well
+    for i in range(MINHASH_BINS):
+        if signature[i] == _MINHASH_EMPTY:
+            for distance in range(1, MINHASH_BINS):
+                donor = signature[(i + distance) % MINHASH_BINS]
+                if donor != _MINHASH_EMPTY:
+                    signature[i] = (donor + distance * 0x9E3779B97F4A7C15) & _MINHASH_MASK
+                    break
+    return array('Q', signature).tobytes()
+
+
+def path_signature(path):
+    """(path, minhash_signature(path)); the unit of work for a worker process."""
+    return path, minhash_signature(path)
+
+
+def signature_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity (0.0-1.0) of two MinHash signatures."""
+    matches = sum(1 for a, b in zip(memoryview(sig_a).cast('Q'), memoryview(sig_b).cast('Q')) if a == b)
+    return matches / MINHASH_BINS
+
+
+def cluster_near_duplicates(signatures, threshold=0.8, bands=MINHASH_BANDS):
+    """Group similar signatures into clusters using LSH buckets.
+
+    signatures is a list of (path, signature). Bands are keyed on slices of
+    the packed signature bytes. Only files that share a band bucket are
+    ever compared, so the cost grows with the number of files
+    rather than the number of pairs. Returns a list of (paths, min_similarity,
+    avg_similarity) for clusters with two or more files, most similar first.
+    """
+    band_bytes = MINHASH_BINS // bands * 8
+    parent = list(range(len(signatures)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        start = band * band_bytes
+        buckets = {}
+        for idx, (_, sig) in enumerate(signatures):
+            buckets.setdefault(sig[start:start + band_bytes], []).append(idx)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            reps = []
+            for idx in members:
+                for rep in reps:
+                    if find(rep) == find(idx):
+                        break
+                    if signature_similarity(signatures[rep][1], signatures[idx][1]) >= threshold:
+                        parent[find(idx)] = find(rep)
+                        break
+                else:
+                    if len(reps) < MINHASH_MAX_REPS:
+                        reps.append(idx)
+
+    groups = {}
+    for idx in range(len(signatures)):
+        groups.setdefault(find(idx), []).append(idx)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        anchor = signatures[members[0]][1]
+        scores = [signature_similarity(anchor, signatures[idx][1]) for idx in members[1:]]
+        clusters.append((
+            [signatures[idx][0] for idx in members],
+            min(scores),
+            sum(scores) / len(scores),
+        ))
+
+    clusters.sort(key=lambda c: (c[2], len(c[0])), reverse=True)
+    return clusters
+
+
+# ─── Link-Based Deduplication ──────────────────────────────────────────────────
+
+FICLONE = 0x40049409  # Linux ioctl: share all data blocks of another file (btrfs, XFS)
+
+
+def files_identical(path_a, path_b, block_size=1024 * 1024):
+    """Compare two files byte by byte."""
+    try:
+        with open(path_a, 'rb') as fa, open(path_b, 'rb') as fb:
+            while True:
+                a = fa.read(block_size)
+                b = fb.read(block_size)
+                if a != b:
+                    return False
+                if not a:
+                    return True
+    except OSError:
+        return False
+
+
+def _reflink(source, dest):
+    """Create dest as a copy-on-write clone of source, or raise OSError."""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this system")
+    with open(source, 'rb') as src:
+        fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            fcntl.ioctl(fd, FICLONE, src.fileno())
+        except OSError:
+            os.close(fd)
+            os.unlink(dest)
+            raise
+        os.close(fd)
+
+
+def file_identity(st):
+    """What must stay the same for a verified file to still hold the verified bytes."""
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def link_duplicate(source, duplicate, allow_hardlink=True, source_stat=None, duplicate_stat=None):
+    """Atomically replace duplicate with a reflink (or hard link) to source.
+
+    The new file is built next to the duplicate and moved over it with
+    os.replace, so the path always holds either the old or the new file.
+    source_stat and duplicate_stat are the stats taken when the two files
+    were compared; right before the replace both files are checked against
+    them, and if either changed since, nothing is replaced (OSError EBUSY).
+    Returns the method used: "reflink" or "hardlink".
+    """
+    before = duplicate_stat or os.stat(duplicate)
+    source_before = source_stat or os.stat(source)
+    folder, name = os.path.split(duplicate)
+    tmp = os.path.join(folder, f".{name}.dedupe-{os.getpid()}.tmp")
+    try:
+        try:
+            _reflink(source, tmp)
+            shutil.copystat(duplicate, tmp)
+            if hasattr(os, 'chown'):
+                try:
+                    os.chown(tmp, before.st_uid, before.st_gid)
+                except OSError:
+                    pass
+            method = "reflink"
+        except OSError:
+            if not allow_hardlink:
+                raise
+            os.link(source, tmp)
+            method = "hardlink"
+
+        if file_identity(os.stat(duplicate)) != file_identity(before):
+            raise OSError(errno.EBUSY, "File changed after it was verified", duplicate)
+        if file_identity(os.stat(source)) != file_identity(source_before):
+            raise OSError(errno.EBUSY, "File changed after it was verified", source)
+        os.replace(tmp, duplicate)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return method
+
+
+def unlink_duplicate(path, mode, atime_ns, mtime_ns, uid=None, gid=None):
+    """Give path its own private copy of the data again (undo link_duplicate).
+
+    The copy gets the original owner back when uid/gid are given and this
+    process may set them. Returns False if the owner couldn't be restored.
+    """
+    folder, name = os.path.split(path)
+    tmp = os.path.join(folder, f".{name}.restore-{os.getpid()}.tmp")
+    owner_restored = True
+    try:
+        shutil.copyfile(path, tmp)
+        if uid is not None and hasattr(os, 'chown'):
+            try:
+                os.chown(tmp, uid, gid if gid is not None else -1)
+            except PermissionError:
+                owner_restored = False
+        # After chown, which clears the setuid/setgid bits
+        os.chmod(tmp, mode)
+        os.utime(tmp, ns=(atime_ns, mtime_ns))
+        os.replace(tmp, path)
+        return owner_restored
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# ─── Block-Level Dedupe Estimate (Content-Defined Chunking) ────────────────────
+
+CDC_MIN_CHUNK = 2 * 1024
+CDC_AVG_CHUNK = 8 * 1024
+CDC_MAX_CHUNK = 64 * 1024
+CDC_READ_SIZE = 1024 * 1024
+_CDC_MASK64 = (1 << 64) - 1
+# Cut when the top bits of the rolling hash are all zero (1 in CDC_AVG_CHUNK odds)
+_CDC_CUT_MASK = (CDC_AVG_CHUNK - 1) << (64 - (CDC_AVG_CHUNK - 1).bit_length())
+# Gear table: one fixed pseudo-random 64-bit value per byte value
+_CDC_GEAR = [int.from_bytes(hashlib.blake2b(bytes([i]), digest_size=8).digest(), 'little')
+             for i in range(256)]
+
+
+def _cdc_find_cut(buf, start, end, at_eof):
+    """Return the end offset of the chunk starting at start, or -1 if more data is needed.
+
+    The gear hash is a plain per-byte loop, so chunking runs at roughly
+    5-10 MB/s per worker process; estimate_dedupe_savings spreads files
+    over all cores to make up for it.
+    """
+    limit = min(end, start + CDC_MAX_CHUNK)
+    if limit - start <= CDC_MIN_CHUNK:
+        return limit if at_eof else -1
+
+    gear = _CDC_GEAR
+    h = 0
+    for i in range(start + CDC_MIN_CHUNK, limit):
+        h = ((h << 1) + gear[buf[i]]) & _CDC_MASK64
+        if not h & _CDC_CUT_MASK:
+            return i + 1
+    if limit == start + CDC_MAX_CHUNK or at_eof:
+        return limit
+    return -1
+
+
+CHUNK_COUNT_MEMORY_MB = 256  # Default memory budget for chunk keys before spilling to disk
+# Bytes per buffered key while a run is sorted: 8 in the array plus the
+# temporary Python int and list slot that sorted() creates
+_CHUNK_KEY_SORT_BYTES = 44
+_CHUNK_RUN_READ = 64 * 1024  # Keys read from a run file at a time during the merge
+
+
+class ChunkCounter:
+    """Count unique chunk bytes without keeping a set of every fingerprint.
+
+    Each chunk becomes one 64-bit key: the top 48 bits of its fingerprint
+    and its length - 1 in the low 16 bits (chunks are at most 64 KB). Keys
+    are buffered in an array('Q'), sorted and written to a run file when the
+    memory budget is full, and counted in one heapq.merge pass at the end,
+    like SizeGrouper. With 48-bit fingerprints a terabyte of 8 KB chunks
+    mistakes a few dozen distinct chunks for repeats, well below the
+    precision of the estimate.
+    """
+
+    def __init__(self, memory_mb=CHUNK_COUNT_MEMORY_MB):
+        self.max_buffered = max(1024, int(memory_mb * 1024 * 1024) // _CHUNK_KEY_SORT_BYTES)
+        self.buffer = array('Q')
+        self.runs = []
+        self.spill_dir = None
+
+    def add(self, fingerprints, lengths):
+        for fingerprint, length in zip(fingerprints, lengths):
+            self.buffer.append((fingerprint & ~0xFFFF) | (length - 1))
+        if len(self.buffer) >= self.max_buffered:
+            self._spill()
+
+    def _spill(self):
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="space_manager_chunks_")
+        run_path = os.path.join(self.spill_dir, f"run_{len(self.runs):05d}.bin")
+        with open(run_path, 'wb') as f:
+            array('Q', sorted(self.buffer)).tofile(f)
+        self.runs.append(run_path)
+        self.buffer = array('Q')
+
+    @staticmethod
+    def _read_run(run_path):
+        with open(run_path, 'rb') as f:
+            while True:
+                keys = array('Q')
+                try:
+                    keys.fromfile(f, _CHUNK_RUN_READ)
+                except EOFError:
+                    pass  # Last, partial block
+                if not keys:
+                    return
+                yield from keys
+
+    def totals(self):
+        """(unique chunks, unique bytes) over everything added so far."""
+        streams = [self._read_run(p) for p in self.runs] + [iter(sorted(self.buffer))]
+        unique_chunks = 0
+        unique_bytes = 0
+        previous = None
+        for key in heapq.merge(*streams):
+            fingerprint = key >> 16
+            if fingerprint != previous:
+                previous = fingerprint
+                unique_chunks += 1
+                unique_bytes += (key & 0xFFFF) + 1
+        return unique_chunks, unique_bytes
+
+    def close(self):
+        self.buffer = array('Q')
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+        self.runs = []
+
+
+def cdc_fingerprints(filepath):
+    """Split a file into content-defined chunks in a single streaming pass.
+
+    Returns (path, fingerprints, lengths) where fingerprints is an array of
+    64-bit chunk hashes and lengths the matching chunk sizes. An unreadable
+    file returns empty arrays.
+    """
+    fingerprints = array('Q')
+    lengths = array('L')
+    buf = b''
+    try:
+        with open(filepath, 'rb') as f:
+            at_eof = False
+            while not at_eof:
+                block = f.read(CDC_READ_SIZE)
+                at_eof = not block
+                buf += block
+                start = 0
+                while start < len(buf):
+                    cut = _cdc_find_cut(buf, start, len(buf), at_eof)
+                    if cut < 0:
+                        break
+                    chunk = buf[start:cut]
+                    fingerprints.append(int.from_bytes(
+                        hashlib.blake2b(chunk, digest_size=8).digest(), 'little'))
+                    lengths.append(len(chunk))
+                    start = cut
+                buf = buf[start:]
+    except OSError:
+        return filepath, array('Q'), array('L')
+    return filepath, fingerprints, lengths
+
+
+# ─── Compressibility Analysis ──────────────────────────────────────────────────
+
+COMPRESS_SAMPLE_BLOCKS = 8
+COMPRESS_BLOCK_SIZE = 64 * 1024
+COMPRESS_COPY_SIZE = 1024 * 1024
+
+
+def byte_entropy(data):
+    """Shannon entropy of data in bits per byte (0 = constant, 8 = random)."""
+    if not data:
+        return 0.0
+    total = len(data)
+    return -sum(count / total * math.log2(count / total) for count in Counter(data).values())
+
+
+def sample_compressibility(item):
+    """Estimate how well a file compresses from a few evenly spaced blocks.
+
+    item is (path, size). Returns (path, size, zlib_ratio, lzma_ratio, entropy)
+    where a ratio is compressed / original size; ratios are None if the file
+    can't be read.
+    """
+    path, size = item
+    blocks = []
+    try:
+        with open(path, 'rb') as f:
+            if size <= COMPRESS_SAMPLE_BLOCKS * COMPRESS_BLOCK_SIZE:
+                blocks.append(f.read())
+            else:
+                step = (size - COMPRESS_BLOCK_SIZE) // (COMPRESS_SAMPLE_BLOCKS - 1)
+                for i in range(COMPRESS_SAMPLE_BLOCKS):
+                    f.seek(i * step)
+                    blocks.append(f.read(COMPRESS_BLOCK_SIZE))
+    except OSError:
+        return path, size, None, None, None
+
+    data = b''.join(blocks)
+    if not data:
+        return path, size, None, None, None
+
+    zlib_ratio = len(zlib.compress(data, 6)) / len(data)
+    lzma_ratio = len(lzma.compress(data, preset=1)) / len(data) if lzma else zlib_ratio
+    return path, size, zlib_ratio, lzma_ratio, byte_entropy(data)
+
+
+def _fsync_directory(folder):
+    """Make a rename or delete in folder durable (POSIX only; NTFS journals metadata itself)."""
+    if os.name == 'nt':
+        return
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _rename_no_replace(src, dst):
+    """Rename src to dst, failing with FileExistsError instead of overwriting dst."""
+    if os.name == 'nt':
+        os.rename(src, dst)  # Never replaces an existing file on Windows
+        return
+    try:
+        os.link(src, dst)  # Atomic: fails if dst exists
+    except OSError as e:
+        if e.errno not in (errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP):
+            raise
+        # No hard links on this filesystem (FAT, some network shares)
+        if os.path.lexists(dst):
+            raise FileExistsError(errno.EEXIST, "File exists", dst)
+        os.rename(src, dst)
+        return
+    os.unlink(src)
+
+
+def compress_file_verified(path):
+    """Stream path into path.xz, verify the archive, then remove the original.
+
+    The archive is decompressed again and its SHA-256 compared with the
+    original before anything is deleted. A file whose .xz name is already
+    taken is skipped. The archive and its folder are flushed to disk before
+    the original is removed, so a crash leaves at least one complete copy.
+    Returns (path, original_size, archive_size, error) with error None on
+    success.
+    """
+    if lzma is None:
+        return path, 0, 0, "xz compression is unavailable (this Python has no lzma module)"
+    archive = path + ".xz"
+    folder, name = os.path.split(path)
+    tmp = os.path.join(folder, f".{name}.xz.{os.getpid()}.tmp")
+    created = False
+    try:
+        if os.path.lexists(archive):
+            raise FileExistsError(errno.EEXIST, "An archive with this name already exists", archive)
+        st = os.stat(path)
+        original_hash = hashlib.sha256()
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o600)
+        created = True
+        with open(fd, 'wb') as raw:
+            with open(path, 'rb') as src, lzma.open(raw, 'wb', preset=6) as dst:
+                while True:
+                    block = src.read(COMPRESS_COPY_SIZE)
+                    if not block:
+                        break
+                    original_hash.update(block)
+                    dst.write(block)
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        check_hash = hashlib.sha256()
+        with lzma.open(tmp, 'rb') as f:
+            while True:
+                block = f.read(COMPRESS_COPY_SIZE)
+                if not block:
+                    break
+                check_hash.update(block)
+        if check_hash.digest() != original_hash.digest():
+            raise OSError(errno.EIO, "Archive verification failed")
+
+        now = os.stat(path)
+        if (now.st_size, now.st_mtime_ns) != (st.st_size, st.st_mtime_ns):
+            raise OSError(errno.EBUSY, "File changed while it was being compressed")
+
+        shutil.copystat(path, tmp)
+        _rename_no_replace(tmp, archive)
+        created = False
+        _fsync_directory(folder or ".")
+        os.unlink(path)
+        return path, st.st_size, os.path.getsize(archive), None
+    except (OSError, lzma.LZMAError) as e:
+        if created:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        return path, 0, 0, str(e)
+
+
+# ─── Cleanup Policies ──────────────────────────────────────────────────────────
+
+# Rules a cleanup target can have. A target with no rules is emptied completely.
+#   enabled           false skips the target entirely
+#   older_than_hours  only delete items untouched for this long (folders count
+#                     their newest file, so a folder a job is writing to stays)
+#   min_size_mb       only delete items at least this big
+#   largest_first     delete the biggest items first instead of the oldest
+#   keep_newest       always keep this many of the most recently used items
+#   max_free_mb       stop once this much space has been selected
+CLEANUP_RULES = ('enabled', 'older_than_hours', 'min_size_mb', 'largest_first',
+                 'keep_newest', 'max_free_mb')
+CLEANUP_TARGET_FIELDS = ('path', 'name', 'description')
+CLEANUP_DELETE_WORKERS = 8
+CLEANUP_DELETE_BATCH = 64
+
+
+def load_cleanup_policies(path):
+    """Read cleanup policies from a JSON file.
+
+    The file maps target keys (temp, user_temp, recycle_bin, prefetch,
+    thumbnails) to rules. Any other key must also give a "path", which adds
+    it as an extra cleanup target, e.g.:
+
+        {"temp": {"older_than_hours": 48},
+         "build_cache": {"path": "D:\\agent\\_temp", "keep_newest": 5}}
+
+    recycle_bin rules count ages from when each item was deleted.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("the policy file must contain a JSON object")
+    for key, rules in data.items():
+        if not isinstance(rules, dict):
+            raise ValueError(f"'{key}' must be an object of rules")
+        unknown = set(rules) - set(CLEANUP_RULES) - set(CLEANUP_TARGET_FIELDS)
+        if unknown:
+            raise ValueError(f"'{key}' has unknown rules: {', '.join(sorted(unknown))}")
+        for rule in ('older_than_hours', 'min_size_mb', 'keep_newest', 'max_free_mb'):
+            if rule not in rules:
+                continue
+            value = rules[rule]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"'{key}': {rule} must be a number of at least 0 (leave it out for no limit)")
+        for rule in ('enabled', 'largest_first'):
+            if rule in rules and not isinstance(rules[rule], bool):
+                raise ValueError(f"'{key}': {rule} must be true or false")
+        for field in CLEANUP_TARGET_FIELDS:
+            if field in rules and not isinstance(rules[field], str):
+                raise ValueError(f"'{key}': {field} must be a string")
+    return data
+
+
+def describe_policy(rules):
+    """Short human description of a rule set."""
+    parts = []
+    if rules.get('older_than_hours'):
+        parts.append(f"older than {rules['older_than_hours']:g}h")
+    if rules.get('min_size_mb'):
+        parts.append(f"at least {rules['min_size_mb']:g} MB")
+    if rules.get('keep_newest'):
+        parts.append(f"keep newest {int(rules['keep_newest'])}")
+    if rules.get('largest_first'):
+        parts.append("largest first")
+    if rules.get('max_free_mb'):
+        parts.append(f"up to {format_size(rules['max_free_mb'] * 1024 * 1024)}")
+    return ", ".join(parts) or "everything"
+
+
+def _item_footprint(entry):
+    """Return (size, newest mtime) for a directory entry, walking folders."""
+    st = entry.stat(follow_symlinks=False)
+    size, newest = st.st_size, st.st_mtime
+    if entry.is_dir(follow_symlinks=False):
+        size = 0
+        for _, file_st in iter_files(entry.path, skip_dirs=()):
+            size += file_st.st_size
+            newest = max(newest, file_st.st_mtime)
+    return size, newest
+
+
+def select_cleanup_items(items, rules, now=None):
+    """Apply a policy's rules to (time, path, size, is_dir) items in one pass.
+
+    time is when the item was last used. Returns {"items": [(path, size,
+    is_dir), ...], "size": bytes selected, "kept": items spared by the rules}.
+    """
+    now = time.time() if now is None else now
+    min_age = (rules.get('older_than_hours') or 0) * 3600
+    min_size = (rules.get('min_size_mb') or 0) * 1024 * 1024
+    keep_newest = int(rules.get('keep_newest') or 0)
+
+    newest_heap = []  # min-heap of the keep_newest most recent items
+    candidates = []
+    scanned = 0
+    for seq, (newest, item_path, size, is_dir) in enumerate(items):
+        item = (newest, seq, item_path, size, is_dir)
+        scanned += 1
+        if keep_newest:
+            if len(newest_heap) < keep_newest:
+                heapq.heappush(newest_heap, item)
+                continue
+            item = heapq.heappushpop(newest_heap, item)
+        newest, _, item_path, size, is_dir = item
+        if now - newest >= min_age and size >= min_size:
+            candidates.append(item)
+
+    if rules.get('largest_first'):
+        candidates.sort(key=lambda x: (-x[3], x[0]))
+    else:
+        candidates.sort()
+
+    budget = (rules.get('max_free_mb') or 0) * 1024 * 1024
+    selected = []
+    total = 0
+    for _, _, item_path, size, is_dir in candidates:
+        if budget and total >= budget:
+            break
+        selected.append((item_path, size, is_dir))
+        total += size
+    return {"items": selected, "size": total, "kept": scanned - len(selected)}
+
+
+def plan_cleanup(path, rules, now=None):
+    """Decide which top-level items under path a policy deletes, in one pass.
+
+    Returns the same dict as select_cleanup_items.
+    """
+    def footprints():
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        size, newest = _item_footprint(entry)
+                        yield newest, entry.path, size, entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+    return select_cleanup_items(footprints(), rules, now)
+
+
+def plan_recycle_bin(drive_roots, sid, rules, now=None):
+    """Apply a policy to the Recycle Bin's $R entries, or None if no bin folder is readable.
+
+    Ages count from when each item was deleted (its $I record), not from
+    when the file itself last changed. Every selected $R entry is followed
+    by its $I record in the plan, so no empty entry is left behind.
+    """
+    items = []
+    info_paths = {}
+    readable = False
+    for user_dir in _recycle_bin_user_dirs(drive_roots, sid):
+        try:
+            with os.scandir(user_dir) as entries:
+                readable = True
+                for entry in entries:
+                    if not entry.name.startswith('$R'):
+                        continue
+                    info_path = os.path.join(user_dir, '$I' + entry.name[2:])
+                    try:
+                        size, newest = _item_footprint(entry)
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    deleted = recycle_bin_deleted_time(info_path)
+                    items.append((newest if deleted is None else deleted, entry.path, size, is_dir))
+                    info_paths[entry.path] = info_path
+        except OSError:
+            continue
+    if not readable:
+        return None
+
+    plan = select_cleanup_items(items, rules, now)
+    with_records = []
+    for item_path, size, is_dir in plan["items"]:
+        with_records.append((item_path, size, is_dir))
+        if os.path.lexists(info_paths[item_path]):
+            with_records.append((info_paths[item_path], 0, False))
+    plan["items"] = with_records
+    return plan
+
+
+def _delete_batch(batch):
+    """Delete a batch of (path, size, is_dir); return (bytes freed, failures)."""
+    freed = 0
+    failed = 0
+    for path, size, is_dir in batch:
+        try:
+            if is_dir:
+                shutil.rmtree(path, ignore_errors=True)
+                if os.path.lexists(path):
+                    # Something inside was in use; count only what went away
+                    left = sum(st.st_size for _, st in iter_files(path, skip_dirs=()))
+                    freed += max(0, size - left)
+                    failed += 1
+                    continue
+            else:
+                os.unlink(path)
+            freed += size
+        except OSError:
+            failed += 1
+    return freed, failed
+
+
+def delete_planned_items(items, workers=CLEANUP_DELETE_WORKERS, batch_size=CLEANUP_DELETE_BATCH):
+    """Delete planned items in parallel batches; return (bytes freed, failures)."""
+    # Small plans still spread over the workers, big ones go in fixed-size batches
+    batch_size = max(1, min(batch_size, math.ceil(len(items) / workers)))
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    if len(batches) <= 1:
+        return _delete_batch(items)
+    freed = 0
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_freed, batch_failed in executor.map(_delete_batch, batches):
+            freed += batch_freed
+            failed += batch_failed
+    return freed, failed
+
+
+# ─── Background Stages ─────────────────────────────────────────────────────────
+
+class ThreadOutput(io.TextIOBase):
+    """Stand-in for sys.stdout that can send each thread's prints elsewhere.
+
+    Threads that call capture() have their output collected in a buffer;
+    every other thread writes straight through to the real stream. This lets
+    report stages run in the background without mixing into the screen.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def release(self):
+        self._local.buffer = None
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        if getattr(self._local, 'buffer', None) is None:
+            self.stream.flush()
+
+
+def run_captured(output, func):
+    """Run func with this thread's prints captured; return everything it printed."""
+    buffer = output.capture()
+    try:
+        func()
+    except Exception as e:
+        print(f"\n  ❌ Something went wrong: {e}")
+    finally:
+        output.release()
+    return buffer.getvalue()
+
+
 # ─── Banner ────────────────────────────────────────────────────────────────────
 
 def show_startup_banner():
@@ -142,6 +1901,48 @@ class WindowsSpaceManager:
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.log_file = self.log_dir / "space_manager.log"
         self.win_info = get_windows_info()
+        self._scan_indexes = {}
+        self._scan_index_lock = threading.Lock()
+        self.throttle = None
+
+    def enable_background_mode(self, max_iops=200, max_read_mb=20):
+        """Lower priority and throttle disk use so scans can run during work hours."""
+        applied = lower_process_priority()
+        self.throttle = IoThrottle(max_iops or None,
+                                   int(max_read_mb * 1024 * 1024) if max_read_mb else None)
+        print("🐢 Background mode: scans yield to other programs.")
+        for item in applied:
+            print(f"   ✅ {item}")
+        print(f"   ✅ limited to {self.throttle.status().split('(', 1)[1].rstrip(')')}")
+        print()
+        self.log_action(f"Background mode: {', '.join(applied) or 'priority unchanged'}; "
+                        f"{max_iops} ops/s, {max_read_mb} MB/s")
+
+    def _io(self, ops=1, nbytes=0):
+        """Account for disk work against the background-mode budget, if any."""
+        if self.throttle is not None:
+            self.throttle.consume(ops, nbytes)
+
+    def _progress(self, message):
+        """Overwrite the current progress line, adding throttle info in background mode."""
+        if self.throttle is not None:
+            message = f"{message}  {self.throttle.status()}"
+        print(f"   {message:<76}", end="\r", flush=True)
+
+    def get_scan_index(self, root, refresh=False, skip_dirs=SKIP_DIRS):
+        """Return the shared ScanIndex for root, walking the tree only the first time.
+
+        Indexes are kept per (root, skip_dirs); find_large_files and
+        find_cold_data both ask for USER_DATA_SKIP_DIRS, so they share one
+        walk that never enters the system folders. The lock makes a stage
+        running in the background during full_analysis wait for an index
+        that is already being built instead of starting a second walk.
+        """
+        key = (os.path.abspath(str(root)), tuple(skip_dirs))
+        with self._scan_index_lock:
+            if refresh or key not in self._scan_indexes:
+                self._scan_indexes[key] = ScanIndex(key[0], key[1])
+            return self._scan_indexes[key]
 
     def log_action(self, action, success=True, details=""):
         """Log the action to the log file with timestamp and success status."""
@@ -200,44 +2001,39 @@ class WindowsSpaceManager:
 
         drives_found = []
 
-        # Use shutil.disk_usage for each drive letter
-        for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
-            drive = f"{letter}:\\"
-            if os.path.exists(drive):
-                try:
-                    usage = shutil.disk_usage(drive)
-                    total = usage.total
-                    used = usage.used
-                    free = usage.free
-                    percent = (used / total * 100) if total > 0 else 0
-
-                    emoji = get_usage_emoji(percent)
-                    bar = format_bar(used, total)
-
-                    drives_found.append({
-                        "letter": letter,
-                        "total": total,
-                        "used": used,
-                        "free": free,
-                        "percent": percent
-                    })
-
-                    print(f"  {emoji} Drive {letter}: {bar} {percent:.0f}% used")
-                    print(f"      Total: {format_size(total)}  |  Used: {format_size(used)}  |  Free: {format_size(free)}")
-
-                    if percent >= 90:
-                        print(f"      🚨 This drive is almost full! You should free up space soon.")
-                    elif percent >= 75:
-                        print(f"      ⚠️  Getting full — consider cleaning up some files.")
-                    else:
-                        print(f"      ✅ Plenty of space available.")
-                    print()
+        for drive in enumerate_drives():
+            letter = drive["letter"]
+            label = f"Drive {letter}:" if os.name == 'nt' else f"📂 {letter}"
 
-                except PermissionError:
-                    print(f"  🔒 Drive {letter}: Cannot read (access denied)")
-                    print()
-                except Exception:
-                    pass
+            if drive["status"] == "stale":
+                print(f"  ⏳ {label} Not responding (disconnected network drive?) — skipped")
+                print()
+                continue
+            if drive["status"] == "denied":
+                print(f"  🔒 {label} Cannot read (access denied)")
+                print()
+                continue
+
+            total = drive["total"]
+            used = drive["used"]
+            free = drive["free"]
+            percent = drive["percent"]
+
+            emoji = get_usage_emoji(percent)
+            bar = format_bar(used, total)
+
+            drives_found.append(drive)
+
+            print(f"  {emoji} {label} {bar} {percent:.0f}% used")
+            print(f"      Total: {format_size(total)}  |  Used: {format_size(used)}  |  Free: {format_size(free)}")
+
+            if percent >= 90:
+                print(f"      🚨 This drive is almost full! You should free up space soon.")
+            elif percent >= 75:
+                print(f"      ⚠️  Getting full — consider cleaning up some files.")
+            else:
+                print(f"      ✅ Plenty of space available.")
+            print()
 
         if not drives_found:
             print("  ❌ No drives found. This is unusual — please check your system.")
@@ -282,12 +2078,16 @@ class WindowsSpaceManager:
                     try:
                         total_size = 0
                         file_count = 0
+                        if self.throttle is not None:
+                            self._progress(f"⏳ {item.name}...")
                         for root, dirs, files in os.walk(item):
                             # Skip hidden and system directories
                             dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ('$Recycle.Bin', 'System Volume Information')]
+                            self._io()
                             for f in files:
                                 try:
                                     fp = os.path.join(root, f)
+                                    self._io()
                                     if not os.path.islink(fp):
                                         total_size += os.path.getsize(fp)
                                         file_count += 1
@@ -301,6 +2101,10 @@ class WindowsSpaceManager:
             print("  🔒 Cannot access this folder. Try running as administrator.")
             return
 
+        if self.throttle is not None:
+            print(f"   ✅ Scan finished  {self.throttle.status():<60}")
+            print()
+
         # Sort by size descending
         folder_sizes.sort(key=lambda x: x[1], reverse=True)
 
@@ -334,6 +2138,58 @@ class WindowsSpaceManager:
 
         self.log_action(f"Folder scan completed: {target}")
 
+    # ─── 2b. Live Folder Sizes (Linux) ──────────────────────────────────────
+
+    def watch_folder_sizes(self, target_path=None, refresh_seconds=5, top_n=15):
+        """Scan once, then keep folder sizes up to date as files change."""
+        if target_path is None:
+            target_path = self.home_dir
+
+        if not sys.platform.startswith('linux'):
+            print("  ❌ Watch mode uses Linux inotify and is only available on Linux.")
+            return
+
+        print(f"  📂 Scanning {target_path} once, then watching for changes...")
+        watcher = SpaceWatcher(target_path)
+        next_draw = 0
+        try:
+            while True:
+                now = time.time()
+                if now >= next_draw:
+                    self._draw_live_sizes(watcher, top_n)
+                    next_draw = now + refresh_seconds
+                watcher.process(max(0.0, next_draw - time.time()))
+        except KeyboardInterrupt:
+            print("\n  👋 Stopped watching.")
+        finally:
+            watcher.close()
+        self.log_action(f"Watched folder sizes: {target_path}")
+
+    def _draw_live_sizes(self, watcher, top_n):
+        """Print the current totals from a SpaceWatcher."""
+        tree = watcher.tree
+        try:
+            os.system('cls' if os.name == 'nt' else 'clear')
+        except Exception:
+            pass
+        print("=" * 60)
+        print(f"📡 LIVE FOLDER SIZES                  {RISK_SAFE}")
+        print(f"   📂 {tree.root}  —  updated {datetime.now().strftime('%H:%M:%S')}")
+        print("   Press Ctrl+C to stop.")
+        print("=" * 60)
+        print()
+
+        folders = tree.top_folders(top_n)
+        max_size = folders[0][1] if folders and folders[0][1] > 0 else 1
+        for i, (path, size) in enumerate(folders, 1):
+            filled = int(20 * size / max_size)
+            bar = "█" * filled + "░" * (20 - filled)
+            print(f"  {i:2d}. [{bar}] {format_size(size):>10}  📁 {os.path.basename(path)}")
+        print()
+        print(f"  📊 Total: {format_size(tree.totals.get(tree.root, 0))}  |  "
+              f"{len(watcher.watches):,} folders watched live, {len(watcher.polled):,} checked every "
+              f"{watcher.poll_interval}s")
+
     # ─── 3. Large File Finder ───────────────────────────────────────────────
 
     def find_large_files(self, target_path=None, min_size_mb=100, top_n=20):
@@ -356,22 +2212,13 @@ class WindowsSpaceManager:
         min_size_bytes = min_size_mb * 1024 * 1024
         large_files = []
 
-        try:
-            for root, dirs, files in os.walk(target):
-                # Skip system directories
-                dirs[:] = [d for d in dirs if d not in ('$Recycle.Bin', 'System Volume Information', 'Windows', 'ProgramData')]
-                for f in files:
-                    try:
-                        fp = Path(root) / f
-                        if not fp.is_symlink():
-                            size = fp.stat().st_size
-                            if size >= min_size_bytes:
-                                large_files.append((str(fp), size, fp.suffix.lower()))
-                    except (OSError, PermissionError):
-                        pass
-
-        except PermissionError:
-            print("  🔒 Cannot access some folders. Try running as administrator.")
+        # The walk is shared with the cold data finder and skips system folders
+        index = self.get_scan_index(target, skip_dirs=USER_DATA_SKIP_DIRS)
+        sizes = index.sizes
+        for i in range(len(index)):
+            if sizes[i] >= min_size_bytes:
+                path = index.path(i)
+                large_files.append((path, sizes[i], os.path.splitext(path)[1].lower()))
 
         # Sort by size descending
         large_files.sort(key=lambda x: x[1], reverse=True)
@@ -417,8 +2264,10 @@ class WindowsSpaceManager:
             print(f"  ... and {len(large_files) - top_n} more files")
 
         total_size = sum(s for _, s, _ in large_files)
+        scanned = index.total_size()
         print()
-        print(f"  📊 Total size of large files: {format_size(total_size)}")
+        print(f"  📊 Total size of large files: {format_size(total_size)}"
+              + (f" ({total_size / scanned * 100:.0f}% of everything scanned)" if scanned else ""))
         print()
         print("  💡 Tips:")
         print("     • 💿 Disk images (.iso) can often be deleted after use")
@@ -431,7 +2280,7 @@ class WindowsSpaceManager:
 
     # ─── 4. Duplicate File Finder ───────────────────────────────────────────
 
-    def find_duplicates(self, target_path=None, min_size_mb=1):
+    def find_duplicates(self, target_path=None, min_size_mb=1, memory_mb=SIZE_GROUP_MEMORY_MB):
         """Find duplicate files using hash comparison."""
         if target_path is None:
             target_path = self.home_dir
@@ -450,54 +2299,8 @@ class WindowsSpaceManager:
         print("   ⏳ This may take several minutes...")
         print()
 
-        # Phase 1: Group files by size
-        print("   🔍 Step 1/2: Grouping files by size...")
-        size_groups = {}
-
-        try:
-            for root, dirs, files in os.walk(target):
-                dirs[:] = [d for d in dirs if d not in ('$Recycle.Bin', 'System Volume Information', '.git')]
-                for f in files:
-                    try:
-                        fp = Path(root) / f
-                        if not fp.is_symlink():
-                            size = fp.stat().st_size
-                            if size >= min_size_bytes:
-                                size_groups.setdefault(size, []).append(str(fp))
-                    except (OSError, PermissionError):
-                        pass
-        except PermissionError:
-            pass
-
-        # Keep only sizes with multiple files
-        potential_dupes = {s: paths for s, paths in size_groups.items() if len(paths) > 1}
-
-        if not potential_dupes:
-            print()
-            print("  ✅ No duplicate files found!")
-            print("  💡 Your files look well organized. No action needed.")
-            return
-
-        # Phase 2: Hash comparison
-        print(f"   🔍 Step 2/2: Comparing {sum(len(v) for v in potential_dupes.values())} files...")
-
-        hash_groups = {}
-        for size, paths in potential_dupes.items():
-            for path in paths:
-                try:
-                    file_hash = self._hash_file(path)
-                    if file_hash:
-                        hash_groups.setdefault(file_hash, []).append((path, size))
-                except Exception:
-                    pass
-
-        # Keep only actual duplicates
-        duplicates = {h: files for h, files in hash_groups.items() if len(files) > 1}
-
+        duplicates = self._collect_duplicate_groups(target, min_size_bytes, memory_mb)
         if not duplicates:
-            print()
-            print("  ✅ No duplicate files found!")
-            print("  💡 Files with the same size turned out to be different.")
             return
 
         # Display results
@@ -533,10 +2336,281 @@ class WindowsSpaceManager:
         print()
         print("  ⚠️  Before deleting duplicates, make sure you keep the copy")
         print("     in the location you want. Don't delete files you're unsure about.")
+        print("  💡 Or use --dedupe-apply to replace the copies with links instead.")
         print()
 
         self.log_action(f"Duplicate scan: {len(duplicates)} groups, {format_size(total_wasted)} reclaimable")
 
+    def _collect_duplicate_groups(self, target, min_size_bytes, memory_mb=SIZE_GROUP_MEMORY_MB):
+        """Group files by size, then by hash. Returns {hash: [(path, size), ...]}.
+
+        Size grouping spills to disk past memory_mb, so huge trees stay within
+        a fixed memory budget. Hashing then runs one size group at a time.
+        """
+        # Phase 1: Group files by size
+        print("   🔍 Step 1/2: Grouping files by size...")
+        grouper = SizeGrouper(memory_mb)
+
+        try:
+            for path, st in iter_files(target, SKIP_DIRS + ('.git',)):
+                self._io()
+                if st.st_size >= min_size_bytes:
+                    grouper.add(st.st_size, path)
+            if grouper.runs:
+                print(f"   💾 {grouper.count:,} files: {len(grouper.runs)} sorted batches saved to disk "
+                      f"to stay under {memory_mb} MB of memory")
+
+            # Phase 2: Hash comparison, one size group at a time
+            print(f"   🔍 Step 2/2: Comparing files that share a size...")
+
+            duplicates = {}
+            hashed = 0
+            for size, paths in grouper.groups():
+                hash_groups = {}
+                for path in paths:
+                    try:
+                        file_hash = self._hash_file(path)
+                        if file_hash:
+                            hash_groups.setdefault(file_hash, []).append((path, size))
+                    except Exception:
+                        pass
+                    hashed += 1
+                    if self.throttle is not None and hashed % 20 == 0:
+                        self._progress(f"⏳ {hashed:,} files compared")
+                for file_hash, files in hash_groups.items():
+                    if len(files) > 1:
+                        duplicates.setdefault(file_hash, []).extend(files)
+        finally:
+            grouper.close()
+
+        if hashed == 0:
+            print()
+            print("  ✅ No duplicate files found!")
+            print("  💡 Your files look well organized. No action needed.")
+            return {}
+
+        if self.throttle is not None:
+            print(f"   ✅ Comparison finished  {self.throttle.status():<50}")
+        else:
+            print(f"   ✅ Compared {hashed:,} files")
+
+        if not duplicates:
+            print()
+            print("  ✅ No duplicate files found!")
+            print("  💡 Files with the same size turned out to be different.")
+        return duplicates
+
+    def _plan_dedupe(self, duplicates):
+        """Turn duplicate groups into a verified list of
+        (keep, duplicate, size, allow_hardlink, keep_stat, duplicate_stat).
+
+        The stats are taken before the byte comparison and checked again
+        after it, so they describe exactly the content that was compared.
+        """
+        plan = []
+        skipped = 0
+        for files in duplicates.values():
+            stats = []
+            for path, _ in files:
+                try:
+                    stats.append((path, os.stat(path)))
+                except OSError:
+                    skipped += 1
+            if len(stats) < 2:
+                continue
+
+            # Keep the oldest copy, it is most likely the original
+            stats.sort(key=lambda x: (x[1].st_mtime, x[0]))
+            keep, keep_st = stats[0]
+            for path, st in stats[1:]:
+                if st.st_dev != keep_st.st_dev:
+                    skipped += 1
+                    continue
+                if st.st_ino and st.st_ino == keep_st.st_ino:
+                    continue  # Already the same file
+                if not files_identical(keep, path):
+                    skipped += 1
+                    continue
+                try:
+                    unchanged = file_identity(os.stat(keep)) == file_identity(keep_st) and \
+                        file_identity(os.stat(path)) == file_identity(st)
+                except OSError:
+                    unchanged = False
+                if not unchanged:
+                    skipped += 1  # Modified while it was being compared
+                    continue
+                # Hard links share permissions and owner, so only use them when those match
+                allow_hardlink = (st.st_mode, st.st_uid, st.st_gid) == \
+                    (keep_st.st_mode, keep_st.st_uid, keep_st.st_gid)
+                plan.append((keep, path, st.st_size, allow_hardlink, keep_st, st))
+        return plan, skipped
+
+    def apply_dedupe(self, target_path=None, min_size_mb=1, dry_run=False,
+                     memory_mb=SIZE_GROUP_MEMORY_MB):
+        """Replace verified duplicate copies with reflinks or hard links."""
+        if target_path is None:
+            target_path = self.home_dir
+
+        target = Path(target_path)
+        min_size_bytes = min_size_mb * 1024 * 1024
+
+        print()
+        print("=" * 60)
+        print(f"🔗 DEDUPLICATE BY LINKING COPIES      {RISK_MODERATE}")
+        print("   Replaces identical copies with links to one file.")
+        print("   Every path keeps working — only the wasted space is freed.")
+        print("=" * 60)
+        print(f"   📂 Searching in: {target}")
+        print(f"   📏 Minimum file size: {min_size_mb} MB")
+        if dry_run:
+            print("   🧪 Dry run: nothing will be changed.")
+        print()
+
+        duplicates = self._collect_duplicate_groups(target, min_size_bytes, memory_mb)
+        if not duplicates:
+            return None
+
+        print("   🔍 Verifying every copy byte by byte...")
+        plan, skipped = self._plan_dedupe(duplicates)
+
+        if not plan:
+            print()
+            print("  ✅ Nothing to deduplicate — copies are already linked or differ.")
+            return None
+
+        total = sum(item[2] for item in plan)
+        print()
+        print(f"  📋 Plan: link {len(plan)} copies, freeing about {format_size(total)}")
+        print()
+        for keep, path, size, allow_hardlink, _, _ in plan[:20]:
+            how = "reflink or hard link" if allow_hardlink else "reflink only"
+            print(f"     🔗 {path}")
+            print(f"        → {keep}  ({format_size(size)}, {how})")
+        if len(plan) > 20:
+            print(f"     ... and {len(plan) - 20} more copies")
+        if skipped:
+            print(f"     ⏭️  {skipped} files skipped (other drive, unreadable, changed or not identical)")
+        print()
+
+        if dry_run:
+            self.log_action(f"Dedupe plan: {len(plan)} copies, {format_size(total)}")
+            return plan
+
+        print("  🟡 Hard-linked copies share their content: editing one changes all of them.")
+        print("     Reflinks (btrfs/XFS) don't have this problem and are used when possible.")
+        print()
+        try:
+            response = input("  Link these copies now? (yes/no): ").strip().lower()
+        except (KeyboardInterrupt, EOFError):
+            print("\n  ❌ Cancelled.")
+            return None
+
+        if response not in ('yes', 'y', 'si', 'sí'):
+            print("  ❌ Cancelled. No files were changed.")
+            return None
+
+        journal_path = self.log_dir / f"dedupe_journal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        freed = 0
+        failed = 0
+        methods = {"reflink": 0, "hardlink": 0}
+
+        def write_journal(entry):
+            journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+        # Each link is recorded as pending before it happens and marked done
+        # or failed afterwards, so a crash in between can still be undone
+        with open(journal_path, 'a', encoding='utf-8') as journal:
+            for keep, path, size, allow_hardlink, keep_st, st in plan:
+                write_journal({
+                    "path": path,
+                    "source": keep,
+                    "state": "pending",
+                    "size": size,
+                    "mode": st.st_mode,
+                    "uid": st.st_uid,
+                    "gid": st.st_gid,
+                    "atime_ns": st.st_atime_ns,
+                    "mtime_ns": st.st_mtime_ns,
+                })
+                try:
+                    method = link_duplicate(keep, path, allow_hardlink, keep_st, st)
+                except OSError as e:
+                    write_journal({"path": path, "state": "failed"})
+                    failed += 1
+                    self.log_action(f"Dedupe {path}", success=False, details=str(e))
+                    continue
+                write_journal({"path": path, "state": "done", "method": method})
+                methods[method] += 1
+                freed += size
+
+        print()
+        print("─" * 60)
+        print(f"  ✅ Linked {methods['reflink'] + methods['hardlink']} copies "
+              f"({methods['reflink']} reflinks, {methods['hardlink']} hard links)")
+        print(f"  💾 Space freed: about {format_size(freed)}")
+        if failed:
+            print(f"  ⚠️  {failed} copies couldn't be linked (changed, in use or no permission)")
+        print(f"  📄 Undo journal: {journal_path}")
+        print(f"     To undo: python space_manager.py --dedupe-rollback \"{journal_path}\"")
+        print()
+
+        self.log_action(f"Dedupe applied: {len(plan) - failed} copies, {format_size(freed)} freed, "
+                        f"journal {journal_path}", success=failed == 0)
+        return journal_path
+
+    def rollback_dedupe(self, journal_path):
+        """Undo apply_dedupe by giving every linked path its own copy again."""
+        print()
+        print("=" * 60)
+        print(f"↩️  UNDO DEDUPLICATION                 {RISK_LOW}")
+        print("   Gives every linked copy its own separate file again.")
+        print("=" * 60)
+        print()
+
+        try:
+            with open(journal_path, encoding='utf-8') as f:
+                records = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            print(f"  ❌ Could not read journal: {e}")
+            return False
+
+        # Pending entries whose link never finished (a crash) are restored
+        # too: copying an unlinked file onto itself is harmless. Journals
+        # from before the pending/done records have no state and count as done.
+        entries = []
+        states = {}
+        for record in records:
+            if "mode" in record:
+                entries.append(record)
+            states[record["path"]] = record.get("state", "done")
+
+        restored = 0
+        failed = 0
+        new_owner = 0
+        for entry in reversed(entries):
+            if states.get(entry["path"]) == "failed":
+                continue
+            try:
+                if not unlink_duplicate(entry["path"], entry["mode"], entry["atime_ns"], entry["mtime_ns"],
+                                        entry.get("uid"), entry.get("gid")):
+                    new_owner += 1
+                restored += 1
+            except OSError as e:
+                failed += 1
+                print(f"  ⚠️  {entry['path']}: {e}")
+
+        print(f"  ✅ Restored {restored} files as separate copies.")
+        if new_owner:
+            print(f"  ⚠️  {new_owner} files now belong to you; run as administrator/root to keep their owners.")
+        if failed:
+            print(f"  ⚠️  {failed} files could not be restored (see above).")
+        print()
+
+        self.log_action(f"Dedupe rollback: {restored} restored from {journal_path}", success=failed == 0)
+        return failed == 0
+
     def _hash_file(self, filepath, block_size=65536):
         """Compute SHA-256 hash of a file (first 1MB for speed)."""
         hasher = hashlib.sha256()
@@ -546,6 +2620,7 @@ class WindowsSpaceManager:
             with open(filepath, 'rb') as f:
                 while bytes_read < max_read:
                     data = f.read(block_size)
+                    self._io(1, len(data))
                     if not data:
                         break
                     hasher.update(data)
@@ -554,10 +2629,308 @@ class WindowsSpaceManager:
         except Exception:
             return None
 
+    # ─── 4b. Near-Duplicate Finder ──────────────────────────────────────────
+
+    def find_near_duplicates(self, target_path=None, min_size_mb=0.1, similarity=80, workers=None):
+        """Find files that are almost identical (logs, exports, documents).
+
+        Fingerprints are computed in worker processes while the walk keeps
+        finding files.
+        """
+        if target_path is None:
+            target_path = self.home_dir
+
+        target = Path(target_path)
+        min_size_bytes = int(min_size_mb * 1024 * 1024)
+        threshold = similarity / 100
+
+        print()
+        print("=" * 60)
+        print(f"🔍 FINDING NEARLY IDENTICAL FILES     {RISK_SAFE}")
+        print("   Looking for files that are almost the same, like old")
+        print("   versions of a document or copies of a log file.")
+        print("   This only finds them — it won't delete anything.")
+        print("=" * 60)
+        print(f"   📂 Searching in: {target}")
+        print(f"   📏 Minimum file size: {min_size_mb} MB")
+        print(f"   🎯 Minimum similarity: {similarity}%")
+        print("   ⏳ This may take several minutes...")
+        print()
+
+        print("   🔍 Step 1/2: Reading file fingerprints...")
+        signatures = []
+        candidates = (path for path, st in iter_files(target, SKIP_DIRS + ('.git',))
+                      if st.st_size >= min_size_bytes)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path, sig in bounded_map(executor, path_signature, candidates):
+                if sig is not None:
+                    signatures.append((path, sig))
+
+        print(f"   🔍 Step 2/2: Grouping {len(signatures):,} similar files...")
+        clusters = cluster_near_duplicates(signatures, threshold)
+
+        if not clusters:
+            print()
+            print(f"  ✅ No files found that are at least {similarity}% alike!")
+            print("  💡 Your files look well organized. No action needed.")
+            return []
+
+        print()
+        print(f"  🔍 Found {len(clusters)} groups of nearly identical files:")
+        print()
+
+        for i, (paths, min_sim, avg_sim) in enumerate(clusters, 1):
+            if i > 10:
+                print(f"  ... and {len(clusters) - 10} more groups")
+                break
+
+            print(f"  Group {i}: {len(paths)} files — about {avg_sim * 100:.0f}% alike "
+                  f"(lowest {min_sim * 100:.0f}%)")
+            for path in paths[:8]:
+                try:
+                    size = format_size(os.path.getsize(path))
+                except OSError:
+                    size = "?"
+                print(f"     📄 {path}  ({size})")
+            if len(paths) > 8:
+                print(f"     ... and {len(paths) - 8} more files")
+            print()
+
+        print("  💡 Similarity is an estimate based on matching pieces of content.")
+        print("     Open the files and compare them before deleting anything.")
+        print()
+
+        self.log_action(f"Near-duplicate scan: {len(clusters)} groups in {len(signatures)} files")
+        return clusters
+
+    # ─── 4c. Dedupe Savings Estimate ────────────────────────────────────────
+
+    def estimate_dedupe_savings(self, target_path=None, workers=None, memory_mb=CHUNK_COUNT_MEMORY_MB):
+        """Estimate how much block-level deduplicating storage would save.
+
+        Chunk keys are counted by a ChunkCounter, so memory stays within
+        memory_mb however large the tree is.
+        """
+        if target_path is None:
+            target_path = self.home_dir
+
+        target = Path(target_path)
+
+        print()
+        print("=" * 60)
+        print(f"🧮 DEDUPLICATION SAVINGS ESTIMATE     {RISK_SAFE}")
+        print("   Estimates how much space storage with built-in")
+        print("   deduplication would save on these files.")
+        print("   This only reads files — nothing is changed.")
+        print("=" * 60)
+        print(f"   📂 Scanning: {target}")
+        print("   ⏳ Every file is read once, this may take a while...")
+        print()
+
+        counter = ChunkCounter(memory_mb)
+        file_count = 0
+        total_bytes = 0
+        chunk_count = 0
+
+        try:
+            paths = (path for path, _ in iter_files(target))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for _, fingerprints, lengths in bounded_map(executor, cdc_fingerprints, paths):
+                    file_count += 1
+                    chunk_count += len(fingerprints)
+                    total_bytes += sum(lengths)
+                    counter.add(fingerprints, lengths)
+                    if file_count % 500 == 0:
+                        print(f"   🔍 {file_count:,} files, {format_size(total_bytes)} read...", end="\r")
+
+            print(" " * 60, end="\r")
+            print("   🔢 Counting unique chunks...", end="\r")
+            unique_chunks, unique_bytes = counter.totals()
+            print(" " * 60, end="\r")
+        finally:
+            counter.close()
+
+        if total_bytes == 0:
+            print("  📂 No readable files found in this location.")
+            return None
+
+        saved = total_bytes - unique_bytes
+        percent = saved / total_bytes * 100
+
+        print(f"  📊 Files analyzed:   {file_count:,}")
+        print(f"  📦 Chunks:           {chunk_count:,} ({unique_chunks:,} unique, "
+              f"average {format_size(total_bytes // max(chunk_count, 1))})")
+        print(f"  💾 Total data:       {format_size(total_bytes)}")
+        print(f"  💾 After dedupe:     {format_size(unique_bytes)}")
+        print(f"  ✨ Estimated saving: {format_size(saved)} ({percent:.1f}%)")
+        print()
+        if percent >= 30:
+            print("  💡 Lots of repeated data here — deduplicating storage would help a lot.")
+        elif percent >= 10:
+            print("  💡 Some repeated data — deduplication would give a moderate saving.")
+        else:
+            print("  💡 Little repeated data — deduplication would not save much here.")
+        print("     Compression is not included in this estimate.")
+        print()
+
+        self.log_action(f"Dedupe estimate: {format_size(saved)} of {format_size(total_bytes)} "
+                        f"({percent:.1f}%) in {file_count} files")
+        return {
+            "files": file_count,
+            "chunks": chunk_count,
+            "unique_chunks": unique_chunks,
+            "total_bytes": total_bytes,
+            "unique_bytes": unique_bytes,
+        }
+
+    # ─── 4d. Compressibility Advisor ────────────────────────────────────────
+
+    def analyze_compressibility(self, target_path=None, min_size_mb=100, top_n=20,
+                                compress_older_than=None, workers=None):
+        """Rank large files and folders by how much space compressing them would free."""
+        if target_path is None:
+            target_path = self.home_dir
+
+        target = Path(target_path)
+        min_size_bytes = min_size_mb * 1024 * 1024
+
+        print()
+        print("=" * 60)
+        print(f"🗜️  COMPRESSION ADVISOR                {RISK_SAFE}")
+        print(f"   Checking which files larger than {min_size_mb} MB would shrink")
+        print("   if you compressed them. Only small samples are read.")
+        print("=" * 60)
+        print(f"   📂 Searching in: {target}")
+        print("   ⏳ This may take a few minutes for large drives...")
+        print()
+
+        skip = SKIP_DIRS + ('Windows', 'ProgramData')
+        candidates = ((path, st.st_size) for path, st in iter_files(target, skip)
+                      if st.st_size >= min_size_bytes)
+
+        # Sampling runs in worker processes while the walk keeps finding files
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path, size, zlib_ratio, lzma_ratio, entropy in bounded_map(
+                    executor, sample_compressibility, candidates):
+                if zlib_ratio is None:
+                    continue
+                best = min(zlib_ratio, lzma_ratio)
+                results.append({
+                    "path": path,
+                    "size": size,
+                    "zlib_ratio": zlib_ratio,
+                    "lzma_ratio": lzma_ratio,
+                    "entropy": entropy,
+                    "reclaimable": int(size * max(0.0, 1 - best)),
+                })
+
+        if not results:
+            print(f"  ✅ No files larger than {min_size_mb} MB found!")
+            return []
+
+        results.sort(key=lambda r: r["reclaimable"], reverse=True)
+        folders = {}
+        for r in results:
+            folder = os.path.dirname(r["path"])
+            folders[folder] = folders.get(folder, 0) + r["reclaimable"]
+
+        print(f"  🗜️  Top files by space you'd get back if compressed:")
+        print()
+        for i, r in enumerate(results[:top_n], 1):
+            print(f"  {i:2d}. {format_size(r['reclaimable']):>10} of {format_size(r['size']):>10}  "
+                  f"zlib {r['zlib_ratio'] * 100:3.0f}%  xz {r['lzma_ratio'] * 100:3.0f}%  "
+                  f"entropy {r['entropy']:.1f}  {r['path']}")
+        print()
+
+        print("  📁 Top folders:")
+        for folder, reclaimable in sorted(folders.items(), key=lambda x: x[1], reverse=True)[:10]:
+            print(f"     {format_size(reclaimable):>10}  {folder}")
+        print()
+
+        total = sum(r["reclaimable"] for r in results)
+        print(f"  📊 Estimated space to reclaim: {format_size(total)} across {len(results)} files")
+        print("  💡 Percentages are compressed size; entropy near 8 means already")
+        print("     compressed (videos, zips) and there is nothing to gain.")
+        print()
+
+        self.log_action(f"Compressibility scan: {len(results)} files, {format_size(total)} reclaimable")
+
+        if compress_older_than is not None:
+            self.compress_cold_files(results, compress_older_than, workers=workers)
+        return results
+
+    def compress_cold_files(self, results, days_old, max_ratio=0.7, workers=None):
+        """Compress files from analyze_compressibility that are old and shrink well."""
+        if lzma is None:
+            print("  ❌ Compression needs the lzma module, which this Python doesn't have.")
+            return False
+
+        cutoff = (datetime.now() - timedelta(days=days_old)).timestamp()
+        cold = []
+        for r in results:
+            try:
+                if os.path.getmtime(r["path"]) < cutoff and r["lzma_ratio"] <= max_ratio:
+                    cold.append(r)
+            except OSError:
+                pass
+
+        if not cold:
+            print(f"  ✅ No files unused for {days_old} days would shrink enough to be worth it.")
+            return True
+
+        expected = sum(r["reclaimable"] for r in cold)
+        print(f"  🗜️  {len(cold)} files haven't changed in {days_old} days and compress well.")
+        print("     Each one is replaced by a verified .xz archive next to it.")
+        print(f"     Estimated space freed: {format_size(expected)}")
+        print()
+        try:
+            response = input("  Compress these files now? (yes/no): ").strip().lower()
+        except (KeyboardInterrupt, EOFError):
+            print("\n  ❌ Cancelled.")
+            return False
+
+        if response not in ('yes', 'y', 'si', 'sí'):
+            print("  ❌ Cancelled. No files were changed.")
+            return False
+
+        freed = 0
+        failed = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path, original, archived, error in bounded_map(
+                    executor, compress_file_verified, (r["path"] for r in cold)):
+                if error:
+                    failed += 1
+                    print(f"     ⚠️  {path}: {error}")
+                    self.log_action(f"Compress {path}", success=False, details=error)
+                else:
+                    freed += original - archived
+                    print(f"     ✅ {path}.xz  ({format_size(original)} → {format_size(archived)})")
+
+        print()
+        print(f"  💾 Space freed: {format_size(freed)}")
+        if failed:
+            print(f"  ⚠️  {failed} files were left untouched.")
+        print()
+
+        self.log_action(f"Cold file compression: {len(cold) - failed} files, {format_size(freed)} freed",
+                        success=failed == 0)
+        return failed == 0
+
     # ─── 5. Temp Files Cleanup ──────────────────────────────────────────────
 
-    def cleanup_temp_files(self):
-        """Clean up temporary files and caches."""
+    def cleanup_temp_files(self, policies=None, assume_yes=False):
+        """Clean up temporary files and caches.
+
+        policies maps target keys to rules (see CLEANUP_RULES), so busy
+        machines can, say, only delete temp items older than 48 hours.
+        Targets without rules are emptied completely, as before. Without
+        policies, cleanup_policies.json in the log folder is used if present.
+        """
+        if policies is None:
+            policies = self.load_cleanup_policies()
+            if policies is None:
+                return False
         print()
         print("=" * 60)
         print(f"🧹 CLEAN UP TEMPORARY FILES           {RISK_LOW}")
@@ -573,6 +2946,7 @@ class WindowsSpaceManager:
         temp_dir = os.getenv('TEMP', '')
         if temp_dir and os.path.exists(temp_dir):
             cleanup_targets.append({
+                "key": "temp",
                 "name": "Windows temporary files",
                 "path": temp_dir,
                 "description": "Files programs create temporarily while running",
@@ -583,6 +2957,7 @@ class WindowsSpaceManager:
         user_temp = self.home_dir / 'AppData' / 'Local' / 'Temp'
         if user_temp.exists() and str(user_temp) != temp_dir:
             cleanup_targets.append({
+                "key": "user_temp",
                 "name": "Your temporary files",
                 "path": str(user_temp),
                 "description": "Temporary files from programs you've used",
@@ -591,6 +2966,7 @@ class WindowsSpaceManager:
 
         # Recycle Bin
         cleanup_targets.append({
+            "key": "recycle_bin",
             "name": "Recycle Bin",
             "path": "RECYCLE_BIN",
             "description": "Files you've already deleted (they're in the trash)",
@@ -601,6 +2977,7 @@ class WindowsSpaceManager:
         prefetch = Path("C:\\Windows\\Prefetch")
         if prefetch.exists():
             cleanup_targets.append({
+                "key": "prefetch",
                 "name": "Windows Prefetch cache",
                 "path": str(prefetch),
                 "description": "Old startup optimization data (Windows will rebuild it)",
@@ -611,13 +2988,26 @@ class WindowsSpaceManager:
         thumb_cache = self.home_dir / 'AppData' / 'Local' / 'Microsoft' / 'Windows' / 'Explorer'
         if thumb_cache.exists():
             cleanup_targets.append({
+                "key": "thumbnails",
                 "name": "Thumbnail cache",
                 "path": str(thumb_cache),
                 "description": "Preview images of your files (will be recreated automatically)",
                 "risk": RISK_LOW
             })
 
-        # Scan sizes first
+        # Extra targets from the policy file (e.g. build caches)
+        known = {t["key"] for t in cleanup_targets}
+        for key, rules in policies.items():
+            if key not in known and rules.get("path") and os.path.isdir(rules["path"]):
+                cleanup_targets.append({
+                    "key": key,
+                    "name": rules.get("name", key),
+                    "path": rules["path"],
+                    "description": rules.get("description", "Folder from your cleanup policy"),
+                    "risk": RISK_LOW
+                })
+
+        # Work out what each policy selects, in one pass per folder
         print("  🔍 Checking what can be cleaned up...")
         print()
 
@@ -625,17 +3015,30 @@ class WindowsSpaceManager:
         valid_targets = []
 
         for target in cleanup_targets:
-            if target["path"] == "RECYCLE_BIN":
+            rules = {k: v for k, v in policies.get(target["key"], {}).items() if k in CLEANUP_RULES}
+            if rules.get("enabled", True) is False:
+                continue
+            target = {**target, "rules": rules, "policy": describe_policy(rules)}
+            if target["path"] == "RECYCLE_BIN" and set(rules) - {"enabled"}:
+                # Rules need the bin's own folders; without them nothing is deleted
+                plan = plan_recycle_bin(local_drive_roots(), current_user_sid(), rules)
+                if plan is None:
+                    print("  ⚠️  Recycle Bin skipped: its policy has rules, but its folders can't be read.")
+                    print()
+                elif plan["items"]:
+                    valid_targets.append({**target, "size": plan["size"], "plan": plan})
+                    total_reclaimable += plan["size"]
+            elif target["path"] == "RECYCLE_BIN":
                 # Estimate recycle bin size
                 size = self._estimate_recycle_bin_size()
                 if size > 0:
-                    valid_targets.append({**target, "size": size})
+                    valid_targets.append({**target, "size": size, "policy": "everything"})
                     total_reclaimable += size
             else:
-                size = self._get_dir_size(target["path"])
-                if size > 0:
-                    valid_targets.append({**target, "size": size})
-                    total_reclaimable += size
+                plan = plan_cleanup(target["path"], rules)
+                if plan["size"] > 0 or plan["items"]:
+                    valid_targets.append({**target, "size": plan["size"], "plan": plan})
+                    total_reclaimable += plan["size"]
 
         if not valid_targets:
             print("  ✅ Your computer is already clean! No temporary files to remove.")
@@ -645,6 +3048,10 @@ class WindowsSpaceManager:
         for i, target in enumerate(valid_targets, 1):
             print(f"  {i}. {target['risk']}  {target['name']}")
             print(f"     📝 {target['description']}")
+            if target["policy"] != "everything":
+                print(f"     📏 Policy: {target['policy']}")
+            if target.get("plan") and target["plan"]["kept"]:
+                print(f"     🛡️  Keeping {target['plan']['kept']} items the policy protects")
             print(f"     💾 Space to free: {format_size(target['size'])}")
             print()
 
@@ -656,34 +3063,53 @@ class WindowsSpaceManager:
         print("  🔵 This is low risk — your programs will keep working normally.")
         print()
 
-        try:
-            response = input("  Clean up now? (yes/no): ").strip().lower()
-        except (KeyboardInterrupt, EOFError):
-            print("\n  ❌ Cancelled.")
-            return False
+        if not assume_yes:
+            try:
+                response = input("  Clean up now? (yes/no): ").strip().lower()
+            except (KeyboardInterrupt, EOFError):
+                print("\n  ❌ Cancelled.")
+                return False
 
-        if response not in ('yes', 'y', 'si', 'sí'):
-            print("  ❌ Cancelled. No files were deleted.")
-            return False
+            if response not in ('yes', 'y', 'si', 'sí'):
+                print("  ❌ Cancelled. No files were deleted.")
+                return False
 
         # Execute cleanup
         print()
         print("  🧹 Cleaning up...")
         cleaned = 0
 
+        stats = []
+
         for target in valid_targets:
             print(f"  🧹 Cleaning: {target['name']}...")
 
-            if target["path"] == "RECYCLE_BIN":
+            if "plan" not in target:
                 success = self._empty_recycle_bin()
+                freed, failed = (target["size"], 0) if success else (0, 1)
             else:
-                success = self._clean_directory(target["path"])
+                freed, failed = delete_planned_items(target["plan"]["items"])
 
-            if success:
-                cleaned += target["size"]
-                print(f"     ✅ Done — freed {format_size(target['size'])}")
+            cleaned += freed
+            if not failed:
+                print(f"     ✅ Done — freed {format_size(freed)}")
             else:
-                print(f"     ⚠️  Some files couldn't be removed (they may be in use)")
+                print(f"     ⚠️  Freed {format_size(freed)}; {failed} items couldn't be removed (they may be in use)")
+
+            stats.append({
+                "time": datetime.now().isoformat(timespec="seconds"),
+                "target": target["key"],
+                "policy": target["policy"],
+                "rules": target["rules"],
+                "selected_bytes": target["size"],
+                "freed_bytes": freed,
+                "failed_items": failed,
+                "kept_items": target.get("plan", {}).get("kept", 0),
+            })
+            self.log_action(f"Temp cleanup [{target['key']}]", failed == 0,
+                            f"policy: {target['policy']}; freed {format_size(freed)}")
+
+        self._record_cleanup_stats(stats)
 
         print()
         print("─" * 60)
@@ -711,7 +3137,12 @@ class WindowsSpaceManager:
         return total
 
     def _estimate_recycle_bin_size(self):
-        """Estimate recycle bin size via PowerShell."""
+        """Estimate recycle bin size from $Recycle.Bin, falling back to PowerShell."""
+        measured = measure_recycle_bin(local_drive_roots(), current_user_sid())
+        if measured is not None:
+            self.log_action("Estimating Recycle Bin size", details=f"{measured[1]} items")
+            return measured[0]
+
         success, output = self.run_ps_command(
             "(New-Object -ComObject Shell.Application).NameSpace(10).Items() | "
             "ForEach-Object { $_.Size } | Measure-Object -Sum | "
@@ -733,25 +3164,26 @@ class WindowsSpaceManager:
         )
         return success
 
-    def _clean_directory(self, path):
-        """Delete contents of a directory safely."""
-        success_count = 0
-        fail_count = 0
-
+    def load_cleanup_policies(self, path=None):
+        """Load cleanup policies from path, or from cleanup_policies.json in the log folder."""
+        if path is None:
+            path = self.log_dir / "cleanup_policies.json"
+            if not path.exists():
+                return {}
         try:
-            for item in Path(path).iterdir():
-                try:
-                    if item.is_dir():
-                        shutil.rmtree(item, ignore_errors=True)
-                    else:
-                        item.unlink()
-                    success_count += 1
-                except (OSError, PermissionError):
-                    fail_count += 1
-        except (OSError, PermissionError):
-            return False
+            return load_cleanup_policies(path)
+        except (OSError, ValueError) as e:
+            print(f"  ❌ Could not read cleanup policies from {path}: {e}")
+            return None
 
-        return success_count > 0
+    def _record_cleanup_stats(self, stats):
+        """Append per-policy cleanup results to cleanup_stats.jsonl in the log folder."""
+        try:
+            with open(self.log_dir / "cleanup_stats.jsonl", 'a', encoding='utf-8') as f:
+                for entry in stats:
+                    f.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
 
     # ─── 6. Old Downloads Scanner ───────────────────────────────────────────
 
@@ -818,6 +3250,82 @@ class WindowsSpaceManager:
 
         self.log_action(f"Old downloads scan: {len(old_files)} files, {format_size(total_size)}")
 
+    # ─── 6b. Cold Data Finder ───────────────────────────────────────────────
+
+    def find_cold_data(self, target_path=None, budget_gb=100, top_n=20):
+        """Find the biggest, least-used data under a folder."""
+        if target_path is None:
+            target_path = self.home_dir
+
+        target = Path(target_path)
+        budget = int(budget_gb * 1024 ** 3)
+
+        print()
+        print("=" * 60)
+        print(f"🧊 COLD DATA FINDER                   {RISK_SAFE}")
+        print("   Finding large files nobody has opened or changed in a long")
+        print("   time. These are good candidates to archive or move.")
+        print("   This only looks — it won't delete anything.")
+        print("=" * 60)
+        print(f"   📂 Scanning: {target}")
+        print("   ⏳ This may take a minute or two...")
+        print()
+
+        index = self.get_scan_index(target, skip_dirs=USER_DATA_SKIP_DIRS)
+        if not len(index):
+            print("  📂 No files found in this location.")
+            return None
+
+        now = time.time()
+        sizes = index.sizes
+        mtimes = index.mtimes
+        atimes = index.atimes
+
+        # Each file scores size × days unused, so a big file left alone for a
+        # month outranks a tiny one untouched for years. The min-heap keeps the
+        # highest scores that add up to the budget; anything scoring below the
+        # heap top is dropped as soon as the budget is covered.
+        coldest = []
+        coldest_bytes = 0
+        folder_scores = {}
+
+        for i in range(len(index)):
+            size = sizes[i]
+            if not size:
+                continue
+            idle = max(0.0, now - max(mtimes[i], atimes[i]))
+            score = size * idle / 86400
+            dir_id = index.dir_ids[i]
+            folder_scores[dir_id] = folder_scores.get(dir_id, 0.0) + score
+
+            heapq.heappush(coldest, (score, idle, i))
+            coldest_bytes += size
+            while coldest and coldest_bytes - sizes[coldest[0][2]] >= budget:
+                coldest_bytes -= sizes[heapq.heappop(coldest)[2]]
+
+        coldest.sort(reverse=True)
+
+        print(f"  🧊 The coldest {format_size(coldest_bytes)} (by size × days unused) is in {len(coldest):,} files")
+        if coldest:
+            print(f"     unused for {min(idle for _, idle, _ in coldest) / 86400:.0f} days or more.")
+        print()
+        for n, (_, idle, i) in enumerate(coldest[:top_n], 1):
+            print(f"  {n:2d}. {format_size(sizes[i]):>10}  {idle / 86400:6.0f} days  📄 {index.path(i)}")
+        if len(coldest) > top_n:
+            print(f"  ... and {len(coldest) - top_n} more files")
+        print()
+
+        print("  📁 Coldest folders (size × days unused):")
+        for dir_id, score in heapq.nlargest(10, folder_scores.items(), key=lambda x: x[1]):
+            print(f"     {format_size(int(score)):>10}·days  {index.dirs[dir_id]}")
+        print()
+        print("  💡 'Unused' means neither opened nor changed. Some systems don't")
+        print("     record when files are opened, so treat this as an estimate.")
+        print()
+
+        self.log_action(f"Cold data scan: {len(coldest)} files, {format_size(coldest_bytes)} in {target}")
+        return [(index.path(i), sizes[i], idle) for _, idle, i in coldest]
+
     # ─── 7. Windows Update Cleanup (Admin) ──────────────────────────────────
 
     def cleanup_windows_update(self):
@@ -835,20 +3343,21 @@ class WindowsSpaceManager:
 
         # Show WinSxS size first
         print("  🔍 Checking Windows component store size...")
-        success, output = self.run_ps_command(
-            "(Get-ChildItem -Path 'C:\\Windows\\WinSxS' -Recurse -ErrorAction SilentlyContinue | "
-            "Measure-Object -Property Length -Sum).Sum",
-            "Checking WinSxS size"
-        )
-
-        if success and output.strip():
-            try:
-                winsxs_size = int(float(output.strip()))
-                print(f"  📦 Windows component store: {format_size(winsxs_size)}")
-                print("     ℹ️  This is where Windows keeps backup copies of system files.")
-                print("     ℹ️  Some of this space can be reclaimed safely.")
-            except (ValueError, TypeError):
-                print("  📦 Windows component store: Unable to determine size")
+        winsxs = os.path.join(os.getenv('SystemRoot', 'C:\\Windows'), 'WinSxS')
+        usage = measure_tree(winsxs)
+        self.log_action(f"Checking WinSxS size: {usage['unique_bytes']} unique bytes")
+
+        if usage["files"]:
+            shared = usage["shared_bytes"]
+            print(f"  📦 Windows component store: {format_size(usage['unique_bytes'])} on disk")
+            print(f"     🔗 Shared with Windows: {format_size(shared)}")
+            print(f"     📦 Only in the store:   {format_size(usage['unique_bytes'] - shared)}")
+            print("     ℹ️  This is where Windows keeps backup copies of system files.")
+            print("     ℹ️  Shared files are also part of the Windows folder, so removing them")
+            print("        from the store frees nothing. Cleanup can only reclaim space from")
+            print("        files that are only in the store.")
+        else:
+            print("  📦 Windows component store: Unable to determine size")
 
         print()
         print("  🟡 This is a moderate operation:")
@@ -958,6 +3467,34 @@ class WindowsSpaceManager:
         print()
         self.log_action("System files info displayed")
 
+    # ─── 8b. Folder Size on Disk ────────────────────────────────────────────
+
+    def show_tree_size(self, target_path, workers=8):
+        """Show a folder's size with hard-linked files counted once."""
+        print()
+        print("=" * 60)
+        print(f"📏 FOLDER SIZE ON DISK                {RISK_SAFE}")
+        print("   Measures a folder, counting files that are hard-linked")
+        print("   (the same file in several places) only once.")
+        print("=" * 60)
+        print(f"   📂 Measuring: {target_path}")
+        print()
+
+        start = time.time()
+        usage = measure_tree(target_path, workers=workers)
+        elapsed = time.time() - start
+
+        print(f"  📄 Files:          {usage['files']:,} ({usage['hardlinked_files']:,} hard-linked)")
+        print(f"  📦 Apparent size:  {format_size(usage['apparent_bytes'])}")
+        print(f"  💾 Size on disk:   {format_size(usage['unique_bytes'])}")
+        print(f"  🔗 Shared:         {format_size(usage['shared_bytes'])} (also linked from outside this folder)")
+        print(f"  ⏱️  Measured in {elapsed:.1f}s")
+        print()
+
+        self.log_action(f"Tree size {target_path}: {usage['unique_bytes']} unique, "
+                        f"{usage['apparent_bytes']} apparent")
+        return usage
+
     # ─── 9. Export Report ───────────────────────────────────────────────────
 
     def export_report(self):
@@ -979,23 +3516,21 @@ class WindowsSpaceManager:
             "drives": []
         }
 
-        for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
-            drive = f"{letter}:\\"
-            if os.path.exists(drive):
-                try:
-                    usage = shutil.disk_usage(drive)
-                    report["drives"].append({
-                        "letter": letter,
-                        "total_bytes": usage.total,
-                        "used_bytes": usage.used,
-                        "free_bytes": usage.free,
-                        "total_human": format_size(usage.total),
-                        "used_human": format_size(usage.used),
-                        "free_human": format_size(usage.free),
-                        "percent_used": round(usage.used / usage.total * 100, 1) if usage.total > 0 else 0
-                    })
-                except Exception:
-                    pass
+        for drive in enumerate_drives():
+            if drive["status"] != "ok":
+                report["drives"].append({"letter": drive["letter"], "status": drive["status"]})
+                continue
+            report["drives"].append({
+                "letter": drive["letter"],
+                "status": "ok",
+                "total_bytes": drive["total"],
+                "used_bytes": drive["used"],
+                "free_bytes": drive["free"],
+                "total_human": format_size(drive["total"]),
+                "used_human": format_size(drive["used"]),
+                "free_human": format_size(drive["free"]),
+                "percent_used": round(drive["percent"], 1)
+            })
 
         # Save report
         report_path = self.home_dir / "Desktop" / f"space_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -1023,8 +3558,13 @@ class WindowsSpaceManager:
 
     # ─── Full Analysis ──────────────────────────────────────────────────────
 
-    def full_analysis(self):
-        """Run a complete space analysis."""
+    def full_analysis(self, batch=False):
+        """Run a complete space analysis.
+
+        Every stage starts in the background right away, so the next page is
+        usually ready by the time the user presses Enter. With batch=True all
+        pages are printed one after another without pausing.
+        """
         print()
         print("╔══════════════════════════════════════════════════════════════╗")
         print("║              🔍 FULL SPACE ANALYSIS                        ║")
@@ -1032,19 +3572,31 @@ class WindowsSpaceManager:
         print("╚══════════════════════════════════════════════════════════════╝")
         print()
 
-        self.show_drive_overview()
-        input("  ⏸️  Press Enter to continue...")
-
-        self.scan_folder_sizes()
-        input("  ⏸️  Press Enter to continue...")
-
-        self.find_large_files()
-        input("  ⏸️  Press Enter to continue...")
-
-        self.scan_old_downloads()
-        input("  ⏸️  Press Enter to continue...")
-
-        self.show_system_files_info()
+        stages = [
+            self.show_drive_overview,
+            self.scan_folder_sizes,
+            self.find_large_files,
+            self.scan_old_downloads,
+            self.show_system_files_info,
+        ]
+
+        real_stdout = sys.stdout
+        output = ThreadOutput(real_stdout)
+        sys.stdout = output
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="analysis")
+        futures = [executor.submit(run_captured, output, stage) for stage in stages]
+        try:
+            for i, future in enumerate(futures):
+                if not future.done():
+                    print("  ⏳ Still working on this step...", end="\r", flush=True)
+                print(future.result(), end="")
+                if not batch and i < len(futures) - 1:
+                    input("  ⏸️  Press Enter to continue...")
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+            sys.stdout = real_stdout
 
         print()
         print("═" * 60)
@@ -1196,18 +3748,39 @@ def main():
     check_group = parser.add_argument_group("📊 Check Space")
     check_group.add_argument("--drives", action="store_true", help="🔍 Show all drives and their space usage")
     check_group.add_argument("--folders", type=str, nargs='?', const=str(Path.home()), help="📁 Scan folder sizes (default: home directory)")
+    check_group.add_argument("--watch", type=str, nargs='?', const=str(Path.home()), metavar="PATH", help="📡 Keep folder sizes live as files change (Linux)")
     check_group.add_argument("--large-files", type=int, nargs='?', const=100, metavar="MB", help="📄 Find files larger than N MB (default: 100)")
     check_group.add_argument("--duplicates", type=str, nargs='?', const=str(Path.home()), help="🔍 Find duplicate files")
+    check_group.add_argument("--near-duplicates", type=str, nargs='?', const=str(Path.home()), metavar="PATH", help="🔍 Find nearly identical files (logs, documents)")
+    check_group.add_argument("--dedupe-estimate", type=str, nargs='?', const=str(Path.home()), metavar="PATH", help="🧮 Estimate block-level deduplication savings")
+    check_group.add_argument("--compressibility", type=int, nargs='?', const=100, metavar="MB", help="🗜️ Rank files larger than N MB by space compression would free (default: 100)")
+    check_group.add_argument("--cold-data", type=str, nargs='?', const=str(Path.home()), metavar="PATH", help="🧊 Find the largest, least-used data under a folder")
+    check_group.add_argument("--cold-budget", type=float, default=100, metavar="GB", help="🧊 How much cold data --cold-data should report (default: 100 GB)")
+    check_group.add_argument("--dup-memory", type=int, default=SIZE_GROUP_MEMORY_MB, metavar="MB", help="💾 Memory budget for --duplicates/--dedupe-apply/--dedupe-estimate before spilling to disk (default: 256)")
+    check_group.add_argument("--similarity", type=int, default=80, metavar="PERCENT", help="🎯 Minimum similarity for --near-duplicates (default: 80)")
     check_group.add_argument("--old-downloads", type=int, nargs='?', const=90, metavar="DAYS", help="📥 Find downloads older than N days (default: 90)")
 
     clean_group = parser.add_argument_group("🧹 Cleanup")
     clean_group.add_argument("--clean-temp", action="store_true", help="🗑️ Clean up temporary files")
+    clean_group.add_argument("--cleanup-policy", type=str, metavar="JSON", help="📏 Rules for --clean-temp, e.g. only files older than 48h (default: cleanup_policies.json in the log folder)")
+    clean_group.add_argument("--yes", action="store_true", help="✅ Don't ask for confirmation (for scheduled cleanups)")
+    clean_group.add_argument("--dedupe-apply", type=str, nargs='?', const=str(Path.home()), metavar="PATH", help="🔗 Replace duplicate copies with reflinks/hard links")
+    clean_group.add_argument("--dedupe-rollback", type=str, metavar="JOURNAL", help="↩️ Undo a --dedupe-apply run using its journal")
+    clean_group.add_argument("--dry-run", action="store_true", help="🧪 Only show what --dedupe-apply would do")
+    clean_group.add_argument("--compress-cold", type=int, metavar="DAYS", help="🗜️ With --compressibility: compress files unchanged for N days")
     clean_group.add_argument("--clean-updates", action="store_true", help="🪟 Clean old Windows Update files (admin)")
 
     info_group = parser.add_argument_group("📋 Information")
     info_group.add_argument("--system-files", action="store_true", help="📊 Show pagefile and hibernation info")
+    info_group.add_argument("--tree-size", type=str, metavar="PATH", help="📏 Measure a folder, counting hard links once")
     info_group.add_argument("--report", action="store_true", help="📋 Export a space usage report")
     info_group.add_argument("--full", action="store_true", help="🔍 Run full space analysis")
+    info_group.add_argument("--batch", action="store_true", help="⏩ With --full: print every step without pausing")
+
+    bg_group = parser.add_argument_group("🐢 Background Mode")
+    bg_group.add_argument("--background", action="store_true", help="🐢 Lower CPU/disk priority and throttle disk use")
+    bg_group.add_argument("--max-iops", type=int, default=200, metavar="N", help="🐢 File operations per second in background mode (default: 200)")
+    bg_group.add_argument("--max-read-mb", type=float, default=20, metavar="MB", help="🐢 MB read per second in background mode (default: 20)")
 
     parser.add_argument("--version", action="version", version="Windows Space Manager v1.0")
 
@@ -1215,9 +3788,13 @@ def main():
 
     # Check if any CLI args were provided
     has_args = any([
-        args.drives, args.folders is not None, args.large_files is not None,
-        args.duplicates is not None, args.old_downloads is not None,
-        args.clean_temp, args.clean_updates, args.system_files,
+        args.drives, args.folders is not None, args.watch is not None,
+        args.large_files is not None,
+        args.duplicates is not None, args.near_duplicates is not None,
+        args.dedupe_estimate is not None, args.compressibility is not None,
+        args.old_downloads is not None, args.cold_data is not None,
+        args.dedupe_apply is not None, args.dedupe_rollback is not None,
+        args.clean_temp, args.clean_updates, args.system_files, args.tree_size,
         args.report, args.full
     ])
 
@@ -1229,8 +3806,11 @@ def main():
     show_startup_banner()
     manager = WindowsSpaceManager()
 
+    if args.background:
+        manager.enable_background_mode(args.max_iops, args.max_read_mb)
+
     if args.full:
-        manager.full_analysis()
+        manager.full_analysis(batch=args.batch)
         return
 
     if args.drives:
@@ -1239,17 +3819,41 @@ def main():
     if args.folders is not None:
         manager.scan_folder_sizes(args.folders)
 
+    if args.watch is not None:
+        manager.watch_folder_sizes(args.watch)
+
     if args.large_files is not None:
         manager.find_large_files(min_size_mb=args.large_files)
 
     if args.duplicates is not None:
-        manager.find_duplicates(args.duplicates)
+        manager.find_duplicates(args.duplicates, memory_mb=args.dup_memory)
+
+    if args.near_duplicates is not None:
+        manager.find_near_duplicates(args.near_duplicates, similarity=args.similarity)
+
+    if args.dedupe_estimate is not None:
+        manager.estimate_dedupe_savings(args.dedupe_estimate, memory_mb=args.dup_memory)
+
+    if args.compressibility is not None:
+        manager.analyze_compressibility(min_size_mb=args.compressibility,
+                                        compress_older_than=args.compress_cold)
 
     if args.old_downloads is not None:
         manager.scan_old_downloads(days_old=args.old_downloads)
 
+    if args.cold_data is not None:
+        manager.find_cold_data(args.cold_data, budget_gb=args.cold_budget)
+
+    if args.dedupe_apply is not None:
+        manager.apply_dedupe(args.dedupe_apply, dry_run=args.dry_run, memory_mb=args.dup_memory)
+
+    if args.dedupe_rollback:
+        manager.rollback_dedupe(args.dedupe_rollback)
+
     if args.clean_temp:
-        manager.cleanup_temp_files()
+        policies = manager.load_cleanup_policies(args.cleanup_policy)
+        if policies is not None:
+            manager.cleanup_temp_files(policies, assume_yes=args.yes)
 
     if args.clean_updates:
         manager.cleanup_windows_update()
@@ -1257,9 +3861,13 @@ def main():
     if args.system_files:
         manager.show_system_files_info()
 
+    if args.tree_size:
+        manager.show_tree_size(args.tree_size)
+
     if args.report:
         manager.export_report()
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()